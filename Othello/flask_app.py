@@ -3,6 +3,8 @@ from game_logic import Othello
 from ai import get_ai_move
 
 app = Flask(__name__)
+# How long the client shows the AI's new disc before flipping discs; the server does not wait
+AI_ANIMATION_DELAY_MS = 1000
 game = Othello()
 
 
@@ -40,7 +42,8 @@ def ai_move():
             "success": True,
             "board": game.get_board(),
             "lastMove": move,
-            "flippedDiscs": game.get_last_flipped_discs()
+            "flippedDiscs": game.get_last_flipped_discs(),
+            "animation_delay_ms": AI_ANIMATION_DELAY_MS
         })
     return jsonify({"success": False})
 
@@ -1,5 +1,4 @@
 import numpy as np
-import time
 
 EMPTY = 0
 BLACK = 1
@@ -53,7 +52,7 @@ class Othello:
             r, c = r + dr, c + dc
         return False
 
-    def make_move(self, row, col, is_ai=False):
+    def make_move(self, row, col):
         """ 执行落子操作并翻转棋子 """
         if not self.is_valid_move(row, col):
             return False
@@ -67,9 +66,6 @@ class Othello:
 
         self.current_player = -self.current_player
 
-        if is_ai:
-            time.sleep(1)  # AI 落子后，再等待 1 秒翻转
-
         return True
 
     def _flip_disks(self, row, col, dr, dc):
@@ -107,7 +103,7 @@ class Othello:
         valid_moves = self.get_valid_moves()
         if valid_moves:
             self.last_ai_move = valid_moves[0]  # 选择第一个合法位置（可改进AI策略）
-            self.make_move(*self.last_ai_move, is_ai=True)
+            self.make_move(*self.last_ai_move)
             return self.last_ai_move, self.get_last_flipped_discs()
         return None, []
 
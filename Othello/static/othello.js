@@ -103,7 +103,7 @@ async function playerMove(row, col) {
     let result = await response.json();
     if (result.success) {
         updateBoard(result.lastMove, result.flippedDiscs);
-        setTimeout(aiMove, 1000); // AI 在 0.5 秒后自动下棋
+        aiMove(); // AI 立即计算，棋盘按服务器给出的动画延迟更新
     } else {
         alert("Invalid move! Try again.");
     }
@@ -114,7 +114,8 @@ async function aiMove() {
     let response = await fetch("/ai_move");
     let result = await response.json();
     if (result.success) {
-        updateBoard(result.lastMove, result.flippedDiscs);
+        // 服务器不再等待，由客户端延迟显示 AI 的落子
+        setTimeout(() => updateBoard(result.lastMove, result.flippedDiscs), result.animation_delay_ms ?? 1000);
     }
 }
 
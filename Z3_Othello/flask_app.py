@@ -4,6 +4,8 @@ from ai import get_ai_move
 from verification import OthelloVerifier
 
 app = Flask(__name__)
+# How long the client shows the AI's new disc before flipping discs; the server does not wait
+AI_ANIMATION_DELAY_MS = 1000
 game = Othello()
 verifier = OthelloVerifier(game)
 
@@ -79,6 +81,7 @@ def ai_move():
                 "board": game.get_board(),
                 "lastMove": move,
                 "flippedDiscs": game.get_last_flipped_discs(),
+                "animation_delay_ms": AI_ANIMATION_DELAY_MS,
                 "verification": verification_results,
                 "player": "white"
             })
@@ -109,7 +109,7 @@ async function playerMove(row, col) {
     let result = await response.json();
     if (result.success) {
         updateBoard(result.lastMove, result.flippedDiscs, result.verification, result.player);
-        setTimeout(aiMove, 1000); // AI plays chess automatically after 1 second
+        aiMove(); // The AI answers at once; its move is shown after the server's animation delay
     } else {
         // Even if the move fails, update the verification report
         if (result.verification) {
@@ -124,7 +124,9 @@ async function aiMove() {
     let response = await fetch("/ai_move");
     let result = await response.json();
     if (result.success) {
-        updateBoard(result.lastMove, result.flippedDiscs, result.verification, result.player);
+        // The server no longer waits before answering, so pace the animation here
+        setTimeout(() => updateBoard(result.lastMove, result.flippedDiscs, result.verification, result.player),
+                   result.animation_delay_ms ?? 1000);
     } else if (result.verification) {
         // If the AI ​​cannot make a move but there are verification results, update the verification panel
         updateVerificationPanel(result.verification, "white");
@@ -3,26 +3,12 @@ from game_logic import Othello, BLACK, WHITE
 from ai import get_ai_move, set_difficulty
 from verification import OthelloVerifier
 from z3_solver import OthelloZ3Solver
-import numpy as np
-
-# Helper function, convert NumPy type to Python native type
-def convert_numpy_types(obj):
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(i) for i in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(i) for i in obj)
-    else:
-        return obj
+from json_provider import FastJSONProvider
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)  # orjson when installed; NumPy values are converted while encoding
+# How long the client shows the AI's new disc before flipping discs; the server does not wait
+AI_ANIMATION_DELAY_MS = 1000
 game = Othello()
 verifier = OthelloVerifier(game)
 z3_solver = OthelloZ3Solver(game)
@@ -36,7 +22,7 @@ def index():
 @app.route("/board", methods=["GET"])
 def get_board():
     board_data = game.get_board()
-    return jsonify(convert_numpy_types(board_data))
+    return jsonify(board_data)
 
 @app.route("/move", methods=["POST"])
 def make_move():
@@ -64,7 +50,7 @@ def make_move():
             "verification": verification_results,
             "player": "black"
         }
-        return jsonify(convert_numpy_types(response_data))
+        return jsonify(response_data)
     else:
         # If the move is invalid, also update the verification
         verifier.verify_legal_move(row, col, BLACK)
@@ -74,7 +60,7 @@ def make_move():
             "success": False,
             "verification": verification_results
         }
-        return jsonify(convert_numpy_types(response_data))
+        return jsonify(response_data)
 
 
 @app.route("/ai_move", methods=["GET"])
@@ -91,7 +77,7 @@ def ai_move():
                 "board": game.get_board(),
                 "player": "black" if game.current_player == BLACK else "white"
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
         
         # Check for valid moves first
         valid_moves = game.get_valid_moves()
@@ -116,7 +102,7 @@ def ai_move():
                 "board": game.get_board(),
                 "player": "black" 
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
             
         # Get AI's move
         move = get_ai_move(game)
@@ -141,7 +127,7 @@ def ai_move():
                     "board": game.get_board(),
                     "player": "white" if game.current_player == WHITE else "black"
                 }
-                return jsonify(convert_numpy_types(response_data))
+                return jsonify(response_data)
             
             # Verify AI move before making it
             verifier.verify_legal_move(row, col, WHITE)
@@ -157,10 +143,11 @@ def ai_move():
                 "board": game.get_board(),
                 "lastMove": move,
                 "flippedDiscs": game.get_last_flipped_discs(),
+                "animation_delay_ms": AI_ANIMATION_DELAY_MS,
                 "verification": verification_results,
                 "player": "white"
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
         else:
             print("AI failed to select a move despite having valid moves")
             # Fall back to game.ai_move()
@@ -175,9 +162,10 @@ def ai_move():
                 "board": game.get_board(),
                 "player": "white" if game.current_player == WHITE else "black",
                 "lastMove": ai_move_result,
-                "flippedDiscs": flipped_discs
+                "flippedDiscs": flipped_discs,
+                "animation_delay_ms": AI_ANIMATION_DELAY_MS
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
     
     except Exception as e:
         import traceback
@@ -191,13 +179,13 @@ def ai_move():
             "board": game.get_board(),
             "player": "white" if game.current_player == WHITE else "black"
         }
-        return jsonify(convert_numpy_types(response_data))
+        return jsonify(response_data)
 
 
 @app.route("/valid_moves", methods=["GET"])
 def valid_moves():
     moves = [(r, c) for r in range(4) for c in range(4) if game.is_valid_move(r, c)]
-    return jsonify({"valid_moves": convert_numpy_types(moves)})
+    return jsonify({"valid_moves": moves})
 
 @app.route("/restart", methods=["POST"])
 def restart_game():
@@ -211,7 +199,7 @@ def restart_game():
 def verify_game():
     """Endpoint to run verification on current game state"""
     verification_results = verifier.run_all_verifications()
-    return jsonify({"verification": convert_numpy_types(verification_results)})
+    return jsonify({"verification": verification_results})
 
 @app.route("/z3_hint", methods=["GET"])
 def get_z3_hint():
@@ -249,7 +237,7 @@ def get_z3_hint():
             else:
                 print(f"Z3 has no move. Message: {hint_result.get('message', 'No message')}")
             
-            return jsonify(convert_numpy_types(hint_result))
+            return jsonify(hint_result)
         else:
             print("Not black player's turn, no Z3 hint provided")
             return jsonify({"has_move": False, "message": "Z3 hints are only available during your turn (as Black)."})
@@ -263,7 +251,7 @@ def get_z3_hint():
 def get_last_move_info():
     """Endpoint to get information about the last move and flipped discs"""
     last_move_info = game.get_last_move_info()
-    return jsonify(convert_numpy_types(last_move_info))
+    return jsonify(last_move_info)
 
 @app.route("/set_difficulty", methods=["POST"])
 def set_ai_difficulty():
@@ -1,5 +1,4 @@
 import numpy as np
-import time
 
 EMPTY = 0
 BLACK = 1
@@ -58,7 +57,7 @@ class Othello:
             r, c = r + dr, c + dc
         return False
 
-    def make_move(self, row, col, is_ai=False):
+    def make_move(self, row, col):
         """ Perform a drop operation and flip the pieces """
         if not self.is_valid_move(row, col):
             return False
@@ -82,9 +81,6 @@ class Othello:
             # If the current player also has no valid moves, the game ends
             # This will be caught by check_winner
 
-        if is_ai:
-            time.sleep(1) 
-
         return True
 
     def _flip_disks(self, row, col, dr, dc):
@@ -122,7 +118,7 @@ class Othello:
         valid_moves = self.get_valid_moves()
         if valid_moves:
             self.last_ai_move = valid_moves[0] 
-            self.make_move(*self.last_ai_move, is_ai=True)
+            self.make_move(*self.last_ai_move)
             return self.last_ai_move, self.get_last_flipped_discs()
         else:
             # If AI has no valid moves, skip its turn by switching back to the human player
@@ -135,8 +131,8 @@ class Othello:
 
     def get_piece_count(self):
         """ Calculate the number of black and white pieces on the board """
-        black_count = np.sum(self.board == BLACK)
-        white_count = np.sum(self.board == WHITE)
+        black_count = int(np.count_nonzero(self.board == BLACK))  # Native ints, ready for JSON
+        white_count = int(np.count_nonzero(self.board == WHITE))
         return black_count, white_count
 
     def check_winner(self):
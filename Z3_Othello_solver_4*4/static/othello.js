@@ -738,7 +738,7 @@ async function triggerAIMove() {
                         </ul>
                     `;
                 }, 1200); // Display the valid position after 1.2 seconds
-            }, 1000); // Flip effect is displayed after 1 second (black and white)
+            }, result.animation_delay_ms ?? 1000); // Flip effect is displayed after the server's animation delay
         } else {
             // Process other error cases
             console.error("AI move failed:", result.message);
@@ -900,7 +900,7 @@ async function aiMove() {
                         </ul>
                     `;
                 }, 1200); 
-            }, 1000); 
+            }, result.animation_delay_ms ?? 1000); 
         } else {
             // Process other error cases
             console.error("AI move failed:", result.message);
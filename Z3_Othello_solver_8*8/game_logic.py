@@ -1,5 +1,4 @@
 import numpy as np
-import time
 
 EMPTY = 0
 BLACK = 1
@@ -55,7 +54,7 @@ class Othello:
             r, c = r + dr, c + dc
         return False
 
-    def make_move(self, row, col, is_ai=False):
+    def make_move(self, row, col):
         """ Perform a drop operation and flip the pieces """
         if not self.is_valid_move(row, col):
             return False
@@ -71,9 +70,6 @@ class Othello:
 
         self.current_player = -self.current_player
 
-        if is_ai:
-            time.sleep(1)  # After AI makes a move, wait for 1 second to flip
-
         return True
 
     def _flip_disks(self, row, col, dr, dc):
@@ -111,14 +107,14 @@ class Othello:
         valid_moves = self.get_valid_moves()
         if valid_moves:
             self.last_ai_move = valid_moves[0]  # Select the first legal location (to improve AI strategy)
-            self.make_move(*self.last_ai_move, is_ai=True)
+            self.make_move(*self.last_ai_move)
             return self.last_ai_move, self.get_last_flipped_discs()
         return None, []
 
     def get_piece_count(self):
         """ Calculate the number of black and white pieces on the board """
-        black_count = np.sum(self.board == BLACK)
-        white_count = np.sum(self.board == WHITE)
+        black_count = int(np.count_nonzero(self.board == BLACK))  # Native ints, ready for JSON
+        white_count = int(np.count_nonzero(self.board == WHITE))
         return black_count, white_count
 
     def check_winner(self):
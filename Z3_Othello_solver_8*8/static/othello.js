@@ -555,7 +555,7 @@ async function aiMove() {
         // Key: Pass in the actual white chess position, but set showFlippedDiscs to false, so only the new placement is displayed without the flipping effect
         updateBoard(result.lastMove, result.flippedDiscs, null, result.player, false, false, false, false);
         
-        // Wait 1 second, then display the flipped chessboard and verification results
+        // Wait for the animation delay sent by the server, then display the flipped chessboard and verification results
         setTimeout(() => {
             // Now display all flipped chess pieces and verification results, but still do not display the valid position
             updateBoard(result.lastMove, result.flippedDiscs, result.verification, result.player, true, false, true, false);
@@ -593,7 +593,7 @@ async function aiMove() {
                     </ul>
                 `;
             }, 1200); // Display the valid position after 1.2 seconds
-        }, 1000); // Flip effect is displayed after 1 second (black and white)
+        }, result.animation_delay_ms ?? 1000); // Flip effect is displayed after the server's animation delay
     } else if (result.verification) {
         // If AI cannot make a move, check if black has moves
         let validMovesResponse = await fetch("/valid_moves");
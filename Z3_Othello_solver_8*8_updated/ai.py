@@ -1,5 +1,5 @@
 import random
-from game_logic import Othello, BLACK, WHITE, EMPTY
+from game_logic import BLACK, WHITE, EMPTY
 
 # Global variable to track difficulty level
 difficulty_level = "easy"  # Default is easy
@@ -9,16 +9,16 @@ def set_difficulty(level):
     global difficulty_level
     difficulty_level = level.lower()
 
-def get_ai_move(game):
-    """ Choose a move for AI based on current difficulty level """
-    global difficulty_level
+def get_ai_move(game, difficulty=None):
+    """ Choose a move for AI based on a difficulty level (default: the level set by set_difficulty) """
+    level = difficulty_level if difficulty is None else difficulty.lower()
     
     valid_moves = [(r, c) for r in range(8) for c in range(8) if game.is_valid_move(r, c)]
     
     if not valid_moves:
         return None
     
-    if difficulty_level == "easy":
+    if level == "easy":
         # Easy mode: Just pick the first valid move (deterministic)
         return valid_moves[0]
     else:
@@ -49,13 +49,9 @@ def get_strategic_move(game, valid_moves):
     for move in valid_moves:
         row, col = move
         
-        # Create a game simulation
-        sim_game = Othello()
-        sim_game.board = game.board.copy()
-        sim_game.current_player = game.current_player
-        
-        # Perform a move in a simulation
-        sim_game.make_move(row, col)
+        # Perform the move in place; it is undone once the move is scored
+        sim_game = game
+        record = sim_game.make_move(row, col)
         
         # Basic location rating
         position_score = position_values[row][col]
@@ -80,6 +76,8 @@ def get_strategic_move(game, valid_moves):
         opponent_moves = sim_game.get_valid_moves()
         mobility_score = -len(opponent_moves) * 3  # The fewer opponent moves, the better
         
+        sim_game.undo_move(record)
+        
         # Stability score - the more stable the position, the better
         stability_score = 0
         
@@ -0,0 +1,205 @@
+"""
+Self-play arena: play many games between two engines in a process pool and
+report win/draw/loss, the Elo difference with a 95% confidence interval and
+the average time each engine spends per move.
+
+Openings are random distinct positions a few moves in (symmetric ones count
+once), not hand-picked balanced ones. Every opening is played twice with the
+colours swapped, so any advantage the opening gives one side cancels out.
+
+Engines:
+    easy, hard     ai.get_ai_move at that difficulty
+    greedy         OthelloZ3Solver._greedy_move_selection
+    z3[:seconds]   OthelloZ3Solver.find_best_move with that time limit (default 1s)
+    random         A uniformly random legal move
+
+    python arena.py z3:0.5 hard --games 200 --workers 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ai
+import symmetry
+from game_logic import Othello, BLACK, WHITE
+from z3_solver import OthelloZ3Solver
+
+DEFAULT_Z3_TIME_LIMIT = 1.0
+Z_95 = 1.96  # Normal quantile for a 95% confidence interval
+
+
+def make_engine(engine, game, rng):
+    """
+    A function returning the engine's move in `game` (the side to move has at least one
+    legal move). The engine is built once per game, so a solver keeps its transposition
+    table and move ordering history from move to move, as it does in the server.
+    """
+    name, _, option = engine.partition(":")
+    if name in ("easy", "hard"):
+        return lambda: ai.get_ai_move(game, name)
+    if name == "greedy":
+        return OthelloZ3Solver(game)._greedy_move_selection
+    if name == "z3":
+        time_limit = float(option) if option else DEFAULT_Z3_TIME_LIMIT
+        return OthelloZ3Solver(game, time_limit=time_limit).find_best_move
+    if name == "random":
+        return lambda: rng.choice(game.get_valid_moves())
+    raise ValueError(f"Unknown engine: {engine}")
+
+
+def openings(plies, count, seed):
+    """
+    `count` move sequences of `plies` moves from the start position, chosen at random
+    (with a fixed seed) among all positions reachable in that many moves. Positions that
+    are rotations or reflections of each other (or reached by a different move order)
+    count once, so no opening is played twice under another orientation.
+    """
+    positions = {}
+
+    def collect(game, moves):
+        if len(moves) == plies:
+            own, opp = (game.black_bits, game.white_bits) if game.current_player == BLACK \
+                else (game.white_bits, game.black_bits)
+            positions.setdefault(symmetry.canonical(own, opp)[:2], list(moves))
+            return
+        for move in game.get_valid_moves():
+            record = game.make_move(*move)
+            moves.append(move)
+            collect(game, moves)
+            moves.pop()
+            game.undo_move(record)
+
+    collect(Othello(), [])
+    sequences = sorted(positions.values())  # Independent of the order positions were found in
+    random.Random(seed).shuffle(sequences)
+    return sequences[:count]
+
+
+def play_game(task):
+    """
+    Play one game. `task` is (black engine, white engine, opening moves, seed).
+    Returns the final disc counts and the time each colour spent choosing moves.
+    """
+    black_engine, white_engine, opening, seed = task
+    rng = random.Random(seed)
+    game = Othello()
+    for move in opening:
+        game.make_move(*move)
+
+    engines = {BLACK: black_engine, WHITE: white_engine}
+    players = {BLACK: make_engine(black_engine, game, rng), WHITE: make_engine(white_engine, game, rng)}
+    move_time = {BLACK: 0.0, WHITE: 0.0}
+    move_count = {BLACK: 0, WHITE: 0}
+    passed = False
+    with contextlib.redirect_stdout(io.StringIO()):  # The solver reports its progress on stdout
+        while True:
+            if not game.get_valid_moves():
+                if passed:
+                    break  # Neither side can move
+                passed = True
+                game.current_player = -game.current_player
+                continue
+            passed = False
+            player = game.current_player
+            start = time.perf_counter()
+            move = players[player]()
+            move_time[player] += time.perf_counter() - start
+            move_count[player] += 1
+            if move is None or not game.make_move(*move):
+                raise RuntimeError(f"{engines[player]} returned an illegal move {move}")
+
+    black_count, white_count = game.get_piece_count()
+    return {
+        "black": black_engine,
+        "white": white_engine,
+        "black_count": black_count,
+        "white_count": white_count,
+        "black_time": (move_time[BLACK], move_count[BLACK]),
+        "white_time": (move_time[WHITE], move_count[WHITE])
+    }
+
+
+def elo(score):
+    """ Elo difference corresponding to an expected score, or None when it is 0 or 1 (unbounded) """
+    if score <= 0 or score >= 1:
+        return None
+    return round(-400 * math.log10(1 / score - 1), 1)
+
+
+def summarize(engine_a, engine_b, results):
+    """ W/D/L, Elo with a 95% confidence interval, and average move times, from engine_a's point of view """
+    points = []
+    times = {engine_a: [0.0, 0], engine_b: [0.0, 0]}
+    for result in results:
+        a_count = result["black_count"] if result["black"] == engine_a else result["white_count"]
+        b_count = result["white_count"] if result["black"] == engine_a else result["black_count"]
+        points.append(1.0 if a_count > b_count else 0.5 if a_count == b_count else 0.0)
+        for colour in ("black", "white"):
+            seconds, moves = result[f"{colour}_time"]
+            times[result[colour]][0] += seconds
+            times[result[colour]][1] += moves
+
+    games = len(points)
+    score = sum(points) / games
+    deviation = math.sqrt(sum((point - score) ** 2 for point in points) / games)
+    margin = Z_95 * deviation / math.sqrt(games)
+    return {
+        "engines": [engine_a, engine_b],
+        "games": games,
+        "wins": points.count(1.0),
+        "draws": points.count(0.5),
+        "losses": points.count(0.0),
+        "score": round(score, 4),
+        "elo": elo(score),
+        "elo_95": [elo(score - margin), elo(score + margin)],
+        "average_move_ms": {engine: round(seconds / moves * 1000, 2) if moves else None
+                            for engine, (seconds, moves) in times.items()}
+    }
+
+
+def run_match(engine_a, engine_b, games, workers, opening_plies, seed):
+    """ Play `games` games (rounded up to an even number) in a process pool """
+    pairs = (games + 1) // 2
+    tasks = []
+    for index, opening in enumerate(openings(opening_plies, pairs, seed)):
+        tasks.append((engine_a, engine_b, opening, seed + 2 * index))
+        tasks.append((engine_b, engine_a, opening, seed + 2 * index + 1))
+    if len(tasks) < 2 * pairs:
+        print(f"Only {len(tasks) // 2} distinct openings of {opening_plies} plies exist; playing {len(tasks)} games")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = []
+        for result in pool.map(play_game, tasks):
+            results.append(result)
+            if len(results) % 20 == 0:
+                print(f"{len(results)}/{len(tasks)} games played")
+    return summarize(engine_a, engine_b, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play two Othello engines against each other")
+    parser.add_argument("engine_a", help="easy, hard, greedy, random or z3[:seconds]")
+    parser.add_argument("engine_b", help="easy, hard, greedy, random or z3[:seconds]")
+    parser.add_argument("--games", type=int, default=100, help="Number of games (each opening is played twice)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Games played at the same time")
+    parser.add_argument("--opening-plies", type=int, default=4, help="Length of the opening sequences")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for choosing openings and random moves")
+    parser.add_argument("--output", help="Also write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    summary = run_match(args.engine_a, args.engine_b, args.games, args.workers, args.opening_plies, args.seed)
+    print(json.dumps(summary, indent=1))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
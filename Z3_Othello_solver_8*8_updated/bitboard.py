@@ -0,0 +1,162 @@
+"""
+Bitboard primitives for the 8x8 Othello board.
+
+A position is stored as two 64-bit integers, one per colour. Square (row, col)
+maps to bit ``row * 8 + col``, so iterating set bits from low to high visits
+squares in the same row-major order as ``for r in range(8): for c in range(8)``.
+"""
+
+import random
+
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE  # Everything except column 0
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F  # Everything except column 7
+
+# (shift, mask) pairs in the same order as the (dr, dc) directions used by the
+# NumPy implementation. A positive shift moves towards higher bit indices.
+DIRECTIONS = [
+    (-9, NOT_H_FILE),  # (-1, -1)
+    (-8, FULL_MASK),   # (-1,  0)
+    (-7, NOT_A_FILE),  # (-1,  1)
+    (-1, NOT_H_FILE),  # ( 0, -1)
+    (1, NOT_A_FILE),   # ( 0,  1)
+    (7, NOT_H_FILE),   # ( 1, -1)
+    (8, FULL_MASK),    # ( 1,  0)
+    (9, NOT_A_FILE),   # ( 1,  1)
+]
+
+START_BLACK = (1 << 28) | (1 << 35)  # (3, 4) and (4, 3)
+START_WHITE = (1 << 27) | (1 << 36)  # (3, 3) and (4, 4)
+
+# Zobrist keys: one random 64-bit value per (square, colour) plus one for "white to move".
+# A fixed seed keeps keys identical across processes and restarts.
+_zobrist_rng = random.Random(0x0E11E110)
+ZOBRIST_BLACK = [_zobrist_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_WHITE = [_zobrist_rng.getrandbits(64) for _ in range(64)]
+ZOBRIST_FLIP = [b ^ w for b, w in zip(ZOBRIST_BLACK, ZOBRIST_WHITE)]  # Disc changes colour
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+
+def shift(bits, step, mask):
+    """ Shift every disc one square in a direction, dropping discs that wrap around """
+    if step > 0:
+        return (bits << step) & mask & FULL_MASK
+    return (bits >> -step) & mask
+
+
+def popcount(bits):
+    """ Number of set bits """
+    return bin(bits).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    popcount = int.bit_count
+
+
+def square_bit(row, col):
+    """ Bit for a (row, col) square """
+    return 1 << (row * 8 + col)
+
+
+def iter_squares(bits):
+    """ Yield (row, col) for every set bit, in row-major order """
+    while bits:
+        low = bits & -bits
+        index = low.bit_length() - 1
+        yield index >> 3, index & 7
+        bits ^= low
+
+
+def legal_moves(own, opp):
+    """ Bitmask of every empty square where `own` can play and flip at least one disc """
+    empty = ~(own | opp) & FULL_MASK
+    # Opponent discs off the A and H files: runs through them cannot wrap around a row edge
+    inner = opp & 0x7E7E7E7E7E7E7E7E
+    moves = 0
+    for step, through in ((1, inner), (8, opp), (7, inner), (9, inner)):
+        # Runs of opponent discs (at most 6 long) next to our discs, towards higher bits
+        run = through & (own << step)
+        run |= through & (run << step)
+        run |= through & (run << step)
+        run |= through & (run << step)
+        run |= through & (run << step)
+        run |= through & (run << step)
+        moves |= empty & (run << step)
+        # ... and towards lower bits
+        run = through & (own >> step)
+        run |= through & (run >> step)
+        run |= through & (run >> step)
+        run |= through & (run >> step)
+        run |= through & (run >> step)
+        run |= through & (run >> step)
+        moves |= empty & (run >> step)
+    return moves
+
+
+def flip_lines(own, opp, index):
+    """
+    Return the discs flipped by playing at bit `index`, one list per direction.
+    Each list is ordered outward from the placed disc.
+    """
+    lines = []
+    move = 1 << index
+    for step, mask in DIRECTIONS:
+        line = []
+        cursor = shift(move, step, mask)
+        while cursor & opp:
+            line.append(cursor)
+            cursor = shift(cursor, step, mask)
+        if line and cursor & own:
+            lines.append(line)
+    return lines
+
+
+def flips(own, opp, index):
+    """ Bitmask of the discs flipped by playing at bit `index` (0 if the move is illegal) """
+    flipped = 0
+    move = 1 << index
+    for step, mask in DIRECTIONS:
+        run = 0
+        cursor = shift(move, step, mask)
+        while cursor & opp:
+            run |= cursor
+            cursor = shift(cursor, step, mask)
+        if cursor & own:
+            flipped |= run
+    return flipped
+
+
+def sum_squares(bits, values):
+    """ Sum of values[index] over the set bits """
+    total = 0
+    while bits:
+        low = bits & -bits
+        total += values[low.bit_length() - 1]
+        bits ^= low
+    return total
+
+
+def zobrist_hash(black, white):
+    """ Zobrist hash of the discs on the board (side to move not included) """
+    key = 0
+    for index in range(64):
+        bit = 1 << index
+        if black & bit:
+            key ^= ZOBRIST_BLACK[index]
+        elif white & bit:
+            key ^= ZOBRIST_WHITE[index]
+    return key
+
+
+def from_array(board, black, white):
+    """ Build (black_bits, white_bits) from an 8x8 array-like board """
+    black_bits = 0
+    white_bits = 0
+    for r in range(8):
+        row = board[r]
+        for c in range(8):
+            if row[c] == black:
+                black_bits |= 1 << (r * 8 + c)
+            elif row[c] == white:
+                white_bits |= 1 << (r * 8 + c)
+    return black_bits, white_bits
@@ -0,0 +1,250 @@
+"""
+Exact endgame solver working directly on bitboards.
+
+Scores are final disc differentials from the point of view of the side to
+move, with empty squares going to the winner (the usual Othello scoring), so
++64 is a wipe-out win and 0 is a draw.
+"""
+
+import bitboard
+from bitboard import DIRECTIONS, popcount, shift
+
+# Board quadrants used for parity ordering
+QUADRANT_MASKS = [0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000]
+QUADRANT_OF = [(r // 4) * 2 + (c // 4) for r in range(8) for c in range(8)]
+
+FASTEST_FIRST_MIN_EMPTIES = 7  # Below this, parity ordering alone is cheaper than counting replies
+TABLE_MIN_EMPTIES = 8  # Positions with fewer empties are not worth caching
+TIME_CHECK_INTERVAL = 1024  # Nodes between calls to the time check
+
+
+def _build_rays():
+    """ For each square, the bits along every direction that has room for a flip """
+    rays = []
+    for index in range(64):
+        square_rays = []
+        for step, mask in DIRECTIONS:
+            ray = []
+            cursor = shift(1 << index, step, mask)
+            while cursor:
+                ray.append(cursor)
+                cursor = shift(cursor, step, mask)
+            if len(ray) >= 2:
+                square_rays.append(ray)
+        rays.append(square_rays)
+    return rays
+
+
+RAYS = _build_rays()
+NEIGHBOURS = [0] * 64
+for _index in range(64):
+    for _step, _mask in DIRECTIONS:
+        NEIGHBOURS[_index] |= shift(1 << _index, _step, _mask)
+
+
+def flips(own, opp, index):
+    """ Bitmask of discs flipped by `own` playing at `index` (0 if the move is illegal) """
+    if not NEIGHBOURS[index] & opp:
+        return 0
+    flipped = 0
+    for ray in RAYS[index]:
+        run = 0
+        for bit in ray:
+            if opp & bit:
+                run |= bit
+            else:
+                if own & bit:
+                    flipped |= run
+                break
+    return flipped
+
+
+def final_score(own, opp):
+    """ Disc differential of a finished game, empty squares going to the winner """
+    own_count = popcount(own)
+    opp_count = popcount(opp)
+    diff = own_count - opp_count
+    if diff > 0:
+        diff += 64 - own_count - opp_count
+    elif diff < 0:
+        diff -= 64 - own_count - opp_count
+    return diff
+
+
+class EndgameSolver:
+    """
+    Perfect-play alpha-beta (principal variation) search to the end of the game.
+    Moves are ordered fastest-first (fewest opponent replies) and by quadrant
+    parity, positions with many empties are cached, and the last four empties
+    are handled by a lighter search without move generation or ordering.
+    """
+
+    def __init__(self, check_time=None):
+        self.check_time = check_time  # Called every TIME_CHECK_INTERVAL nodes; may raise to abort
+        self.nodes = 0
+        self.table = {}
+
+    def solve(self, own, opp, alpha=-64, beta=64):
+        """ Exact score of the position for the side to move """
+        empties = ~(own | opp) & bitboard.FULL_MASK
+        return self._search(own, opp, alpha, beta, empties, popcount(empties), False)
+
+    def best_move(self, own, opp):
+        """ Return (index, score) of the best move for the side to move, or (None, score) if it must pass """
+        empties = ~(own | opp) & bitboard.FULL_MASK
+        n_empty = popcount(empties)
+        moves = self._ordered_moves(own, opp, empties, n_empty)
+        if not moves:
+            return None, self.solve(own, opp)
+
+        best_index = moves[0][0]
+        alpha, beta = -65, 65
+        for number, (index, bit, flipped) in enumerate(moves):
+            child_own = opp & ~flipped
+            child_opp = own | flipped | bit
+            if number == 0:
+                score = -self._search(child_own, child_opp, -beta, -alpha, empties ^ bit, n_empty - 1, False)
+            else:
+                score = -self._search(child_own, child_opp, -alpha - 1, -alpha, empties ^ bit, n_empty - 1, False)
+                if score > alpha:
+                    score = -self._search(child_own, child_opp, -beta, -score, empties ^ bit, n_empty - 1, False)
+            if score > alpha:
+                alpha = score
+                best_index = index
+        return best_index, alpha
+
+    def _ordered_moves(self, own, opp, empties, n_empty):
+        """ Legal moves as (index, bit, flipped) tuples, best candidates first """
+        odd_regions = 0
+        for mask in QUADRANT_MASKS:
+            if popcount(empties & mask) & 1:
+                odd_regions |= mask
+
+        moves = []
+        remaining = empties
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            index = bit.bit_length() - 1
+            flipped = flips(own, opp, index)
+            if flipped:
+                moves.append((index, bit, flipped))
+
+        if n_empty >= FASTEST_FIRST_MIN_EMPTIES:
+            # Fastest first: the fewer replies the opponent has, the sooner the search narrows
+            def order_key(move):
+                index, bit, flipped = move
+                replies = popcount(bitboard.legal_moves(opp & ~flipped, own | flipped | bit))
+                return replies * 2 - (1 if bit & odd_regions else 0)
+            moves.sort(key=order_key)
+        else:
+            # Parity: play in quadrants with an odd number of empties first
+            moves.sort(key=lambda move: 0 if move[1] & odd_regions else 1)
+        return moves
+
+    def _search(self, own, opp, alpha, beta, empties, n_empty, passed):
+        self.nodes += 1
+        if self.check_time is not None and self.nodes % TIME_CHECK_INTERVAL == 0:
+            self.check_time()
+
+        if n_empty <= 4:
+            return self._search_small(own, opp, alpha, beta, _parity_sorted(empties), passed)
+
+        # Cached bounds from an earlier visit of this position
+        key = None
+        if n_empty >= TABLE_MIN_EMPTIES:
+            key = (own, opp)
+            bounds = self.table.get(key)
+            if bounds is not None:
+                lower, upper = bounds
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+
+        moves = self._ordered_moves(own, opp, empties, n_empty)
+        if not moves:
+            if passed:
+                return final_score(own, opp)
+            return -self._search(opp, own, -beta, -alpha, empties, n_empty, True)
+
+        alpha_orig = alpha
+        best = -65
+        for number, (index, bit, flipped) in enumerate(moves):
+            child_own = opp & ~flipped
+            child_opp = own | flipped | bit
+            if number == 0:
+                score = -self._search(child_own, child_opp, -beta, -alpha, empties ^ bit, n_empty - 1, False)
+            else:
+                # Null-window probe, re-searched only when the move beats the best so far
+                score = -self._search(child_own, child_opp, -alpha - 1, -alpha, empties ^ bit, n_empty - 1, False)
+                if alpha < score < beta:
+                    score = -self._search(child_own, child_opp, -beta, -score, empties ^ bit, n_empty - 1, False)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if key is not None:
+            lower, upper = self.table.get(key, (-64, 64))
+            if best <= alpha_orig:
+                upper = min(upper, best)
+            elif best >= beta:
+                lower = max(lower, best)
+            else:
+                lower = upper = best
+            self.table[key] = (lower, upper)
+        return best
+
+    def _search_small(self, own, opp, alpha, beta, squares, passed):
+        """ Search for the last few empties: `squares` is the list of empty indices in parity order """
+        if len(squares) == 1:
+            return self._solve_last(own, opp, squares[0])
+
+        best = -65
+        for index in squares:
+            flipped = flips(own, opp, index)
+            if not flipped:
+                continue
+            bit = 1 << index
+            rest = [square for square in squares if square != index]
+            score = -self._search_small(opp & ~flipped, own | flipped | bit, -beta, -alpha, rest, False)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        return best
+
+        if best == -65:
+            # No legal move: pass, or score the game if the opponent cannot move either
+            if passed:
+                return final_score(own, opp)
+            return -self._search_small(opp, own, -beta, -alpha, squares, True)
+        return best
+
+    def _solve_last(self, own, opp, index):
+        """ Score with a single empty square left: whoever can play there does so """
+        self.nodes += 1
+        flipped = flips(own, opp, index)
+        if flipped:
+            return 2 * popcount(own | flipped) - 62
+        flipped = flips(opp, own, index)
+        if flipped:
+            return 62 - 2 * popcount(opp | flipped)
+        return final_score(own, opp)
+
+
+def _parity_sorted(empties):
+    """ Empty square indices with the squares in odd-parity quadrants first """
+    squares = list(bitboard.iter_squares(empties))
+    indices = [r * 8 + c for r, c in squares]
+    counts = [0, 0, 0, 0]
+    for index in indices:
+        counts[QUADRANT_OF[index]] += 1
+    indices.sort(key=lambda index: 0 if counts[QUADRANT_OF[index]] & 1 else 1)
+    return indices
@@ -0,0 +1,213 @@
+"""
+Endgame benchmark: run the solver on a suite of endgame positions with known
+exact scores and best moves, and report time, nodes, nodes per second and
+whether the move and score were right.
+
+The suite (endgame_suite.json) is generated by this script from random games,
+and every move of every position is scored with a plain alpha-beta search that
+shares none of the solver's move ordering, caching or special cases. That
+search takes about a minute per move at 14 empties, so the suite stops there
+(REFERENCE_MAX_EMPTIES); deeper positions could only be scored by the solver
+under test. Positions use the FFO text format: 64 characters row by row,
+X = Black, O = White, - = empty.
+
+Every position is solved with OthelloZ3Solver.solve_exact, whatever its number
+of empties, so the suite measures the endgame solver rather than the heuristics.
+
+    python endgame_bench.py                          # Run the suite, print a summary
+    python endgame_bench.py --output results.json    # ... and save the full results
+    python endgame_bench.py --max-empties 12         # Only the quicker positions
+    python endgame_bench.py --generate --empties 10 12 --count 6
+    python endgame_bench.py --generate --append --empties 14 --count 2
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+import bitboard
+from endgame import final_score
+from game_logic import Othello, Position, BLACK, WHITE
+from z3_solver import OthelloZ3Solver
+
+SUITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "endgame_suite.json")
+REFERENCE_MAX_EMPTIES = 14  # Deepest positions the reference search scores in reasonable time
+
+
+def square_name(index):
+    """ Square name as shown in the hints, e.g. 'C4' for row 3, column 2 """
+    return f"{chr(65 + (index & 7))}{(index >> 3) + 1}"
+
+
+def parse_position(board, to_move):
+    """ Build a game from an FFO-style board string and side to move ('X' or 'O') """
+    black = sum(1 << index for index, cell in enumerate(board) if cell == "X")
+    white = sum(1 << index for index, cell in enumerate(board) if cell == "O")
+    return Othello.from_position(Position(black, white, BLACK if to_move == "X" else WHITE))
+
+
+def format_board(black, white):
+    """ FFO-style board string of a position """
+    return "".join("X" if black >> index & 1 else "O" if white >> index & 1 else "-" for index in range(64))
+
+
+def reference_score(own, opp, alpha=-64, beta=64, passed=False):
+    """ Exact score for the side to move by plain alpha-beta, without ordering or caching """
+    moves = bitboard.legal_moves(own, opp)
+    if not moves:
+        if passed:
+            return final_score(own, opp)
+        return -reference_score(opp, own, -beta, -alpha, True)
+    best = -65
+    while moves:
+        bit = moves & -moves
+        moves ^= bit
+        flipped = bitboard.flips(own, opp, bit.bit_length() - 1)
+        score = -reference_score(opp & ~flipped, own | flipped | bit, -beta, -alpha)
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    return best
+
+
+def reference_best_moves(own, opp, moves):
+    """ (score, best move indices) from the exact value of every move by reference_score """
+    scores = {}
+    for row, col in bitboard.iter_squares(moves):
+        index = row * 8 + col
+        flipped = bitboard.flips(own, opp, index)
+        scores[index] = -reference_score(opp & ~flipped, own | flipped | (1 << index))
+    best = max(scores.values())
+    return best, [index for index, score in scores.items() if score == best]
+
+
+def generate_suite(empties_list, count, seed):
+    """ Random positions with the given numbers of empties, each solved exactly move by move """
+    rng = random.Random(seed)
+    positions = []
+    for empties in empties_list:
+        found = 0
+        while found < count:
+            # Play random moves until the board has the wanted number of empties
+            own, opp, to_move = bitboard.START_BLACK, bitboard.START_WHITE, "X"
+            while 64 - bitboard.popcount(own | opp) > empties:
+                moves = list(bitboard.iter_squares(bitboard.legal_moves(own, opp)))
+                if not moves:
+                    own, opp, to_move = opp, own, "O" if to_move == "X" else "X"
+                    moves = list(bitboard.iter_squares(bitboard.legal_moves(own, opp)))
+                    if not moves:
+                        break
+                row, col = rng.choice(moves)
+                index = row * 8 + col
+                flipped = bitboard.flips(own, opp, index)
+                own, opp = opp & ~flipped, own | flipped | (1 << index)
+                to_move = "O" if to_move == "X" else "X"
+            moves = bitboard.legal_moves(own, opp)
+            if 64 - bitboard.popcount(own | opp) != empties or bitboard.popcount(moves) < 2:
+                continue  # Game ended early, or only one move: nothing to choose
+
+            best, best_moves = reference_best_moves(own, opp, moves)
+            black, white = (own, opp) if to_move == "X" else (opp, own)
+            found += 1
+            positions.append({
+                "id": f"e{empties}-{found}",
+                "board": format_board(black, white),
+                "to_move": to_move,
+                "empties": empties,
+                "score": best,
+                "best_moves": sorted(square_name(index) for index in best_moves)
+            })
+            print(f"{positions[-1]['id']}: score {best:+d}, best {positions[-1]['best_moves']}")
+    return positions
+
+
+def run_suite(positions, time_limit):
+    """ Solve every position with OthelloZ3Solver and compare with the known results """
+    results = []
+    for position in positions:
+        game = parse_position(position["board"], position["to_move"])
+        solver = OthelloZ3Solver(game, time_limit=time_limit)
+        start = time.perf_counter()
+        move = solver.solve_exact()
+        elapsed = time.perf_counter() - start
+        nodes = solver.stats.nodes + solver.stats.endgame_nodes
+        move_name = square_name(move[0] * 8 + move[1]) if move else None
+        results.append({
+            "id": position["id"],
+            "empties": position["empties"],
+            "move": move_name,
+            "score": solver.last_exact_score,
+            "move_correct": move_name in position["best_moves"],
+            "score_correct": solver.last_exact_score == position["score"],
+            "time_ms": round(elapsed * 1000, 1),
+            "nodes": nodes,
+            "nodes_per_second": round(nodes / elapsed) if elapsed > 0 else None
+        })
+    return results
+
+
+def summarize(results):
+    """ Totals over a run """
+    total_time = sum(result["time_ms"] for result in results) / 1000
+    total_nodes = sum(result["nodes"] for result in results)
+    return {
+        "positions": len(results),
+        "moves_correct": sum(result["move_correct"] for result in results),
+        "scores_correct": sum(result["score_correct"] for result in results),
+        "total_time_ms": round(total_time * 1000, 1),
+        "total_nodes": total_nodes,
+        "nodes_per_second": round(total_nodes / total_time) if total_time > 0 else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Endgame benchmark for the Othello solver")
+    parser.add_argument("--suite", default=SUITE_PATH, help="Suite file (default: endgame_suite.json)")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="Time budget per position in seconds")
+    parser.add_argument("--generate", action="store_true", help="Generate the suite file instead of running it")
+    parser.add_argument("--empties", type=int, nargs="+", default=[10, 12], help="Empties of generated positions")
+    parser.add_argument("--count", type=int, default=6, help="Generated positions per number of empties")
+    parser.add_argument("--seed", type=int, default=2024, help="Random seed for generation")
+    parser.add_argument("--append", action="store_true", help="Add the generated positions to the existing suite")
+    parser.add_argument("--max-empties", type=int, help="Only run positions with at most this many empties")
+    args = parser.parse_args()
+
+    if args.generate:
+        if max(args.empties) > REFERENCE_MAX_EMPTIES:
+            parser.error(f"positions can only be verified up to {REFERENCE_MAX_EMPTIES} empties")
+        positions = generate_suite(args.empties, args.count, args.seed)
+        if args.append and os.path.exists(args.suite):
+            with open(args.suite) as f:
+                existing = json.load(f)["positions"]
+            ids = {position["id"] for position in positions}
+            positions = [position for position in existing if position["id"] not in ids] + positions
+        with open(args.suite, "w") as f:
+            json.dump({"seed": args.seed, "positions": positions}, f, indent=1)
+        print(f"Wrote {len(positions)} positions to {args.suite}")
+        return
+
+    with open(args.suite) as f:
+        positions = json.load(f)["positions"]
+    if args.max_empties is not None:
+        positions = [position for position in positions if position["empties"] <= args.max_empties]
+    results = run_suite(positions, args.time_limit)
+    for result in results:
+        status = "ok" if result["move_correct"] and result["score_correct"] else "WRONG"
+        score = "not solved" if result["score"] is None else f"{result['score']:+d}"
+        print(f"{result['id']:>8} {result['empties']:>3} empties  {result['move']} {score}  "
+              f"{result['time_ms']:>9.1f} ms  {result['nodes']:>9} nodes  {status}")
+    summary = summarize(results)
+    print(json.dumps(summary, indent=1))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Table-driven position evaluation on bitboards.
+
+Every term of the solver's evaluation is a popcount of the position masked by
+a precomputed square set, so a leaf costs a few dozen integer operations
+instead of scans over the 8x8 array. The terms that only depend on which
+squares each side occupies (discs, corners, X/C-squares, edges and positional
+weights) can also be kept up to date move by move with IncrementalOthello.
+"""
+
+from collections import namedtuple
+
+import bitboard
+from bitboard import FULL_MASK, popcount
+from game_logic import Othello, BLACK
+
+# (piece, corner, x-square, c-square, edge, mobility, stability, frontier, positional) weights
+EARLY_GAME_WEIGHTS = (10, 500, -300, -150, 50, 100, 300, 20, 30)
+MID_GAME_WEIGHTS = (50, 400, -150, -100, 100, 80, 300, 30, 50)
+LATE_GAME_WEIGHTS = (500, 300, -50, -30, 100, 20, 500, 10, 50)
+PHASE_WEIGHTS = (EARLY_GAME_WEIGHTS, MID_GAME_WEIGHTS, LATE_GAME_WEIGHTS)
+EARLY_GAME, MID_GAME, LATE_GAME = range(3)
+
+# What IncrementalOthello.undo_move needs: the base MoveRecord and the static terms before the move
+IncrementalRecord = namedtuple("IncrementalRecord", ["move_record", "static_terms"])
+
+# The static score of all three phases is packed into one integer, 24 signed bits per
+# phase, so keeping it up to date costs a single addition per changed square
+_PHASE_BITS = 24
+_PHASE_MASK = (1 << _PHASE_BITS) - 1
+_PHASE_HALF = 1 << (_PHASE_BITS - 1)
+
+
+def pack_phases(values):
+    """ Pack one value per game phase into a single integer """
+    return sum(value << (_PHASE_BITS * phase) for phase, value in enumerate(values))
+
+
+def unpack_phase(packed, phase):
+    """ Extract the value of one game phase from a packed integer """
+    for _ in range(phase):
+        low = ((packed + _PHASE_HALF) & _PHASE_MASK) - _PHASE_HALF
+        packed = (packed - low) >> _PHASE_BITS
+    return ((packed + _PHASE_HALF) & _PHASE_MASK) - _PHASE_HALF
+
+
+def squares_mask(squares):
+    """ Bitmask of a list of (row, col) squares """
+    mask = 0
+    for r, c in squares:
+        mask |= bitboard.square_bit(r, c)
+    return mask
+
+
+def adjacent_squares(bits):
+    """ Every square next to (in any of the 8 directions) a set bit, plus the set bits themselves """
+    row = bits | ((bits << 1) & bitboard.NOT_A_FILE) | ((bits >> 1) & bitboard.NOT_H_FILE)
+    return (row | (row << 8) | (row >> 8)) & FULL_MASK
+
+
+def frontier_discs(own, opp):
+    """ Bitmasks (own, opp) of the frontier discs: discs next to at least one empty square """
+    near_empty = adjacent_squares(~(own | opp) & FULL_MASK)
+    return own & near_empty, opp & near_empty
+
+
+def _diagonal_masks(dc):
+    """ Masks of the diagonals (dc = 1) or anti-diagonals (dc = -1) with at least 3 squares """
+    lines = []
+    for start in range(-5, 6):
+        line = 0
+        for r in range(8):
+            c = r + start if dc == 1 else 7 - r + start
+            if 0 <= c < 8:
+                line |= bitboard.square_bit(r, c)
+        lines.append(line)
+    return lines
+
+
+EDGE_RING = 0xFF818181818181FF
+DIAGONALS = _diagonal_masks(1)
+ANTI_DIAGONALS = _diagonal_masks(-1)
+_NOT_A_FILE = bitboard.NOT_A_FILE
+_NOT_H_FILE = bitboard.NOT_H_FILE
+
+
+def _anchored_axes(occupied):
+    """
+    For each line direction, the squares that cannot be flipped along it whatever
+    their neighbours: the ends of each line (the board edge) and every full line
+    """
+    rows = occupied & (occupied >> 1)
+    rows &= rows >> 2
+    rows &= rows >> 4
+    full_rows = (rows & 0x0101010101010101) * 0xFF  # Column 0 holds "the whole row is filled"
+    columns = occupied & (occupied >> 8)
+    columns &= columns >> 16
+    columns &= columns >> 32
+    full_columns = (columns & 0xFF) * 0x0101010101010101  # Row 0 holds "the whole column is filled"
+    diagonals = EDGE_RING
+    for line in DIAGONALS:
+        if occupied & line == line:
+            diagonals |= line
+    anti_diagonals = EDGE_RING
+    for line in ANTI_DIAGONALS:
+        if occupied & line == line:
+            anti_diagonals |= line
+    return (full_rows | 0x8181818181818181, full_columns | 0xFF000000000000FF, diagonals, anti_diagonals)
+
+
+def _grow_stable(own, axes):
+    """ Stable discs of one colour, grown from the discs anchored along every direction """
+    rows, columns, diagonals, anti_diagonals = axes
+    stable = own & rows & columns & diagonals & anti_diagonals
+    if not stable:
+        return 0  # Nothing to grow from
+    while True:
+        # Along each direction, a stable neighbour of the same colour on either side is enough
+        grown = own & \
+            (rows | ((stable << 1) & _NOT_A_FILE) | ((stable >> 1) & _NOT_H_FILE)) & \
+            (columns | (stable << 8) | (stable >> 8)) & \
+            (diagonals | ((stable << 9) & _NOT_A_FILE) | ((stable >> 9) & _NOT_H_FILE)) & \
+            (anti_diagonals | ((stable << 7) & _NOT_H_FILE) | ((stable >> 7) & _NOT_A_FILE))
+        if grown == stable:
+            return stable
+        stable = grown
+
+
+def stable_discs(own, opp):
+    """
+    Bitmasks (own, opp) of the discs of each side that can never be flipped. A disc is
+    stable when, along each of the four line directions, its line is full, it sits at
+    the end of the line, or it is next to a stable disc of its own colour; stable discs
+    are grown from those conditions until nothing changes.
+    """
+    axes = _anchored_axes(own | opp)
+    return _grow_stable(own, axes), _grow_stable(opp, axes)
+
+
+class Evaluator:
+    """
+    Bitboard version of the solver's strategic evaluation. Built from the solver's
+    square tables and phase thresholds. The material, square and mobility terms
+    match the array based evaluation; stability (counted over the whole board
+    rather than walked from the corners) and frontier (counted exactly rather
+    than sampled) deliberately score differently.
+    """
+
+    def __init__(self, position_weights, corners, x_squares, c_squares, edges,
+                 early_game_threshold, late_game_threshold):
+        self.corner_mask = squares_mask(corners)
+        self.x_square_mask = squares_mask(x_squares)
+        self.c_square_mask = squares_mask(c_squares)
+        self.edge_mask = squares_mask(edges)
+        self.early_game_threshold = early_game_threshold
+        self.late_game_threshold = late_game_threshold
+
+        # Positional value: one mask per distinct weight in the weight matrix
+        weight_masks = {}
+        for r in range(8):
+            for c in range(8):
+                weight = position_weights[r][c]
+                weight_masks[weight] = weight_masks.get(weight, 0) | bitboard.square_bit(r, c)
+        self.weight_masks = [(weight, mask) for weight, mask in weight_masks.items() if weight]
+
+        # Static score of a disc on each square, for every phase at once (see pack_phases)
+        self.square_values = []
+        for r in range(8):
+            for c in range(8):
+                bit = bitboard.square_bit(r, c)
+                values = []
+                for weights in PHASE_WEIGHTS:
+                    piece_weight, corner_weight, x_square_weight, c_square_weight, edge_weight = weights[:5]
+                    values.append(piece_weight +
+                                  corner_weight * bool(bit & self.corner_mask) +
+                                  x_square_weight * bool(bit & self.x_square_mask) +
+                                  c_square_weight * bool(bit & self.c_square_mask) +
+                                  edge_weight * bool(bit & self.edge_mask) +
+                                  weights[8] * position_weights[r][c])
+                self.square_values.append(pack_phases(values))
+
+    def phase(self, total_pieces):
+        """ Game phase (EARLY_GAME, MID_GAME or LATE_GAME) for a number of discs on the board """
+        if total_pieces < self.early_game_threshold:
+            return EARLY_GAME
+        if total_pieces > self.late_game_threshold:
+            return LATE_GAME
+        return MID_GAME
+
+    def evaluate(self, own, opp, static_terms=None):
+        """
+        Score of the position for the side to move, whose discs are `own`.
+        `static_terms`, if given, is static_terms(own, opp) already maintained by the caller.
+        """
+        phase = self.phase(popcount(own | opp))
+        piece_weight, corner_weight, x_square_weight, c_square_weight, edge_weight, \
+            mobility_weight, stability_weight, frontier_weight, positional_weight = PHASE_WEIGHTS[phase]
+
+        if static_terms is not None:
+            score = unpack_phase(static_terms, phase)
+        else:
+            piece_diff = popcount(own) - popcount(opp)
+            corners = popcount(own & self.corner_mask) - popcount(opp & self.corner_mask)
+            x_squares = popcount(own & self.x_square_mask) - popcount(opp & self.x_square_mask)
+            c_squares = popcount(own & self.c_square_mask) - popcount(opp & self.c_square_mask)
+            edges = popcount(own & self.edge_mask) - popcount(opp & self.edge_mask)
+            positional_value = self.positional_value(own) - self.positional_value(opp)
+            score = (piece_weight * piece_diff +
+                     corner_weight * corners +
+                     x_square_weight * x_squares +
+                     c_square_weight * c_squares +
+                     edge_weight * edges +
+                     positional_weight * positional_value)
+
+        mobility_diff = popcount(bitboard.legal_moves(own, opp)) - popcount(bitboard.legal_moves(opp, own))
+        my_stable, opp_stable = stable_discs(own, opp)
+        stability_diff = popcount(my_stable) - popcount(opp_stable)
+        my_frontier, opp_frontier = frontier_discs(own, opp)
+        frontier_diff = popcount(opp_frontier) - popcount(my_frontier)  # Fewer frontier discs is better
+
+        return (score +
+                mobility_weight * mobility_diff +
+                stability_weight * stability_diff +
+                frontier_weight * frontier_diff)
+
+    def static_terms(self, own, opp):
+        """ Packed static score (discs, corners, X/C-squares, edges, positional value) of own minus opp """
+        return bitboard.sum_squares(own, self.square_values) - bitboard.sum_squares(opp, self.square_values)
+
+    def positional_value(self, bits):
+        """ Sum of the weight matrix over the given discs """
+        return sum(weight * popcount(bits & mask) for weight, mask in self.weight_masks)
+
+
+class IncrementalOthello(Othello):
+    """
+    Othello game whose make_move/undo_move keep the evaluator's static terms up to
+    date (as game.static_terms, from Black's point of view), so a search leaf only
+    has to add mobility, stability and frontier.
+    """
+
+    def __init__(self, evaluator, game=None):
+        super().__init__()
+        if game is not None:
+            self._assign(game)
+        self.evaluator = evaluator
+        self.square_values = evaluator.square_values
+        self._refresh_static_terms()
+
+    @Othello.board.setter
+    def board(self, value):
+        Othello.board.fset(self, value)
+        self._refresh_static_terms()
+
+    def _refresh_static_terms(self):
+        """ Recompute static_terms from scratch """
+        self.static_terms = bitboard.sum_squares(self.black_bits, self.square_values) - \
+            bitboard.sum_squares(self.white_bits, self.square_values)
+
+    def make_move(self, row, col):
+        """ Othello.make_move, also updating static_terms; returns an IncrementalRecord or False """
+        opp = self._player_bits(-self.current_player)
+        record = super().make_move(row, col)
+        if not record:
+            return False
+        # The mover gains the placed disc and the flipped ones, which also leave the opponent
+        flipped = opp & self._player_bits(record.current_player)
+        value = self.square_values[row * 8 + col] + 2 * bitboard.sum_squares(flipped, self.square_values)
+        static_terms = self.static_terms
+        self.static_terms += value if record.current_player == BLACK else -value
+        return IncrementalRecord(record, static_terms)
+
+    def undo_move(self, record):
+        """ Othello.undo_move for a record returned by make_move, restoring static_terms too """
+        super().undo_move(record.move_record)
+        self.static_terms = record.static_terms
+
+    @classmethod
+    def from_position(cls, position, evaluator):
+        """ Create a game object from a Position tuple """
+        return cls(evaluator, Othello.from_position(position))
+
+    def copy(self):
+        """ Create a deep copy of the game object, static terms included """
+        game_copy = IncrementalOthello(self.evaluator)
+        game_copy._assign(self)
+        game_copy.static_terms = self.static_terms
+        return game_copy
+
+    def evaluate(self):
+        """ Evaluator score for the side to move """
+        if self.current_player == BLACK:
+            return self.evaluator.evaluate(self.black_bits, self.white_bits, self.static_terms)
+        return self.evaluator.evaluate(self.white_bits, self.black_bits, -self.static_terms)
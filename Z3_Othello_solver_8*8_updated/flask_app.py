@@ -1,31 +1,76 @@
-from flask import Flask, request, jsonify, render_template
-from game_logic import Othello, BLACK, WHITE
-from ai import get_ai_move, set_difficulty
-from verification import OthelloVerifier
+from flask import Flask, Response, request, jsonify, render_template, make_response
+from game_logic import BLACK, WHITE
+from ai import get_ai_move
+from hint_jobs import HintJobManager, FINISHED
+from sessions import SessionManager
 from z3_solver import OthelloZ3Solver
-import numpy as np
-
-# Helper function, convert NumPy type to Python native type
-def convert_numpy_types(obj):
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {k: convert_numpy_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(i) for i in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_types(i) for i in obj)
-    else:
-        return obj
+from json_provider import FastJSONProvider
+import functools
+import os
+
+# Worker processes used by the Z3 solver (1 = single process) and how they share the work
+SOLVER_WORKERS = int(os.environ.get("OTHELLO_SOLVER_WORKERS", "1"))
+SOLVER_PARALLEL_MODE = os.environ.get("OTHELLO_PARALLEL_MODE", "root_split")  # or "lazy_smp"
+# Search the player's position in the background while they think ("0" to disable)
+PONDERING = os.environ.get("OTHELLO_PONDERING", "1") == "1"
+# How long the client shows the AI's new disc before flipping discs; the server does not wait
+AI_ANIMATION_DELAY_MS = 1000
+# Every browser gets its own game; idle games are dropped after the TTL (seconds), and the least
+# recently used ones first when there are too many or their search tables use too much memory
+MAX_SESSIONS = int(os.environ.get("OTHELLO_MAX_SESSIONS", "100"))
+SESSION_TTL = int(os.environ.get("OTHELLO_SESSION_TTL", "1800"))
+SESSION_MEMORY_MB = int(os.environ.get("OTHELLO_SESSION_MEMORY_MB", "1024"))
+SESSION_COOKIE = "othello_session"
+# Sessions pondering at the same time; searches share the interpreter, so more would slow every request
+MAX_PONDERING = int(os.environ.get("OTHELLO_MAX_PONDERING", "2"))
+# Threads running background hint searches (POST /z3_hint), and how often an idle event stream sends a keepalive
+HINT_WORKERS = int(os.environ.get("OTHELLO_HINT_WORKERS", "2"))
+HINT_EVENT_KEEPALIVE = 15
 
 app = Flask(__name__)
-game = Othello()
-verifier = OthelloVerifier(game)
-z3_solver = OthelloZ3Solver(game, max_depth=20)
+app.json = FastJSONProvider(app)  # orjson when installed; NumPy values are converted while encoding
+
+
+def create_solver(game):
+    return OthelloZ3Solver(game, max_depth=20, workers=SOLVER_WORKERS, parallel_mode=SOLVER_PARALLEL_MODE)
+
+
+sessions = SessionManager(create_solver, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL,
+                          max_memory_mb=SESSION_MEMORY_MB, max_pondering=MAX_PONDERING)
+
+
+def with_session(view=None, locked=True, cancels_hints=False):
+    """
+    Run a view with the caller's GameSession (from the session cookie, or a new one),
+    holding the session's lock so one player's requests never interleave.
+    Views that only look at hint jobs use locked=False, so they answer while a job holds the lock.
+    Views that change the position use cancels_hints=True: the session's hint jobs are
+    cancelled first, so the view waits for a running search to stop rather than to finish.
+    """
+    if view is None:
+        return functools.partial(with_session, locked=locked, cancels_hints=cancels_hints)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        session_id = request.cookies.get(SESSION_COOKIE)
+        session = sessions.get(session_id)
+        if cancels_hints:
+            hint_jobs.cancel_session(session)  # The hints are for a position that is about to change
+        if locked:
+            with session.lock:
+                response = make_response(view(session, *args, **kwargs))
+        else:
+            response = make_response(view(session, *args, **kwargs))
+        if session.id != session_id:
+            response.set_cookie(SESSION_COOKIE, session.id, httponly=True, samesite="Lax")
+        return response
+    return wrapper
+
+
+def start_pondering(session):
+    """Search the position in the background if it is the human player's (Black's) turn"""
+    if PONDERING and session.game.current_player == BLACK:
+        session.solver.start_pondering()
 
 
 @app.route("/")
@@ -34,15 +79,21 @@ def index():
 
 
 @app.route("/board", methods=["GET"])
-def get_board():
-    board_data = game.get_board()
-    return jsonify(convert_numpy_types(board_data))
+@with_session
+def get_board(session):
+    board_data = session.game.get_board()
+    return jsonify(board_data)
 
 @app.route("/move", methods=["POST"])
-def make_move():
+@with_session(cancels_hints=True)
+def make_move(session):
+    game, verifier, z3_solver = session.game, session.verifier, session.solver
     data = request.get_json()
     row, col = data["row"], data["col"]
 
+    # The position is about to change, so any background search of it is stale
+    z3_solver.stop_pondering()
+
     # First verify if the move is valid (for the player's move - BLACK)
     is_valid = game.is_valid_move(row, col)
 
@@ -64,7 +115,7 @@ def make_move():
             "verification": verification_results,
             "player": "black"
         }
-        return jsonify(convert_numpy_types(response_data))
+        return jsonify(response_data)
     else:
         # If the move is invalid, also update the verification
         verifier.verify_legal_move(row, col, BLACK)
@@ -74,12 +125,14 @@ def make_move():
             "success": False,
             "verification": verification_results
         }
-        return jsonify(convert_numpy_types(response_data))
+        return jsonify(response_data)
 
 
 @app.route("/ai_move", methods=["GET"])
-def ai_move():
-    move = get_ai_move(game)
+@with_session(cancels_hints=True)
+def ai_move(session):
+    game, verifier = session.game, session.verifier
+    move = get_ai_move(game, session.difficulty)
     
     # Get valid moves for the current player
     valid_moves = game.get_valid_moves()
@@ -94,6 +147,8 @@ def ai_move():
             # Human player has valid moves, skip AI's turn
             verification_results = verifier.run_all_verifications()
             
+            start_pondering(session)
+            
             response_data = {
                 "success": True,
                 "skip_turn": True,  # Indicate that AI's turn was skipped
@@ -102,7 +157,7 @@ def ai_move():
                 "message": "AI has no valid moves. Your turn.",
                 "current_player": "black" if game.current_player == BLACK else "white"
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
         else:
             # Both sides have no valid moves, game over
             game.current_player = original_player  # Restore original player
@@ -116,7 +171,7 @@ def ai_move():
                 "winner": winner,
                 "message": "Neither player has valid moves. Game over."
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
     
     if move:
         row, col = move
@@ -134,15 +189,19 @@ def ai_move():
             # Run remaining verifications
             verification_results = verifier.run_all_verifications()
             
+            # Think about the player's reply while they do
+            start_pondering(session)
+            
             response_data = {
                 "success": True,
                 "board": game.get_board(),
                 "lastMove": move,
                 "flippedDiscs": game.get_last_flipped_discs(),
+                "animation_delay_ms": AI_ANIMATION_DELAY_MS,
                 "verification": verification_results,
                 "player": "white"
             }
-            return jsonify(convert_numpy_types(response_data))
+            return jsonify(response_data)
     
     # If AI has no valid move, just return current game state
     verification_results = verifier.run_all_verifications()
@@ -151,11 +210,13 @@ def ai_move():
         "verification": verification_results,
         "message": "AI could not make a move. Please try again."
     }
-    return jsonify(convert_numpy_types(response_data))
+    return jsonify(response_data)
 
 
 @app.route("/valid_moves", methods=["GET"])
-def valid_moves():
+@with_session
+def valid_moves(session):
+    game = session.game
     moves = [(r, c) for r in range(8) for c in range(8) if game.is_valid_move(r, c)]
     
     # Check if the current player has no valid moves but the opponent does
@@ -171,28 +232,31 @@ def valid_moves():
     skip_turn = current_player_has_no_moves and len(opponent_moves) > 0
     
     return jsonify({
-        "valid_moves": convert_numpy_types(moves),
+        "valid_moves": moves,
         "should_skip_turn": skip_turn,
         "current_player": "black" if game.current_player == BLACK else "white"
     })
 
 @app.route("/restart", methods=["POST"])
-def restart_game():
-    global game, verifier, z3_solver
-    game = Othello()  # Reinitialize the game
-    verifier = OthelloVerifier(game)  # Reinitialize the verifier
-    z3_solver = OthelloZ3Solver(game, max_depth=20)  # Reinitialize the Z3 solver
+@with_session(cancels_hints=True)
+def restart_game(session):
+    session.reset()  # New game, verifier and Z3 solver
+    start_pondering(session)
     return jsonify({"success": True})
 
 @app.route("/verify", methods=["GET"])
-def verify_game():
+@with_session
+def verify_game(session):
     """Endpoint to run verification on current game state"""
-    verification_results = verifier.run_all_verifications()
-    return jsonify({"verification": convert_numpy_types(verification_results)})
+    verification_results = session.verifier.run_all_verifications()
+    return jsonify({"verification": verification_results})
 
-@app.route("/z3_hint", methods=["GET"])
-def get_z3_hint():
-    """Endpoint to get Z3 solver hint for the best move for the current player"""
+def hint_response(session, profile=False):
+    """
+    Z3 solver hint for the best move of the session's current player, as a response dict.
+    With profile=True the search runs under cProfile and the report is included.
+    """
+    game, z3_solver = session.game, session.solver
     try:
         print("Z3 hint requested for player:", "BLACK" if game.current_player == BLACK else "WHITE")
         
@@ -217,11 +281,11 @@ def get_z3_hint():
             print(f"Valid moves: {valid_moves}")
             
             if not valid_moves:
-                return jsonify({"has_move": False, "message": "No valid moves available for you at this moment."})
+                return {"has_move": False, "message": "No valid moves available for you at this moment."}
             
             # Reanalyze the best move
             print("Calling Z3 solver's analyze_best_move method...")
-            hint_result = z3_solver.analyze_best_move()
+            hint_result = z3_solver.analyze_best_move(profile=profile)
             
             # Print the result for debugging
             if "best_move" in hint_result and hint_result["best_move"]:
@@ -232,7 +296,7 @@ def get_z3_hint():
                 # Return format consistent with frontend expectations
                 row, col = hint_result["best_move"]
                 
-                return jsonify({
+                response_data = {
                     "has_move": True,
                     "best_move": hint_result["best_move"],
                     "best_move_display": f"{chr(65 + col)}{row + 1}",
@@ -243,7 +307,8 @@ def get_z3_hint():
                     "solving_details": {
                         "method": hint_result.get("solving_method", "Z3 Constraint Solving"),
                         "constraints_count": hint_result.get("constraints_count", 0),
-                        "depth": max_depth,
+                        "depth": hint_result.get("search_depth", max_depth),
+                        "exact_score": hint_result.get("exact_score"),
                         "positions_evaluated": hint_result.get("positions_evaluated", 0),
                         "solving_time": hint_result.get("solving_time_ms", 0),
                         "key_constraints": hint_result.get("key_constraints", [
@@ -257,46 +322,119 @@ def get_z3_hint():
                             "Future mobility": "Maintains good future options",
                             "Opponent limitation": "Restricts opponent's responses",
                             "Board control": "Improves control of key regions"
-                        })
+                        }),
+                        "search_stats": hint_result.get("search_stats"),
+                        # Set when the move came from a finished background search; search_stats is then empty
+                        "ponder_stats": hint_result.get("ponder_stats")
                     }
-                })
+                }
+                if "profile" in hint_result:
+                    response_data["profile"] = hint_result["profile"]
+                return response_data
             else:
                 print(f"Z3 has no move. Message: {hint_result.get('analysis', 'No message')}")
-                return jsonify({
+                return {
                     "has_move": False,
                     "message": hint_result.get("analysis", "Could not determine best move")
-                })
+                }
         else:
             print("Not black player's turn, no Z3 hint provided")
-            return jsonify({"has_move": False, "message": "Z3 hints are only available during your turn (as Black)."})
+            return {"has_move": False, "message": "Z3 hints are only available during your turn (as Black)."}
     except Exception as e:
         import traceback
         print(f"Error in Z3 hint endpoint: {str(e)}")
         print(traceback.format_exc())
-        return jsonify({"has_move": False, "message": f"Error in Z3 solver: {str(e)}"})
+        return {"has_move": False, "message": f"Error in Z3 solver: {str(e)}"}
+
+
+@app.route("/z3_hint", methods=["GET"])
+@with_session
+def get_z3_hint(session):
+    """Endpoint to get Z3 solver hint for the best move for the current player (waits for the search)"""
+    # ?profile=1 runs the search under cProfile and returns the report
+    return jsonify(hint_response(session, profile=request.args.get("profile") == "1"))
+
+
+@app.route("/z3_hint", methods=["POST"])
+@with_session(locked=False)
+def start_z3_hint(session):
+    """Start a hint search in the background; returns the job id to poll or stream"""
+    profile = bool((request.get_json(silent=True) or {}).get("profile")) or request.args.get("profile") == "1"
+    job = hint_jobs.submit(session, profile=profile)
+    return jsonify({"job_id": job.id, "status": job.status}), 202
+
+
+@app.route("/z3_hint/<job_id>", methods=["GET"])
+@with_session(locked=False)
+def get_z3_hint_job(session, job_id):
+    """Status, progress (best move of each completed depth) and, once done, the hint of a job"""
+    job = hint_jobs.get(job_id, session)
+    if job is None:
+        return jsonify({"error": "Unknown hint job"}), 404
+    return jsonify(job.as_dict())
+
+
+@app.route("/z3_hint/<job_id>", methods=["DELETE"])
+@with_session(locked=False)
+def cancel_z3_hint_job(session, job_id):
+    """Cancel a hint job; a running search stops and keeps the best move found so far"""
+    job = hint_jobs.get(job_id, session)
+    if job is None:
+        return jsonify({"error": "Unknown hint job"}), 404
+    hint_jobs.cancel(job)
+    return jsonify(job.as_dict())
+
+
+@app.route("/z3_hint/<job_id>/events", methods=["GET"])
+@with_session(locked=False)
+def stream_z3_hint_job(session, job_id):
+    """Server-sent events: a "progress" event per completed depth, then a final event named after the job status"""
+    job = hint_jobs.get(job_id, session)
+    if job is None:
+        return jsonify({"error": "Unknown hint job"}), 404
+
+    def events():
+        sent = 0
+        while True:
+            job.wait(sent, timeout=HINT_EVENT_KEEPALIVE)
+            state = job.as_dict()
+            for step in state["progress"][sent:]:
+                yield f"event: progress\ndata: {app.json.dumps(step)}\n\n"
+            if state["status"] in FINISHED:
+                yield f"event: {state['status']}\ndata: {app.json.dumps(state)}\n\n"
+                return
+            if len(state["progress"]) == sent:
+                yield ": keepalive\n\n"  # Nothing new within HINT_EVENT_KEEPALIVE seconds
+            sent = len(state["progress"])
+
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+hint_jobs = HintJobManager(hint_response, workers=HINT_WORKERS)
+
 
 @app.route("/last_move_info", methods=["GET"])
-def get_last_move_info():
+@with_session
+def get_last_move_info(session):
     """Endpoint to get information about the last move and flipped discs"""
-    last_move_info = game.get_last_move_info()
-    return jsonify(convert_numpy_types(last_move_info))
+    last_move_info = session.game.get_last_move_info()
+    return jsonify(last_move_info)
 
 @app.route("/set_difficulty", methods=["POST"])
-def set_ai_difficulty():
+@with_session(cancels_hints=True)
+def set_ai_difficulty(session):
     """Endpoint to set the AI difficulty level"""
     data = request.get_json()
     difficulty = data.get("difficulty", "easy")
     
-    # Set the difficulty in AI module
-    set_difficulty(difficulty)
+    # Set the difficulty of this player's AI opponent
+    session.difficulty = difficulty.lower()
     
     # If this is a mid-game difficulty change, restart the game
     restart_needed = data.get("restart_needed", False)
     if restart_needed:
-        global game, verifier, z3_solver
-        game = Othello()  # Reinitialize the game
-        verifier = OthelloVerifier(game)  # Reinitialize the verifier
-        z3_solver = OthelloZ3Solver(game, max_depth=20)  # Use max_depth=20 parameter to ensure consistency
+        session.reset()
+        start_pondering(session)
     
     return jsonify({
         "success": True, 
@@ -304,5 +442,10 @@ def set_ai_difficulty():
         "restarted": restart_needed
     })
 
+@app.route("/sessions", methods=["GET"])
+def get_sessions():
+    """Endpoint with the number of active game sessions, the session limits and hint jobs by status"""
+    return jsonify({**sessions.stats(), "hint_jobs": hint_jobs.stats()})
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,21 +1,93 @@
 import numpy as np
-import time
+from collections import namedtuple
+import bitboard
+import symmetry
 
 EMPTY = 0
 BLACK = 1
 WHITE = -1
 
+# Everything make_move changes, so undo_move can restore it without copying the game
+MoveRecord = namedtuple("MoveRecord", [
+    "black_bits", "white_bits", "disc_hash", "symmetric_hash", "current_player",
+    "last_flipped_discs", "last_move", "last_player", "last_ai_move"
+])
+
+# Minimal picklable description of a position, e.g. for sending to worker processes
+Position = namedtuple("Position", ["black_bits", "white_bits", "current_player"])
+
 class Othello:
     def __init__(self):
-        self.board = np.zeros((8, 8), dtype=int)
-        self.board[3, 3], self.board[4, 4] = WHITE, WHITE
-        self.board[3, 4], self.board[4, 3] = BLACK, BLACK
+        # The position lives in two 64-bit masks; `board` is a NumPy view built on demand
+        self.black_bits = bitboard.START_BLACK
+        self.white_bits = bitboard.START_WHITE
+        self.disc_hash = bitboard.zobrist_hash(self.black_bits, self.white_bits)  # Updated incrementally
+        self.symmetric_hash = symmetry.symmetric_hash(self.black_bits, self.white_bits)  # Hashes of all 8 images
+        self._board_cache = None
+        self._moves_cache = None
         self.current_player = BLACK
         self.last_flipped_discs = []
         self.last_move = None  # Record the last move position
         self.last_player = None  # Record the last player who made the move
         self.last_ai_move = None
 
+    @property
+    def board(self):
+        """
+        8x8 NumPy array of EMPTY/BLACK/WHITE built from the bitboards. It is read-only, so a
+        stray in-place write raises instead of desyncing; assign a whole array to set the board.
+        """
+        if self._board_cache is None:
+            board = np.zeros(64, dtype=int)
+            board[_bit_indices(self.black_bits)] = BLACK
+            board[_bit_indices(self.white_bits)] = WHITE
+            board.setflags(write=False)
+            self._board_cache = board.reshape(8, 8)
+        return self._board_cache
+
+    @board.setter
+    def board(self, value):
+        self.black_bits, self.white_bits = bitboard.from_array(value, BLACK, WHITE)
+        self._refresh_hashes()
+        self._board_cache = None
+
+    def _refresh_hashes(self):
+        """ Recompute disc_hash and symmetric_hash from scratch after the bitboards were set directly """
+        self.disc_hash = bitboard.zobrist_hash(self.black_bits, self.white_bits)
+        self.symmetric_hash = symmetry.symmetric_hash(self.black_bits, self.white_bits)
+
+    def zobrist_key(self):
+        """ 64-bit Zobrist key of the position, including the side to move """
+        if self.current_player == WHITE:
+            return self.disc_hash ^ bitboard.ZOBRIST_SIDE
+        return self.disc_hash
+
+    def symmetric_key(self):
+        """
+        (key, transform) shared by the position and its 7 rotations and reflections,
+        including the side to move; see symmetry.symmetric_key
+        """
+        if self.current_player == WHITE:
+            return symmetry.symmetric_key(self.symmetric_hash ^ symmetry.SYMMETRIC_SIDE)
+        return symmetry.symmetric_key(self.symmetric_hash)
+
+    def _player_bits(self, player):
+        """ Return the bitboard for a player (0 for anything that is not BLACK or WHITE) """
+        if player == BLACK:
+            return self.black_bits
+        if player == WHITE:
+            return self.white_bits
+        return 0
+
+    def _legal_bits(self):
+        """ Bitmask of legal moves for the current player, cached per position """
+        key = (self.black_bits, self.white_bits, self.current_player)
+        if self._moves_cache is None or self._moves_cache[0] != key:
+            own = self._player_bits(self.current_player)
+            opp = self._player_bits(-self.current_player)
+            self._moves_cache = (key, bitboard.legal_moves(own, opp) if own else 0)
+        return self._moves_cache[1]
+
     def get_board(self):
         """ Return the board status, including the number of chess pieces """
         black_count, white_count = self.get_piece_count()
@@ -31,68 +103,67 @@ class Othello:
 
     def is_valid_move(self, row, col):
         """ Check whether the current location can be dropped """
-        if self.board[row, col] != EMPTY:
-            return False
+        return bool(self._legal_bits() >> (row * 8 + col) & 1)
 
-        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            if self._can_flip(row, col, dr, dc):
-                return True
-        return False
-
-    def _can_flip(self, row, col, dr, dc):
-        """ Check if the piece can be flipped in a given direction """
-        opponent = -self.current_player
-        r, c = row + dr, col + dc
-        has_opponent = False
-
-        while 0 <= r < 8 and 0 <= c < 8:
-            if self.board[r, c] == opponent:
-                has_opponent = True
-            elif self.board[r, c] == self.current_player and has_opponent:
-                return True
-            else:
-                return False
-            r, c = r + dr, c + dc
-        return False
-
-    def make_move(self, row, col, is_ai=False):
-        """ Perform a drop operation and flip the pieces """
+    def make_move(self, row, col):
+        """
+        Perform a drop operation and flip the pieces.
+        Returns a MoveRecord that can be passed to undo_move, or False if the move is illegal.
+        """
         if not self.is_valid_move(row, col):
             return False
 
-        self.board[row, col] = self.current_player
+        record = MoveRecord(self.black_bits, self.white_bits, self.disc_hash, self.symmetric_hash, self.current_player, self.last_flipped_discs, self.last_move, self.last_player,
+                            self.last_ai_move)
+        index = row * 8 + col
+        own = self._player_bits(self.current_player)
+        opp = self._player_bits(-self.current_player)
         self.last_flipped_discs = []
         self.last_move = (row, col)  # Record the last move position
         self.last_player = "black" if self.current_player == BLACK else "white"  # Record the player who made the move
         self.last_ai_move = (row, col) if self.current_player == WHITE else None
 
-        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            self._flip_disks(row, col, dr, dc)
+        flipped = 0
+        if self.current_player == BLACK:
+            disc_hash = self.disc_hash ^ bitboard.ZOBRIST_BLACK[index]
+            symmetric_hash = self.symmetric_hash ^ symmetry.SYMMETRIC_BLACK[index]
+        else:
+            disc_hash = self.disc_hash ^ bitboard.ZOBRIST_WHITE[index]
+            symmetric_hash = self.symmetric_hash ^ symmetry.SYMMETRIC_WHITE[index]
+        for line in bitboard.flip_lines(own, opp, index):
+            for bit in line:
+                flipped |= bit
+                square = bit.bit_length() - 1
+                disc_hash ^= bitboard.ZOBRIST_FLIP[square]
+                symmetric_hash ^= symmetry.SYMMETRIC_FLIP[square]
+                self.last_flipped_discs.append((square >> 3, square & 7))
+        self.disc_hash = disc_hash
+        self.symmetric_hash = symmetric_hash
+
+        own |= flipped | (1 << index)
+        opp &= ~flipped
+        if self.current_player == BLACK:
+            self.black_bits, self.white_bits = own, opp
+        else:
+            self.black_bits, self.white_bits = opp, own
+        self._board_cache = None
 
         self.current_player = -self.current_player
 
-        if is_ai:
-            time.sleep(1)  # After AI makes a move, wait for 1 second to flip
-
-        return True
-
-    def _flip_disks(self, row, col, dr, dc):
-        """ Perform the operation of flipping the pieces """
-        opponent = -self.current_player
-        r, c = row + dr, col + dc
-        to_flip = []
-
-        while 0 <= r < 8 and 0 <= c < 8:
-            if self.board[r, c] == opponent:
-                to_flip.append((r, c))
-            elif self.board[r, c] == self.current_player:
-                for flip_r, flip_c in to_flip:
-                    self.board[flip_r, flip_c] = self.current_player
-                    self.last_flipped_discs.append((flip_r, flip_c))
-                return
-            else:
-                return
-            r, c = r + dr, c + dc
+        return record
+
+    def undo_move(self, record):
+        """ Restore the position, side to move and last-move information saved by make_move """
+        self.black_bits = record.black_bits
+        self.white_bits = record.white_bits
+        self.disc_hash = record.disc_hash
+        self.symmetric_hash = record.symmetric_hash
+        self.current_player = record.current_player
+        self.last_flipped_discs = record.last_flipped_discs
+        self.last_move = record.last_move
+        self.last_player = record.last_player
+        self.last_ai_move = record.last_ai_move
+        self._board_cache = None
 
     def get_last_flipped_discs(self):
         """ Return the list of recently flipped pieces """
@@ -100,25 +171,25 @@ class Othello:
 
     def has_valid_moves(self):
         """ Check whether the current player has valid landing points """
-        return any(self.is_valid_move(row, col) for row in range(8) for col in range(8))
+        return self._legal_bits() != 0
 
     def get_valid_moves(self):
         """ Get all legal landing points for current players """
-        return [(r, c) for r in range(8) for c in range(8) if self.is_valid_move(r, c)]
+        return list(bitboard.iter_squares(self._legal_bits()))
 
     def ai_move(self):
         """ AI automatic chess """
         valid_moves = self.get_valid_moves()
         if valid_moves:
             self.last_ai_move = valid_moves[0]  # Select the first legal location (to improve AI strategy)
-            self.make_move(*self.last_ai_move, is_ai=True)
+            self.make_move(*self.last_ai_move)
             return self.last_ai_move, self.get_last_flipped_discs()
         return None, []
 
     def get_piece_count(self):
         """ Calculate the number of black and white pieces on the board """
-        black_count = np.sum(self.board == BLACK)
-        white_count = np.sum(self.board == WHITE)
+        black_count = bitboard.popcount(self.black_bits)
+        white_count = bitboard.popcount(self.white_bits)
         return black_count, white_count
 
     def check_winner(self):
@@ -131,7 +202,7 @@ class Othello:
             self.current_player = original_player  # Switch back
             
             # If the opponent also has no valid moves, or the board is full, the game ends
-            if not opponent_has_moves or np.sum(self.board != EMPTY) == 64:
+            if not opponent_has_moves or (self.black_bits | self.white_bits) == bitboard.FULL_MASK:
                 black_count, white_count = self.get_piece_count()
                 if black_count > white_count:
                     return "Black"
@@ -149,15 +220,41 @@ class Othello:
             "last_player": self.last_player
         }
 
+    def position(self):
+        """ Return the position as a picklable Position tuple """
+        return Position(self.black_bits, self.white_bits, self.current_player)
+
+    @classmethod
+    def from_position(cls, position):
+        """ Create a game object from a Position tuple """
+        game = cls()
+        game.black_bits = position.black_bits
+        game.white_bits = position.white_bits
+        game._refresh_hashes()
+        game.current_player = position.current_player
+        return game
+
     def copy(self):
         """ Create a deep copy of the game object """
         game_copy = Othello()
-        game_copy.board = np.copy(self.board)
-        game_copy.current_player = self.current_player
-        game_copy.last_flipped_discs = self.last_flipped_discs.copy() if self.last_flipped_discs else []
-        game_copy.last_move = self.last_move
-        game_copy.last_player = self.last_player
-        game_copy.last_ai_move = self.last_ai_move
+        game_copy._assign(self)
         return game_copy
 
+    def _assign(self, game):
+        """ Take over the position, side to move and last-move information of another game """
+        self.black_bits = game.black_bits
+        self.white_bits = game.white_bits
+        self.disc_hash = game.disc_hash
+        self.symmetric_hash = game.symmetric_hash
+        self.current_player = game.current_player
+        self.last_flipped_discs = game.last_flipped_discs.copy() if game.last_flipped_discs else []
+        self.last_move = game.last_move
+        self.last_player = game.last_player
+        self.last_ai_move = game.last_ai_move
+        self._board_cache = None
+
 
+def _bit_indices(bits):
+    """ Indices of the set bits of a 64-bit mask as a NumPy array """
+    as_bytes = np.array([bits], dtype="<u8").view(np.uint8)
+    return np.flatnonzero(np.unpackbits(as_bytes, bitorder="little"))
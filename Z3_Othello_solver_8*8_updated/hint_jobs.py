@@ -0,0 +1,154 @@
+"""
+Background hint jobs: a hint search runs in a thread pool while the client
+polls the job or follows it as a server-sent event stream, so no request waits
+for the search itself.
+
+A job holds its session's lock while it runs, searches with the session's
+solver, records the best move of every completed iteration as progress and
+can be cancelled, which stops the search at the next time check. Requests that
+change the session's position cancel its jobs first (cancel_session), so they
+only wait for the search to stop rather than for it to finish.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+class HintJob:
+    """ One hint search: its state, per-iteration progress and final result """
+
+    def __init__(self, session, options):
+        self.id = uuid.uuid4().hex
+        self.session = session
+        self.options = options  # Keyword arguments for the manager's run_hint
+        self.status = QUEUED
+        self.progress = []  # {"depth", "best_move", "score", "pv", "nodes", "elapsed_ms"} per completed iteration
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+        self.changed = threading.Condition()  # Notified whenever progress or status changes
+
+    def add_progress(self, iteration):
+        """ Record a completed search iteration (z3_solver.Iteration) """
+        with self.changed:
+            self.progress.append({
+                "depth": iteration.depth,
+                "best_move": iteration.best_move,
+                "score": iteration.score,
+                "pv": iteration.pv,
+                "nodes": iteration.nodes,
+                "elapsed_ms": round(iteration.elapsed * 1000)
+            })
+            self.changed.notify_all()
+
+    def set_status(self, status, result=None, error=None):
+        with self.changed:
+            self.status = status
+            self.result = result
+            self.error = error
+            if status in FINISHED:
+                self.finished = time.time()
+            self.changed.notify_all()
+
+    def wait(self, seen, timeout):
+        """ Wait until there is progress beyond the first `seen` entries or the job finishes """
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.progress) > seen or self.status in FINISHED, timeout)
+
+    def as_dict(self):
+        with self.changed:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "progress": list(self.progress),
+                "result": self.result,
+                "error": self.error
+            }
+
+
+class HintJobManager:
+    """
+    Runs hint jobs in a pool of `workers` threads and keeps finished jobs for
+    `keep_seconds` so their results can still be fetched
+    """
+
+    def __init__(self, run_hint, workers=2, keep_seconds=300):
+        self.run_hint = run_hint  # Callable(session, **options) -> response dict; runs under the session's lock
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hint")
+        self.keep_seconds = keep_seconds
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def submit(self, session, **options):
+        """ Queue a hint search for a session; returns the job """
+        job = HintJob(session, options)
+        with self.lock:
+            self._prune()
+            self.jobs[job.id] = job
+        self.pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id, session):
+        """ The job with this id if it belongs to the session, else None """
+        with self.lock:
+            job = self.jobs.get(job_id)
+        return job if job is not None and job.session is session else None
+
+    def cancel(self, job):
+        """ Ask a job to stop; a queued job never starts, a running one stops at its next time check """
+        job.cancel_event.set()
+        if job.status == QUEUED:
+            job.set_status(CANCELLED)
+
+    def cancel_session(self, session):
+        """ Cancel every unfinished job of a session, e.g. before a request changes its position """
+        with self.lock:
+            jobs = [job for job in self.jobs.values() if job.session is session and job.status not in FINISHED]
+        for job in jobs:
+            self.cancel(job)
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            return
+        session = job.session
+        with session.lock:
+            if job.cancel_event.is_set():
+                return  # Cancelled while waiting for the lock, e.g. by a request that changed the position
+            solver = session.solver
+            solver.stop_pondering()  # Pondering would replace the stop hook below when it ends
+            job.started = time.time()
+            job.set_status(RUNNING)
+            solver.should_stop = job.cancel_event.is_set
+            solver.on_iteration = job.add_progress
+            try:
+                result = self.run_hint(session, **job.options)
+            except Exception as e:
+                job.set_status(FAILED, error=str(e))
+                return
+            finally:
+                solver.should_stop = None
+                solver.on_iteration = None
+        job.set_status(CANCELLED if job.cancel_event.is_set() else DONE, result=result)
+
+    def _prune(self):
+        """ Forget jobs that finished more than keep_seconds ago """
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.finished is not None and now - job.finished > self.keep_seconds:
+                del self.jobs[job_id]
+
+    def stats(self):
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
@@ -0,0 +1,52 @@
+"""
+JSON serialization for the Flask responses.
+
+Responses are encoded with orjson when it is installed, falling back to the
+standard library's json module otherwise. Either way NumPy scalars and arrays
+are converted only where the encoder meets them, instead of rebuilding every
+response beforehand.
+
+    app.json = FastJSONProvider(app)
+"""
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson options: NumPy values natively, and non-string dict keys (e.g. ints) like json.dumps
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+
+def numpy_default(obj):
+    """ Convert a NumPy value json does not know into a native type (DefaultJSONProvider's types otherwise) """
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return DefaultJSONProvider.default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """ DefaultJSONProvider using orjson when available, with NumPy support and unsorted keys """
+
+    default = staticmethod(numpy_default)
+    sort_keys = False  # Key order is whatever the view built; sorting only costs time
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        # orjson only knows these formatting options; anything else goes to json.dumps
+        if orjson is not None and set(kwargs) <= {"indent", "separators"}:
+            option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if kwargs.get("indent") else 0)
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                pass  # E.g. integers wider than 64 bits, which json.dumps can write
+        return super().dumps(obj, **kwargs)
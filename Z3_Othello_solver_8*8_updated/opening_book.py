@@ -0,0 +1,217 @@
+"""
+Opening book: best replies for early positions, looked up instead of searched.
+
+Positions are stored from the side to move's point of view (own, opp), in the
+canonical form of the 8 board symmetries (see symmetry.py), so one entry covers
+every rotation and reflection of a position. The book is an open-addressing
+hash table of three NumPy arrays (own, opp, move) saved to an .npz file: 17
+bytes per slot, and a lookup costs one canonicalization and a probe or two.
+
+    python opening_book.py --build --plies 5 --time-limit 1.0    # Search every position up to 5 plies
+    python opening_book.py --import games.txt --plies 20          # Most played move in a list of games
+
+A game file holds one game per line as a move sequence such as "f5d6c3d3c4"
+(column letter, then row number).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+
+import bitboard
+import symmetry
+from bitboard import FULL_MASK
+from endgame import flips
+from game_logic import Othello, Position, BLACK
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.npz")
+MAX_LOAD = 0.5  # Table slots are at least twice the number of entries
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+_default_book = None
+
+
+def _slot(own, opp, size_bits):
+    """ Home slot of a canonical position in a table of 2**size_bits slots """
+    return (((own ^ (opp * _HASH_MULTIPLIER)) * _HASH_MULTIPLIER) & FULL_MASK) >> (64 - size_bits)
+
+
+def square_name(index):
+    """ Move notation of a square, e.g. 'f5' for row 4, column 5 """
+    return f"{chr(97 + (index & 7))}{(index >> 3) + 1}"
+
+
+def parse_moves(line):
+    """ Bit indices of the moves in a sequence such as 'f5d6c3' (case-insensitive) """
+    line = "".join(line.split()).lower()
+    return [(int(line[i + 1]) - 1) * 8 + ord(line[i]) - 97 for i in range(0, len(line) - 1, 2)]
+
+
+class OpeningBook:
+    """ Canonical position -> best move table; see the module docstring for the layout """
+
+    def __init__(self, own, opp, moves):
+        self.own = own
+        self.opp = opp
+        self.moves = moves
+        self.size_bits = len(own).bit_length() - 1
+        self.mask = len(own) - 1
+
+    @classmethod
+    def from_entries(cls, entries):
+        """ Build a book from a {(own, opp): move index} dict of canonical positions """
+        size_bits = 4
+        while (1 << size_bits) * MAX_LOAD < len(entries):
+            size_bits += 1
+        own = np.zeros(1 << size_bits, dtype=np.uint64)
+        opp = np.zeros(1 << size_bits, dtype=np.uint64)
+        moves = np.zeros(1 << size_bits, dtype=np.uint8)
+        mask = (1 << size_bits) - 1
+        for (position_own, position_opp), move in entries.items():
+            slot = _slot(position_own, position_opp, size_bits)
+            while own[slot] or opp[slot]:  # An empty board marks a free slot
+                slot = (slot + 1) & mask
+            own[slot], opp[slot], moves[slot] = position_own, position_opp, move
+        return cls(own, opp, moves)
+
+    @classmethod
+    def load(cls, path=BOOK_PATH):
+        with np.load(path) as data:
+            return cls(data["own"], data["opp"], data["moves"])
+
+    def save(self, path=BOOK_PATH):
+        np.savez(path, own=self.own, opp=self.opp, moves=self.moves)
+
+    def entries(self):
+        """ The {(own, opp): move index} dict the book was built from """
+        used = np.nonzero(self.own | self.opp)[0]
+        return {(int(self.own[slot]), int(self.opp[slot])): int(self.moves[slot]) for slot in used}
+
+    def lookup(self, own, opp):
+        """ Book move (bit index) for the side to move with discs `own`, or None """
+        canonical_own, canonical_opp, t = symmetry.canonical(own, opp)
+        slot = _slot(canonical_own, canonical_opp, self.size_bits)
+        while True:
+            slot_own, slot_opp = int(self.own[slot]), int(self.opp[slot])
+            if slot_own == canonical_own and slot_opp == canonical_opp:
+                return symmetry.transform_square(int(self.moves[slot]), symmetry.INVERSE[t])
+            if not slot_own and not slot_opp:
+                return None
+            slot = (slot + 1) & self.mask
+
+    def probe(self, game):
+        """ Book move (row, col) for the player to move in a game, or None """
+        own, opp = (game.black_bits, game.white_bits) if game.current_player == BLACK \
+            else (game.white_bits, game.black_bits)
+        index = self.lookup(own, opp)
+        return None if index is None else (index >> 3, index & 7)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.own | self.opp))
+
+
+def default_book():
+    """ The book shipped next to this module, loaded once per process (None if there is no book file) """
+    global _default_book
+    if _default_book is None and os.path.exists(BOOK_PATH):
+        _default_book = OpeningBook.load(BOOK_PATH)
+    return _default_book
+
+
+def _children(own, opp):
+    """ Positions (own, opp) for the side to move after each legal move, passing if there is none """
+    moves = bitboard.legal_moves(own, opp)
+    if not moves:
+        return [(opp, own)] if bitboard.legal_moves(opp, own) else []
+    children = []
+    while moves:
+        bit = moves & -moves
+        moves ^= bit
+        flipped = flips(own, opp, bit.bit_length() - 1)
+        children.append((opp & ~flipped, own | flipped | bit))
+    return children
+
+
+def build_from_engine(plies, time_limit, entries=None):
+    """
+    Search every distinct position reachable in up to `plies` moves with the solver
+    and record its move. Extends `entries` (canonical position -> move) if given.
+    """
+    from z3_solver import OthelloZ3Solver
+
+    entries = {} if entries is None else entries
+    level = {symmetry.canonical(bitboard.START_BLACK, bitboard.START_WHITE)[:2]}
+    for ply in range(plies + 1):
+        start = time.time()
+        for own, opp in sorted(level):
+            if (own, opp) in entries or not bitboard.legal_moves(own, opp):
+                continue
+            game = Othello.from_position(Position(own, opp, BLACK))  # Own discs play Black
+            solver = OthelloZ3Solver(game, time_limit=time_limit)
+            solver.opening_book = None  # Search, rather than look up, the position
+            with contextlib.redirect_stdout(io.StringIO()):
+                row, col = solver.find_best_move()
+            entries[(own, opp)] = row * 8 + col
+        print(f"Ply {ply}: {len(level)} positions in {time.time() - start:.1f}s")
+        if ply < plies:
+            level = {symmetry.canonical(*child)[:2] for own, opp in level for child in _children(own, opp)}
+    return entries
+
+
+def import_games(lines, plies, entries=None):
+    """
+    Record, for each position in the first `plies` moves of a list of games, the move
+    played there most often. Extends `entries` (canonical position -> move) if given.
+    """
+    counts = {}
+    for line in lines:
+        own, opp = bitboard.START_BLACK, bitboard.START_WHITE
+        for index in parse_moves(line)[:plies]:
+            if not bitboard.legal_moves(own, opp):
+                own, opp = opp, own  # The side to move had to pass
+            if not bitboard.legal_moves(own, opp) >> index & 1:
+                print(f"Illegal move {square_name(index)} in: {line.strip()}")
+                break
+            canonical_own, canonical_opp, t = symmetry.canonical(own, opp)
+            played = counts.setdefault((canonical_own, canonical_opp), {})
+            move = symmetry.transform_square(index, t)
+            played[move] = played.get(move, 0) + 1
+            flipped = flips(own, opp, index)
+            own, opp = opp & ~flipped, own | flipped | (1 << index)
+
+    entries = {} if entries is None else entries
+    for position, played in counts.items():
+        entries[position] = max(played, key=played.get)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the solver's opening book")
+    parser.add_argument("--build", action="store_true", help="Search every position up to --plies with the solver")
+    parser.add_argument("--import", dest="games", help="Add the most played moves from a file of games")
+    parser.add_argument("--plies", type=int, default=5, help="Depth of the book in moves")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="Search time per position for --build")
+    parser.add_argument("--book", default=BOOK_PATH, help="Book file (default: opening_book.npz)")
+    parser.add_argument("--extend", action="store_true", help="Add to the existing book instead of replacing it")
+    args = parser.parse_args()
+
+    entries = OpeningBook.load(args.book).entries() if args.extend and os.path.exists(args.book) else {}
+    if args.games:
+        with open(args.games) as f:
+            import_games(f, args.plies, entries)
+    if args.build:
+        build_from_engine(args.plies, args.time_limit, entries)
+    if not args.games and not args.build:
+        parser.error("nothing to do: give --build and/or --import")
+
+    book = OpeningBook.from_entries(entries)
+    book.save(args.book)
+    print(f"Wrote {len(book)} positions to {args.book}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Process pools for parallel search: root splitting and Lazy SMP helpers.
+
+Pools are long-lived: one pool per worker count is created on first use and
+reused by every later request. Each worker process keeps its own solver, so
+its transposition table and history carry over from one request to the next.
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+_pools = {}
+
+# Per-process state inside a worker
+_worker_solver = None
+_worker_table = None  # The worker solver's own transposition table
+_worker_search_id = None
+_attached_table = None  # Shared Lazy SMP table this worker is attached to
+_attached_stop_flag = None  # Stop flag of the root-split search this worker last served
+
+
+def get_pool(workers):
+    """ Return the shared process pool with the given number of workers """
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        _pools[workers] = pool
+    return pool
+
+
+def shutdown_pools():
+    """ Stop every worker process """
+    for pool in _pools.values():
+        pool.shutdown(wait=False)
+    _pools.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+class StopFlag:
+    """
+    One byte of shared memory through which a search asks its root-split workers to
+    stop (e.g. when a hint is cancelled); workers check it along with their deadline
+    """
+
+    def __init__(self, name=None):
+        self.owner = name is None
+        # As for the shared table, attaching from a pool worker does not take ownership
+        self.memory = shared_memory.SharedMemory(create=True, size=1) if self.owner \
+            else shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        if self.owner:
+            self.memory.buf[0] = 0
+
+    def set(self, stop=True):
+        self.memory.buf[0] = 1 if stop else 0
+
+    def is_set(self):
+        return self.memory.buf[0] != 0
+
+    def close(self):
+        """ Detach from the shared memory, and free it if this process created it """
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def _get_worker_solver(game, settings, search_id):
+    """ Return this worker's long-lived solver, pointed at a search copy of `game` and configured with `settings` """
+    global _worker_solver, _worker_table, _worker_search_id
+    from z3_solver import OthelloZ3Solver
+
+    if _worker_solver is None:
+        _worker_solver = OthelloZ3Solver(game)
+        _worker_table = _worker_solver.transposition_table
+    solver = _worker_solver
+    solver.game = solver._search_copy(game)
+    solver.transposition_table = _worker_table
+    solver.should_stop = None
+    for name, value in settings.items():
+        setattr(solver, name, value)
+
+    # A new request: let this search's entries replace the previous one's
+    if search_id != _worker_search_id:
+        _worker_search_id = search_id
+        _worker_table.new_search()
+        solver._reset_move_ordering()
+    return solver
+
+
+def _attach_table(name, size_bits):
+    """ Attach to a shared transposition table, detaching from the previous one """
+    global _attached_table
+    from transposition import SharedTranspositionTable
+
+    if _attached_table is None or _attached_table.name != name:
+        if _attached_table is not None:
+            _attached_table.close()
+        _attached_table = SharedTranspositionTable(size_bits, name=name)
+    return _attached_table
+
+
+def _attach_stop_flag(name):
+    """ Attach to a search's stop flag, detaching from the previous one """
+    global _attached_stop_flag
+    if _attached_stop_flag is None or _attached_stop_flag.name != name:
+        if _attached_stop_flag is not None:
+            _attached_stop_flag.close()
+        _attached_stop_flag = StopFlag(name)
+    return _attached_stop_flag
+
+
+def search_root_move(position, move, depth, alpha, beta, deadline, search_id, settings, stop_flag_name):
+    """
+    Worker entry point: score one root move of `position` to `depth` within the
+    window (alpha, beta), from the point of view of the side to move at the root.
+    Returns (score, search counters); the score is None if the deadline passed
+    or the stop flag was set before the search finished.
+    """
+    from game_logic import Othello
+    from z3_solver import SearchTimeout
+
+    solver = _get_worker_solver(Othello.from_position(position), settings, search_id)
+    game = solver.game
+    solver.deadline = deadline
+    solver.should_stop = _attach_stop_flag(stop_flag_name).is_set
+    solver.stats.reset()
+    record = game.make_move(move[0], move[1])
+    try:
+        score = -solver._negamax(game, depth - 1, -beta, -alpha, False, 1)
+    except SearchTimeout:
+        score = None
+    finally:
+        game.undo_move(record)
+        solver.should_stop = None
+    return score, solver.stats.counters()
+
+
+def lazy_smp_helper(position, moves, depth_limit, deadline, table_name, size_bits, helper_index,
+                    search_id, settings):
+    """
+    Worker entry point for Lazy SMP: run iterative deepening on the root position
+    using the shared transposition table until the deadline or a stop request.
+    Helpers are staggered (odd helpers start one ply deeper, and each starts from
+    a different root move) so they fill the table with different parts of the tree.
+    Returns (deepest completed depth, best move and its score at that depth, search counters).
+    """
+    from game_logic import Othello
+    from z3_solver import SearchTimeout
+
+    solver = _get_worker_solver(Othello.from_position(position), settings, search_id)
+    game = solver.game
+    table = _attach_table(table_name, size_bits)
+    solver.transposition_table = table
+    solver.should_stop = table.stop_requested
+    solver.deadline = deadline
+    solver.stats.reset()
+
+    offset = helper_index % len(moves)
+    ordered_moves = list(moves[offset:]) + list(moves[:offset])
+    completed_depth, best_move, best_score = 0, None, None
+    try:
+        for depth in range(1 + helper_index % 2, depth_limit + 1):
+            try:
+                move, score = solver._search_root(game, ordered_moves, depth, float('-inf'), float('inf'))
+            except SearchTimeout:
+                break
+            completed_depth, best_move, best_score = depth, move, score
+            ordered_moves.remove(move)
+            ordered_moves.insert(0, move)
+    finally:
+        solver.transposition_table = _worker_table
+        solver.should_stop = None
+    return completed_depth, best_move, best_score, solver.stats.counters()
@@ -0,0 +1,172 @@
+"""
+Perft: count the leaf nodes of the game tree to a fixed depth, to check move
+generation against known counts and to benchmark board implementations.
+
+A pass is a ply of its own, and a finished game (neither side can move) is a
+leaf wherever it happens.
+
+    python perft.py                    # Check depths 1-7 with every implementation
+    python perft.py --depth 9 --impl bitboard
+    python perft.py --bench --depth 6  # Nodes per second of each implementation
+"""
+
+import argparse
+import importlib.util
+import os
+import time
+
+import bitboard
+from endgame import flips
+from game_logic import Othello
+
+# Leaf counts from the standard 8x8 start position
+PERFT_COUNTS = {1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8200, 7: 55092, 8: 390216, 9: 3005288}
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# Array-based implementations from the other variants of the game in this repository
+ARRAY_VARIANTS = {
+    "numpy": os.path.join(_HERE, "..", "Z3_Othello_solver_8*8", "game_logic.py"),
+    "4x4": os.path.join(_HERE, "..", "Z3_Othello_solver_4*4", "game_logic.py"),
+}
+
+
+def perft_bitboard(own, opp, depth, passed=False):
+    """ Perft on raw bitboards with the endgame solver's flip tables: `own` is the side to move """
+    if depth == 0:
+        return 1
+    moves = bitboard.legal_moves(own, opp)
+    if not moves:
+        if passed:
+            return 1  # Neither side can move: the game is over
+        return perft_bitboard(opp, own, depth - 1, True)
+
+    nodes = 0
+    while moves:
+        bit = moves & -moves
+        moves ^= bit
+        flipped = flips(own, opp, bit.bit_length() - 1)
+        nodes += perft_bitboard(opp & ~flipped, own | flipped | bit, depth - 1)
+    return nodes
+
+
+def perft_game(game, depth, passed=False):
+    """ Perft on a game_logic.Othello object, using make_move/undo_move """
+    if depth == 0:
+        return 1
+    moves = game.get_valid_moves()
+    if not moves:
+        if passed:
+            return 1
+        game.current_player = -game.current_player
+        try:
+            return perft_game(game, depth - 1, True)
+        finally:
+            game.current_player = -game.current_player
+
+    nodes = 0
+    for row, col in moves:
+        record = game.make_move(row, col)
+        nodes += perft_game(game, depth - 1)
+        game.undo_move(record)
+    return nodes
+
+
+def perft_array(game, depth, passed=False):
+    """
+    Perft on an array-based Othello object without undo: the board is copied and
+    restored around each move. The side to move is set here after every move, so
+    variants whose make_move passes automatically are counted the same way.
+    """
+    if depth == 0:
+        return 1
+    moves = game.get_valid_moves()
+    player = game.current_player
+    if not moves:
+        if passed:
+            return 1
+        game.current_player = -player
+        try:
+            return perft_array(game, depth - 1, True)
+        finally:
+            game.current_player = player
+
+    nodes = 0
+    for row, col in moves:
+        board = game.board.copy()
+        game.make_move(row, col)
+        game.current_player = -player
+        nodes += perft_array(game, depth - 1)
+        game.board = board
+        game.current_player = player
+    return nodes
+
+
+def load_variant(name):
+    """ Import the Othello class of another variant's game_logic.py, or None if it is missing """
+    path = ARRAY_VARIANTS[name]
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(f"game_logic_{name.replace('x', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Othello
+
+
+def implementations():
+    """ (name, perft function of depth) for every implementation available """
+    impls = [
+        ("bitboard", lambda depth: perft_bitboard(bitboard.START_BLACK, bitboard.START_WHITE, depth)),
+        ("othello", lambda depth: perft_game(Othello(), depth)),
+    ]
+    for name in ARRAY_VARIANTS:
+        variant = load_variant(name)
+        if variant is not None:
+            impls.append((name, lambda depth, variant=variant: perft_array(variant(), depth)))
+    return impls
+
+
+def check(impls, max_depth):
+    """ Compare every 8x8 implementation with the known counts; returns True if all match """
+    ok = True
+    for name, run in impls:
+        if name == "4x4":
+            continue  # Different board, no reference counts
+        for depth in range(1, max_depth + 1):
+            nodes = run(depth)
+            expected = PERFT_COUNTS.get(depth)
+            status = "ok" if nodes == expected else f"MISMATCH (expected {expected})"
+            if expected is None:
+                status = "no reference count"
+            elif nodes != expected:
+                ok = False
+            print(f"{name:>9} perft({depth}) = {nodes:>9} {status}")
+    return ok
+
+
+def bench(impls, depth):
+    """ Print the nodes per second of each implementation at one depth """
+    for name, run in impls:
+        start = time.perf_counter()
+        nodes = run(depth)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>9} perft({depth}) = {nodes:>9} in {elapsed:7.3f}s  {nodes / elapsed:>12,.0f} nodes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Othello move generator perft check and benchmark")
+    parser.add_argument("--depth", type=int, default=None, help="Depth (default: 7 for checks, 5 for --bench)")
+    parser.add_argument("--impl", action="append", help="Only run this implementation (may be repeated)")
+    parser.add_argument("--bench", action="store_true", help="Report nodes per second instead of checking counts")
+    args = parser.parse_args()
+
+    impls = implementations()
+    if args.impl:
+        impls = [(name, run) for name, run in impls if name in args.impl]
+    if args.bench:
+        bench(impls, args.depth or 5)
+    elif not check(impls, args.depth or 7):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
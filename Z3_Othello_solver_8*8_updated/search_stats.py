@@ -0,0 +1,100 @@
+"""
+Counters collected by the solver during one search request, for tuning and profiling.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+
+CUTOFF_INDEX_BUCKETS = 8  # Beta cutoffs by the index of the move that caused them; the last bucket is "8 or later"
+PROFILE_LINES = 25  # Functions listed in a profile report
+
+# Plain counters, which worker processes send back to be added to the main search's stats
+COUNTER_NAMES = ["nodes", "leaf_evaluations", "tt_probes", "tt_hits", "tt_cutoffs", "beta_cutoffs", "endgame_nodes"]
+
+
+class SearchStats:
+    """
+    Node, evaluation and transposition table counters for one search, plus a
+    histogram of where beta cutoffs happen in the move list and the node count
+    and time of each iterative deepening iteration
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """ Start counting a new search """
+        for name in COUNTER_NAMES:
+            setattr(self, name, 0)
+        self.cutoff_index = [0] * CUTOFF_INDEX_BUCKETS
+        self.iterations = []
+        self.start_time = time.time()
+        self._iteration_start = (self.start_time, 0)
+
+    def record_cutoff(self, index):
+        """ Count a beta cutoff caused by the move at position `index` in the ordered move list """
+        self.beta_cutoffs += 1
+        self.cutoff_index[min(index, CUTOFF_INDEX_BUCKETS - 1)] += 1
+
+    def start_iteration(self):
+        self._iteration_start = (time.time(), self.nodes)
+
+    def end_iteration(self, depth, completed=True):
+        """ Record the node count and time of the iteration started by start_iteration """
+        started, nodes = self._iteration_start
+        self.iterations.append({
+            "depth": depth,
+            "nodes": self.nodes - nodes,
+            "time_ms": round((time.time() - started) * 1000, 1),
+            "completed": completed
+        })
+
+    def counters(self):
+        """ Plain counters and cutoff histogram, e.g. to send back from a worker process """
+        counters = {name: getattr(self, name) for name in COUNTER_NAMES}
+        counters["cutoff_index"] = list(self.cutoff_index)
+        return counters
+
+    def add(self, counters):
+        """ Add the counters of another search (e.g. a worker's) to these """
+        for name in COUNTER_NAMES:
+            setattr(self, name, getattr(self, name) + counters[name])
+        for index, count in enumerate(counters["cutoff_index"]):
+            self.cutoff_index[index] += count
+
+    def branching_factor(self):
+        """
+        Effective branching factor: node count of the last completed iteration divided
+        by that of the one before (None until two iterations have completed)
+        """
+        completed = [iteration for iteration in self.iterations if iteration["completed"]]
+        if len(completed) < 2 or not completed[-2]["nodes"]:
+            return None
+        return round(completed[-1]["nodes"] / completed[-2]["nodes"], 2)
+
+    def as_dict(self, depth_reached):
+        """ Summary of the search for the analysis result """
+        summary = self.counters()
+        summary["depth_reached"] = depth_reached
+        summary["branching_factor"] = self.branching_factor()
+        summary["tt_hit_rate"] = round(self.tt_hits / self.tt_probes, 3) if self.tt_probes else None
+        summary["first_move_cutoff_rate"] = round(self.cutoff_index[0] / self.beta_cutoffs, 3) \
+            if self.beta_cutoffs else None
+        summary["iterations"] = list(self.iterations)
+        summary["elapsed_ms"] = round((time.time() - self.start_time) * 1000, 1)
+        return summary
+
+
+def profile_call(function, *args, **kwargs):
+    """ Call a function under cProfile; returns (result, report of the most expensive functions) """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        profiler.disable()
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return result, report.getvalue()
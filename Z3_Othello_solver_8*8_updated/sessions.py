@@ -0,0 +1,149 @@
+"""
+Per-player game sessions for the Flask server.
+
+Each session owns its own game, verifier and solver, guarded by a lock so the
+requests of one player are handled one at a time while different players run
+in parallel. Idle sessions are dropped after a time-to-live, and the least
+recently used ones are dropped first when there are too many sessions or their
+solvers' transposition tables use too much memory. All sessions share a limited
+number of pondering slots, so background searches cannot crowd out requests.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from game_logic import Othello
+from verification import OthelloVerifier
+
+
+class GameSession:
+    """ One player's game, verifier, solver and AI difficulty """
+
+    def __init__(self, session_id, make_solver, ponder_slots=None):
+        self.id = session_id
+        self.lock = threading.RLock()  # Held while a request uses the session
+        self.make_solver = make_solver
+        self.ponder_slots = ponder_slots  # Semaphore shared by the sessions' solvers, or None for no limit
+        self.difficulty = "easy"
+        self.last_used = time.time()
+        self.game = None
+        self.verifier = None
+        self.solver = None
+        self.reset()
+
+    def reset(self):
+        """ Start a new game """
+        self.close()
+        self.game = Othello()
+        self.verifier = OthelloVerifier(self.game)
+        self.solver = self.make_solver(self.game)
+        self.solver.ponder_slots = self.ponder_slots
+
+    def close(self):
+        """ Stop any background search of the session's solver """
+        if self.solver is not None:
+            self.solver.stop_pondering()
+
+    def memory_bytes(self):
+        """ Approximate memory of the session, dominated by the solver's transposition table """
+        return self.solver.transposition_table.memory_bytes()
+
+
+class SessionManager:
+    """
+    Session id -> GameSession, in least recently used order. Sessions are created
+    on first use and evicted when idle for `ttl` seconds, or (least recently used
+    first) while there are more than `max_sessions` or they use more than
+    `max_memory_mb` megabytes. A session that is handling a request is never evicted.
+    At most `max_pondering` sessions search in the background at the same time.
+    """
+
+    def __init__(self, make_solver, max_sessions=100, ttl=1800, max_memory_mb=1024, max_pondering=2):
+        self.make_solver = make_solver
+        self.max_pondering = max_pondering
+        self.ponder_slots = threading.BoundedSemaphore(max_pondering)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()  # Guards the session map, not the sessions themselves
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, session_id):
+        """ The session for an id, or a new session (with a new id) if the id is unknown or None """
+        with self.lock:
+            session = self.sessions.get(session_id) if session_id else None
+            if session is None:
+                session = GameSession(uuid.uuid4().hex, self.make_solver, self.ponder_slots)
+                self.sessions[session.id] = session
+                self.created += 1
+            else:
+                self.sessions.move_to_end(session.id)
+            session.last_used = time.time()
+            evicted = self._evict(keep=session)
+        for old in evicted:
+            old.close()
+        return session
+
+    def remove(self, session_id):
+        """ Drop a session, e.g. when its player leaves """
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+
+    def _evict(self, keep):
+        """ Remove expired and excess sessions (oldest first); returns them so they can be closed """
+        evicted = []
+        now = time.time()
+        memory = sum(session.memory_bytes() for session in self.sessions.values())
+        for session in list(self.sessions.values()):
+            expired = now - session.last_used > self.ttl
+            over_limit = len(self.sessions) > self.max_sessions or memory > self.max_memory_bytes
+            if not expired and not over_limit:
+                break  # Sessions are in last-used order, so every later one is newer still
+            if session is keep or not session.lock.acquire(blocking=False):
+                continue  # In use
+            try:
+                del self.sessions[session.id]
+                memory -= session.memory_bytes()
+                evicted.append(session)
+            finally:
+                session.lock.release()
+        self.evicted += len(evicted)
+        return evicted
+
+    def stats(self):
+        """ Session counts and limits """
+        with self.lock:
+            now = time.time()
+            return {
+                "active_sessions": len(self.sessions),
+                "busy_sessions": sum(1 for session in self.sessions.values() if _is_locked(session.lock)),
+                "pondering_sessions": sum(1 for session in self.sessions.values() if _is_pondering(session.solver)),
+                "idle_over_60s": sum(1 for session in self.sessions.values() if now - session.last_used > 60),
+                "memory_mb": round(sum(session.memory_bytes() for session in self.sessions.values()) / 2 ** 20, 1),
+                "created": self.created,
+                "evicted": self.evicted,
+                "max_sessions": self.max_sessions,
+                "max_memory_mb": self.max_memory_bytes // 2 ** 20,
+                "max_pondering": self.max_pondering,
+                "ttl_seconds": self.ttl
+            }
+
+
+def _is_locked(lock):
+    """ True if another thread holds an RLock """
+    if lock.acquire(blocking=False):
+        lock.release()
+        return False
+    return True
+
+
+def _is_pondering(solver):
+    """ True if a solver's background search is running """
+    thread = solver.ponder_thread  # Read once: another thread may clear it
+    return thread is not None and thread.is_alive()
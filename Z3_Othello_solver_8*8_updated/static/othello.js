@@ -6,16 +6,77 @@ let searchDepth = 6; // Fixed search depth for Z3 analysis - 6 steps
 // Add global variables to record Z3 analysis start time
 let z3AnalysisStartTime = null;
 
+// Background hint search the client is following (null when none is running)
+let currentHintJob = null;
+
+// Start a hint search on the server and follow it until it finishes.
+// onProgress is called with {depth, best_move, score, pv, nodes, elapsed_ms} after each completed depth;
+// resolves with the same data GET /z3_hint returns.
+async function requestZ3Hint(onProgress) {
+    if (typeof EventSource === "undefined") {
+        // No server-sent events: wait for the whole search instead
+        const response = await fetch(`/z3_hint?_t=${Date.now()}`);
+        return await response.json();
+    }
+    
+    const response = await fetch("/z3_hint", { method: "POST" });
+    const job = await response.json();
+    currentHintJob = job.job_id;
+    
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(`/z3_hint/${job.job_id}/events`);
+        const finish = (event) => {
+            events.close();
+            if (currentHintJob === job.job_id) {
+                currentHintJob = null;
+            }
+            const state = JSON.parse(event.data);
+            if (state.result) {
+                resolve(state.result);
+            } else {
+                reject(new Error(state.error || `Hint search ${state.status}`));
+            }
+        };
+        events.addEventListener("progress", (event) => onProgress && onProgress(JSON.parse(event.data)));
+        events.addEventListener("done", finish);
+        events.addEventListener("cancelled", finish);
+        events.addEventListener("failed", finish);
+        events.onerror = () => {
+            events.close();
+            reject(new Error("Lost the connection to the hint search"));
+        };
+    });
+}
+
+// Stop the hint search the client is following, if any; the server keeps its best move so far
+function cancelZ3Hint() {
+    if (currentHintJob) {
+        fetch(`/z3_hint/${currentHintJob}`, { method: "DELETE" });
+        currentHintJob = null;
+    }
+}
+
+// Text for a search progress update, e.g. "Depth 6: best move (2, 3), line (2, 3) (4, 5) ..."
+function describeHintProgress(step) {
+    const line = step.pv.map(([row, col]) => `(${row}, ${col})`).join(" ");
+    const depth = step.depth > 0 ? `Depth ${step.depth}` : "Found";
+    return `${depth}: best move (${step.best_move[0]}, ${step.best_move[1]}), line ${line} ` +
+        `- ${step.nodes} positions in ${step.elapsed_ms}ms`;
+}
+
 // Add this function to get Z3 hint
 async function getZ3Hint() {
     try {
         // Record the start time of analysis
         z3AnalysisStartTime = Date.now();
         
-        const timestamp = new Date().getTime(); // Add timestamp to prevent caching
-        console.log(`Requesting Z3 hint with fixed depth ${searchDepth}...`);
-        let response = await fetch(`/z3_hint?_t=${timestamp}`);
-        let data = await response.json();
+        console.log("Requesting Z3 hint...");
+        let data = await requestZ3Hint((step) => {
+            // Show the best move of each completed depth while the search continues
+            document.getElementById('z3-hint-content').innerHTML =
+                `<p>Analyzing best move with multi-step lookahead...</p><p>${describeHintProgress(step)}</p>`;
+            highlightRecommendedMove(step.best_move[0], step.best_move[1]);
+        });
         
         // Processing analysis is over
         const analysisEndTime = Date.now();
@@ -60,9 +121,10 @@ function toggleZ3Hint() {
         // Get Z3 hint
         getZ3Hint();
     } else {
-        // Hide the panel and overlay
+        // Hide the panel and overlay, stopping a search that is still running
         panel.style.display = 'none';
         overlay.style.display = 'none';
+        cancelZ3Hint();
         
         // Reset the analysis start time
         z3AnalysisStartTime = null;
@@ -731,7 +793,7 @@ async function aiMove() {
         // Key: Pass in the actual white chess position, but set showFlippedDiscs to false, so only the new placement is displayed without the flipping effect
         updateBoard(result.lastMove, result.flippedDiscs, null, result.player, false, false, false, false);
         
-        // Wait 1 second, then display the flipped chessboard and verification results
+        // Wait for the animation delay sent by the server, then display the flipped chessboard and verification results
         setTimeout(() => {
             // Now display all flipped chess pieces and verification results, but still do not display the valid position
             updateBoard(result.lastMove, result.flippedDiscs, result.verification, result.player, true, false, true, false);
@@ -765,7 +827,7 @@ async function aiMove() {
                     </ul>
                 `;
             }, 1200); // Display the valid position after 1.2 seconds
-        }, 1000); // Flip effect is displayed after 1 second (black and white)
+        }, result.animation_delay_ms ?? 1000); // Flip effect is displayed after the server's animation delay
     } else {
         // The original error handling logic
         console.log("AI move failed: ", result);
@@ -1235,9 +1297,10 @@ function toggleZ3Hint() {
         // Get Z3 hint
         getZ3Hint();
     } else {
-        // Hide the panel and overlay
+        // Hide the panel and overlay, stopping a search that is still running
         panel.style.display = 'none';
         overlay.style.display = 'none';
+        cancelZ3Hint();
         
         // Reset the analysis start time
         z3AnalysisStartTime = null;
@@ -1669,10 +1732,12 @@ async function z3HelpsHumanMove() {
         // Show a message in the UI
         document.getElementById("turn-indicator").innerHTML = "Z3 is calculating the optimal move...";
         
-        // Get Z3 hint with current search depth
-        const timestamp = new Date().getTime();
-        let response = await fetch(`/z3_hint?_t=${timestamp}`);
-        let data = await response.json();
+        // Get Z3 hint, showing the search's current best move as each depth completes
+        let data = await requestZ3Hint((step) => {
+            highlightRecommendedMove(step.best_move[0], step.best_move[1]);
+            document.getElementById("turn-indicator").innerHTML =
+                `Z3 is calculating the optimal move... ${describeHintProgress(step)}`;
+        });
         
         if (data.has_move) {
             let row = data.best_move[0];
@@ -1680,16 +1745,7 @@ async function z3HelpsHumanMove() {
             
             console.log(`Z3 suggests move at (${row}, ${col})`);
             
-            // Highlight the recommended move position
-            highlightRecommendedMove(row, col);
-            
-            // Update the UI
-            document.getElementById("turn-indicator").innerHTML = "Z3 optimal move found, will play in 2 seconds...";
-            
-            // Wait for 2 seconds, so the user can see the recommended position
-            await new Promise(resolve => setTimeout(resolve, 2000));
-            
-            // Clear the highlight effect of the recommended position
+            // The search has already shown the move as it progressed, so play it straight away
             clearZ3Recommendation();
             
             // Set the flag, indicating this is a Z3 assisted move
@@ -0,0 +1,135 @@
+"""
+The 8 symmetries of the board (rotations and reflections) on bitboards.
+
+Transform t (0-7) transposes the board if bit 2 is set, then flips it upside
+down if bit 1 is set, then mirrors it left to right if bit 0 is set. The
+canonical form of a position is its smallest image under the 8 transforms,
+so all symmetric positions share one canonical form.
+
+Caches keyed by Zobrist hashes use a symmetric key instead: the Zobrist hashes
+of all 8 images are kept in one packed integer (64 bits per transform) that is
+updated with a single XOR per changed square, and the smallest of them is a key
+shared by every image of the position. Moves stored under that key are stored
+in the orientation of the image that gave it, and mapped back on lookup.
+"""
+
+import bitboard
+from bitboard import FULL_MASK
+
+IDENTITY = 0
+TRANSFORMS = range(8)
+
+
+def flip_vertical(bits):
+    """ Row r becomes row 7 - r """
+    return int.from_bytes(bits.to_bytes(8, "little"), "big")
+
+
+def mirror_horizontal(bits):
+    """ Column c becomes column 7 - c """
+    bits = ((bits >> 1) & 0x5555555555555555) | ((bits & 0x5555555555555555) << 1)
+    bits = ((bits >> 2) & 0x3333333333333333) | ((bits & 0x3333333333333333) << 2)
+    return ((bits >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bits & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def transpose(bits):
+    """ Square (r, c) becomes (c, r) """
+    t = 0x0F0F0F0F00000000 & (bits ^ (bits << 28))
+    bits ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (bits ^ (bits << 14))
+    bits ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (bits ^ (bits << 7))
+    bits ^= t ^ (t >> 7)
+    return bits & FULL_MASK
+
+
+def transform(bits, t):
+    """ Image of a bitboard under transform t """
+    if t & 4:
+        bits = transpose(bits)
+    if t & 2:
+        bits = flip_vertical(bits)
+    if t & 1:
+        bits = mirror_horizontal(bits)
+    return bits
+
+
+def images(bits):
+    """ Images of a bitboard under all 8 transforms, indexed by transform """
+    flipped = flip_vertical(bits)
+    transposed = transpose(bits)
+    transposed_flipped = flip_vertical(transposed)
+    return [bits, mirror_horizontal(bits), flipped, mirror_horizontal(flipped),
+            transposed, mirror_horizontal(transposed), transposed_flipped, mirror_horizontal(transposed_flipped)]
+
+
+def _inverse(t):
+    """ The transform that undoes t """
+    probe = 0x0000000000010F07  # Has no symmetry of its own
+    return next(u for u in TRANSFORMS if transform(transform(probe, t), u) == probe)
+
+
+INVERSE = [_inverse(t) for t in TRANSFORMS]
+# SQUARE_MAP[t][index]: bit index of a square after transform t
+SQUARE_MAP = [[transform(1 << index, t).bit_length() - 1 for index in range(64)] for t in TRANSFORMS]
+
+
+def transform_square(index, t):
+    """ Bit index of a square after transform t """
+    return SQUARE_MAP[t][index]
+
+
+def transform_move(move, t):
+    """ (row, col) of a move after transform t (None stays None) """
+    if move is None:
+        return None
+    index = SQUARE_MAP[t][move[0] * 8 + move[1]]
+    return index >> 3, index & 7
+
+
+def canonical(own, opp):
+    """
+    Canonical form of a position: (own, opp, t) where own and opp are the smallest
+    image of the position and t the transform that produced it. A move found in the
+    canonical position maps back with transform_square(index, INVERSE[t]).
+    """
+    return min(zip(images(own), images(opp), TRANSFORMS))
+
+
+# Packed Zobrist keys: bits 64*t .. 64*t+63 hold the key of the square's image under t
+_SHIFTS = [64 * t for t in TRANSFORMS]
+
+
+def _pack_keys(keys):
+    return [sum(keys[SQUARE_MAP[t][index]] << _SHIFTS[t] for t in TRANSFORMS) for index in range(64)]
+
+
+SYMMETRIC_BLACK = _pack_keys(bitboard.ZOBRIST_BLACK)
+SYMMETRIC_WHITE = _pack_keys(bitboard.ZOBRIST_WHITE)
+SYMMETRIC_FLIP = _pack_keys(bitboard.ZOBRIST_FLIP)
+SYMMETRIC_SIDE = sum(bitboard.ZOBRIST_SIDE << shift for shift in _SHIFTS)
+
+
+def symmetric_hash(black, white):
+    """ Packed Zobrist hashes of the 8 images of the discs on the board """
+    return _xor_squares(black, SYMMETRIC_BLACK) ^ _xor_squares(white, SYMMETRIC_WHITE)
+
+
+def _xor_squares(bits, keys):
+    """ XOR of keys[index] over the set bits """
+    total = 0
+    while bits:
+        low = bits & -bits
+        total ^= keys[low.bit_length() - 1]
+        bits ^= low
+    return total
+
+
+def symmetric_key(packed):
+    """
+    (key, t) for a packed hash: the smallest of the 8 image hashes, which every
+    symmetric position shares, and the transform of the image it belongs to
+    """
+    keys = [(packed >> shift) & FULL_MASK for shift in _SHIFTS]
+    key = min(keys)
+    return key, keys.index(key)
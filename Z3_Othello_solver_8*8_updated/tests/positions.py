@@ -0,0 +1,36 @@
+"""
+Random positions for the tests, from games of uniformly random moves.
+"""
+
+import random
+
+import bitboard
+from game_logic import Othello
+
+
+def random_game(rng, empties=0):
+    """
+    Othello game after random moves (passing when the side to move has none) until
+    `empties` squares are left or the game ends
+    """
+    game = Othello()
+    while 64 - sum(game.get_piece_count()) > empties:
+        moves = game.get_valid_moves()
+        if not moves:
+            game.current_player = -game.current_player
+            if not game.get_valid_moves():
+                break  # Neither side can move
+            continue
+        game.make_move(*rng.choice(moves))
+    return game
+
+
+def random_positions(seed, empties, count):
+    """ `count` (own, opp) bitboard pairs with exactly `empties` empty squares, the side to move first """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = random_game(rng, empties)
+        if 64 - bitboard.popcount(game.black_bits | game.white_bits) == empties:
+            positions.append((game._player_bits(game.current_player), game._player_bits(-game.current_player)))
+    return positions
@@ -0,0 +1,94 @@
+"""
+The exact endgame solver against a plain alpha-beta search that shares none of
+its code: no move ordering, no table, no special cases for the last empties.
+"""
+
+import unittest
+
+import bitboard
+from endgame import EndgameSolver
+
+from .positions import random_positions
+
+
+def reference_score(own, opp, alpha=-64, beta=64, passed=False):
+    """
+    Final disc difference for the side to move (empty squares go to the winner), exact
+    inside (alpha, beta); plain fail-hard alpha-beta over the moves in square order
+    """
+    moves = bitboard.legal_moves(own, opp)
+    if not moves:
+        if passed:
+            diff = bitboard.popcount(own) - bitboard.popcount(opp)
+            empty = 64 - bitboard.popcount(own | opp)
+            score = diff + empty if diff > 0 else diff - empty if diff < 0 else 0
+            return min(max(score, alpha), beta)
+        return -reference_score(opp, own, -beta, -alpha, True)
+    for row, col in bitboard.iter_squares(moves):
+        index = row * 8 + col
+        flipped = bitboard.flips(own, opp, index)
+        alpha = max(alpha, -reference_score(opp & ~flipped, own | flipped | (1 << index), -beta, -alpha))
+        if alpha >= beta:
+            break
+    return alpha
+
+
+def child(own, opp, index):
+    """ Position after the side to move plays `index`, the new side to move first """
+    flipped = bitboard.flips(own, opp, index)
+    return opp & ~flipped, own | flipped | (1 << index)
+
+
+class EndgameSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        # 1-4 empties take the solver's special-cased paths, 5-10 the main search
+        self.positions = [position for empties in range(1, 11)
+                          for position in random_positions(seed=empties, empties=empties, count=4)]
+
+    def test_solve_matches_reference_score(self):
+        for own, opp in self.positions:
+            with self.subTest(own=hex(own), opp=hex(opp)):
+                self.assertEqual(EndgameSolver().solve(own, opp), reference_score(own, opp))
+
+    def test_best_move_reaches_the_exact_score(self):
+        for own, opp in self.positions:
+            with self.subTest(own=hex(own), opp=hex(opp)):
+                index, score = EndgameSolver().best_move(own, opp)
+                self.assertEqual(score, reference_score(own, opp))
+                if index is None:
+                    self.assertEqual(bitboard.legal_moves(own, opp), 0)
+                else:
+                    self.assertEqual(-reference_score(*child(own, opp, index)), score)
+
+    def test_window_bounds(self):
+        # Outside the window only the side of the bound is guaranteed
+        for own, opp in self.positions:
+            exact = reference_score(own, opp)
+            for alpha, beta in ((exact - 1, exact + 1), (exact, exact + 1), (exact - 1, exact), (-64, exact - 2),
+                                (exact + 2, 64)):
+                if alpha >= beta:
+                    continue
+                with self.subTest(own=hex(own), opp=hex(opp), window=(alpha, beta)):
+                    score = EndgameSolver().solve(own, opp, alpha, beta)
+                    if score <= alpha:
+                        self.assertLessEqual(exact, score)
+                    elif score >= beta:
+                        self.assertGreaterEqual(exact, score)
+                    else:
+                        self.assertEqual(score, exact)
+
+
+    def test_game_ending_with_empty_squares(self):
+        # Black takes H8 and wipes White out with A1 still empty, which goes to Black: 63 + 1
+        white = 1 << 62
+        black = bitboard.FULL_MASK & ~(1 << 0 | 1 << 63 | white)
+        for own, opp, expected in ((black, white, 64), (white, black, -64)):  # White to move has to pass
+            with self.subTest(own=hex(own), opp=hex(opp)):
+                self.assertEqual(reference_score(own, opp), expected)
+                self.assertEqual(EndgameSolver().solve(own, opp), expected)
+                self.assertEqual(EndgameSolver().best_move(own, opp), (63 if own == black else None, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
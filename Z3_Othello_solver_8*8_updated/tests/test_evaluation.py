@@ -0,0 +1,135 @@
+"""
+Stable and frontier discs against a square-by-square implementation of their
+definitions on a plain 8x8 array, and stability against exhaustive play.
+"""
+
+import random
+import unittest
+
+import bitboard
+from evaluation import frontier_discs, stable_discs
+
+from .positions import random_positions
+
+AXES = [(0, 1), (1, 0), (1, 1), (1, -1)]
+NEIGHBOURS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+def to_array(own, opp):
+    """ 8x8 list of 1 (own), -1 (opp) and 0 (empty) """
+    return [[1 if own >> (r * 8 + c) & 1 else -1 if opp >> (r * 8 + c) & 1 else 0 for c in range(8)]
+            for r in range(8)]
+
+
+def on_board(r, c):
+    return 0 <= r < 8 and 0 <= c < 8
+
+
+def line_is_full(board, r, c, dr, dc):
+    """ Whether every square of the line through (r, c) along (dr, dc) is occupied """
+    for sign in (1, -1):
+        rr, cc = r + sign * dr, c + sign * dc
+        while on_board(rr, cc):
+            if board[rr][cc] == 0:
+                return False
+            rr, cc = rr + sign * dr, cc + sign * dc
+    return True
+
+
+def reference_stable(board, colour):
+    """
+    Squares of `colour` that are safe along every axis: the line is full, the disc is at
+    its end, or a neighbour on the line is a stable disc of the same colour; grown until
+    nothing changes
+    """
+    stable = set()
+    changed = True
+    while changed:
+        changed = False
+        for r in range(8):
+            for c in range(8):
+                if board[r][c] != colour or (r, c) in stable:
+                    continue
+                for dr, dc in AXES:
+                    ends = [(r + dr, c + dc), (r - dr, c - dc)]
+                    if any(not on_board(*end) for end in ends) or line_is_full(board, r, c, dr, dc) or \
+                            any(end in stable for end in ends):
+                        continue
+                    break
+                else:
+                    stable.add((r, c))
+                    changed = True
+    return stable
+
+
+def reference_frontier(board, colour):
+    """ Squares of `colour` with an empty square among their (up to 8) neighbours """
+    return {(r, c) for r in range(8) for c in range(8) if board[r][c] == colour and
+            any(on_board(r + dr, c + dc) and board[r + dr][c + dc] == 0 for dr, dc in NEIGHBOURS)}
+
+
+def squares(bits):
+    return set(bitboard.iter_squares(bits))
+
+
+def ever_flipped(own, opp, passed=False):
+    """ Bitmask of every square whose disc changes colour in some continuation of the game """
+    moves = bitboard.legal_moves(own, opp)
+    if not moves:
+        return 0 if passed else ever_flipped(opp, own, True)
+    flipped_anywhere = 0
+    for row, col in bitboard.iter_squares(moves):
+        index = row * 8 + col
+        flipped = bitboard.flips(own, opp, index)
+        flipped_anywhere |= flipped | ever_flipped(opp & ~flipped, own | flipped | (1 << index))
+    return flipped_anywhere
+
+
+class StableDiscsTest(unittest.TestCase):
+
+    def test_matches_the_definition(self):
+        for empties in range(2, 52, 2):
+            for own, opp in random_positions(seed=100 + empties, empties=empties, count=20):
+                with self.subTest(own=hex(own), opp=hex(opp)):
+                    board = to_array(own, opp)
+                    own_stable, opp_stable = stable_discs(own, opp)
+                    self.assertEqual(squares(own_stable), reference_stable(board, 1))
+                    self.assertEqual(squares(opp_stable), reference_stable(board, -1))
+
+    def test_stable_discs_are_never_flipped(self):
+        for own, opp in random_positions(seed=30, empties=7, count=10):
+            with self.subTest(own=hex(own), opp=hex(opp)):
+                own_stable, opp_stable = stable_discs(own, opp)
+                self.assertEqual((own_stable | opp_stable) & ever_flipped(own, opp), 0)
+
+    def test_full_board_and_corners(self):
+        rng = random.Random(31)
+        own = rng.getrandbits(64)
+        opp = bitboard.FULL_MASK & ~own
+        self.assertEqual(stable_discs(own, opp), (own, opp))
+        corner = 1 << 0
+        self.assertEqual(stable_discs(corner, 1 << 9), (corner, 0))
+        self.assertEqual(stable_discs(0, 0), (0, 0))
+
+
+class FrontierDiscsTest(unittest.TestCase):
+
+    def test_matches_the_definition(self):
+        for empties in range(2, 60, 3):
+            for own, opp in random_positions(seed=200 + empties, empties=empties, count=20):
+                with self.subTest(own=hex(own), opp=hex(opp)):
+                    board = to_array(own, opp)
+                    own_frontier, opp_frontier = frontier_discs(own, opp)
+                    self.assertEqual(squares(own_frontier), reference_frontier(board, 1))
+                    self.assertEqual(squares(opp_frontier), reference_frontier(board, -1))
+
+    def test_edges_do_not_wrap(self):
+        # Squares 31 (H4) and 32 (A5) are consecutive bits but not neighbours
+        for empty, disc in (((4, 0), (3, 7)), ((3, 7), (4, 0))):
+            own = bitboard.square_bit(*disc)
+            opp = bitboard.FULL_MASK & ~own & ~bitboard.square_bit(*empty)
+            with self.subTest(empty=empty, disc=disc):
+                self.assertEqual(frontier_discs(own, opp)[0], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+The bitboard Othello against a direct scan of the 8 directions on a plain
+8x8 array, the way the board was implemented before bitboards.
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from game_logic import Othello, BLACK, WHITE, EMPTY
+
+from .positions import random_game
+
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def scan_flips(board, player, row, col):
+    """ Squares flipped by `player` playing (row, col) on a list-of-lists board """
+    if board[row][col] != EMPTY:
+        return set()
+    flipped = set()
+    for dr, dc in DIRECTIONS:
+        line = []
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8 and board[r][c] == -player:
+            line.append((r, c))
+            r, c = r + dr, c + dc
+        if line and 0 <= r < 8 and 0 <= c < 8 and board[r][c] == player:
+            flipped.update(line)
+    return flipped
+
+
+def scan_moves(board, player):
+    """ Legal moves of `player`, in row-major order """
+    return [(r, c) for r in range(8) for c in range(8) if scan_flips(board, player, r, c)]
+
+
+def game_positions(seed, games):
+    """ Every position (before each move) of `games` random games """
+    rng = random.Random(seed)
+    for _ in range(games):
+        game = Othello()
+        while True:
+            moves = game.get_valid_moves()
+            if not moves:
+                game.current_player = -game.current_player
+                if not game.get_valid_moves():
+                    break
+                continue
+            yield game
+            game.make_move(*rng.choice(moves))
+
+
+class MoveGenerationTest(unittest.TestCase):
+
+    def test_moves_and_flips_match_the_array_scan(self):
+        for game in game_positions(seed=1, games=30):
+            board = game.board.tolist()
+            player = game.current_player
+            self.assertEqual(game.get_valid_moves(), scan_moves(board, player))
+            self.assertEqual(game.get_valid_moves() != [], game.has_valid_moves())
+            for row in range(8):
+                for col in range(8):
+                    self.assertEqual(game.is_valid_move(row, col), bool(scan_flips(board, player, row, col)))
+            for row, col in game.get_valid_moves():
+                expected = [line[:] for line in board]
+                flipped = scan_flips(board, player, row, col)
+                for r, c in flipped | {(row, col)}:
+                    expected[r][c] = player
+                after = game.copy()
+                after.make_move(row, col)
+                self.assertEqual(set(after.get_last_flipped_discs()), flipped)
+                self.assertEqual(after.board.tolist(), expected)
+                self.assertEqual(after.current_player, -player)
+
+    def test_illegal_move_changes_nothing(self):
+        game = Othello()
+        before = game.position()
+        self.assertFalse(game.make_move(0, 0))  # Empty but flips nothing
+        self.assertFalse(game.make_move(3, 3))  # Occupied
+        self.assertEqual(game.position(), before)
+
+    def test_piece_count_and_winner(self):
+        game = random_game(random.Random(2))
+        board = game.board
+        black, white = game.get_piece_count()
+        self.assertEqual((black, white), (int(np.sum(board == BLACK)), int(np.sum(board == WHITE))))
+        expected = "Black" if black > white else "White" if white > black else "Draw"
+        self.assertEqual(game.check_winner(), expected)
+
+
+def state(game):
+    """ Everything make_move may change, including the derived hashes and board view """
+    return (game.black_bits, game.white_bits, game.current_player, game.disc_hash, game.symmetric_hash,
+            game.zobrist_key(), game.symmetric_key(), game.board.tolist(), game.get_valid_moves(),
+            list(game.last_flipped_discs), game.last_move, game.last_player, game.last_ai_move)
+
+
+class MakeUndoTest(unittest.TestCase):
+
+    def test_make_move_matches_a_copy(self):
+        for game in game_positions(seed=4, games=20):
+            for move in game.get_valid_moves():
+                game_copy = game.copy()
+                game_copy.make_move(*move)
+                record = game.make_move(*move)
+                self.assertEqual(state(game), state(game_copy))
+                game.undo_move(record)
+
+    def test_undo_restores_the_position(self):
+        for game in game_positions(seed=5, games=20):
+            before = state(game)
+            for move in game.get_valid_moves():
+                record = game.make_move(*move)
+                game.undo_move(record)
+                self.assertEqual(state(game), before)
+
+    def test_undo_in_reverse_order_after_a_whole_game(self):
+        rng = random.Random(6)
+        game = Othello()
+        history = []
+        while True:
+            moves = game.get_valid_moves()
+            if not moves:
+                break
+            history.append((state(game), game.make_move(*rng.choice(moves))))
+        for before, record in reversed(history):
+            game.undo_move(record)
+            self.assertEqual(state(game), before)
+
+    def test_incremental_hashes_match_a_fresh_game(self):
+        for game in game_positions(seed=7, games=10):
+            fresh = Othello.from_position(game.position())
+            self.assertEqual(fresh.disc_hash, game.disc_hash)
+            self.assertEqual(fresh.symmetric_hash, game.symmetric_hash)
+
+
+class BoardViewTest(unittest.TestCase):
+
+    def test_board_is_read_only(self):
+        game = Othello()
+        with self.assertRaises(ValueError):
+            game.board[0][0] = BLACK
+        with self.assertRaises(ValueError):
+            game.board[2, 3] = WHITE
+        self.assertEqual(game.board[0][0], EMPTY)
+        self.assertEqual(game.get_valid_moves(), [(2, 3), (3, 2), (4, 5), (5, 4)])
+
+    def test_board_assignment_sets_the_position(self):
+        game = random_game(random.Random(3), empties=30)
+        board = game.board.copy()
+        fresh = Othello()
+        fresh.board = board
+        fresh.current_player = game.current_player
+        self.assertEqual(fresh.position(), game.position())
+        self.assertEqual(fresh.zobrist_key(), game.zobrist_key())
+        self.assertEqual(fresh.symmetric_key(), game.symmetric_key())
+        self.assertEqual(fresh.get_valid_moves(), game.get_valid_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Hint jobs: progress, completion, cancellation of running and queued jobs, and
+cancelling a session's jobs so a request can take its lock.
+"""
+
+import random
+import time
+import unittest
+
+from hint_jobs import HintJobManager, QUEUED, RUNNING, DONE, CANCELLED, FINISHED
+from sessions import GameSession
+from z3_solver import OthelloZ3Solver
+
+from .positions import random_game
+
+
+def run_hint(session):
+    return {"best_move": session.solver.find_best_move()}
+
+
+def midgame_session(seed, time_limit):
+    """ Session in a position outside the opening book whose solver searches for `time_limit` seconds """
+    session = GameSession(f"session-{seed}", lambda game: OthelloZ3Solver(game, time_limit=time_limit))
+    game = random_game(random.Random(seed), empties=40)
+    session.game.black_bits, session.game.white_bits = game.black_bits, game.white_bits
+    session.game.current_player = game.current_player
+    session.game._refresh_hashes()
+    return session
+
+
+def wait_for(job, condition, timeout=10):
+    """ Wait until condition(job) holds; fails the test after `timeout` seconds """
+    with job.changed:
+        if not job.changed.wait_for(lambda: condition(job), timeout):
+            raise AssertionError(f"job still {job.status} after {timeout}s")
+
+
+class HintJobManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = HintJobManager(run_hint, workers=1)
+        self.addCleanup(self.manager.pool.shutdown, cancel_futures=True)
+        self.addCleanup(self.cancel_all)  # Runs first, so shutdown does not wait out a search
+
+    def cancel_all(self):
+        for job in list(self.manager.jobs.values()):
+            self.manager.cancel(job)
+
+    def test_job_reports_progress_and_result(self):
+        session = midgame_session(60, time_limit=1)
+        job = self.manager.submit(session)
+        wait_for(job, lambda job: job.status in FINISHED)
+        state = job.as_dict()
+        self.assertEqual(state["status"], DONE)
+        self.assertIn(tuple(state["result"]["best_move"]), session.game.get_valid_moves())
+        depths = [step["depth"] for step in state["progress"]]
+        self.assertTrue(depths)
+        self.assertEqual(depths, sorted(depths))
+        self.assertIs(self.manager.get(job.id, session), job)
+        self.assertIsNone(self.manager.get(job.id, midgame_session(61, time_limit=1)))  # Another player's job
+
+    def test_cancel_running_job(self):
+        session = midgame_session(62, time_limit=60)
+        job = self.manager.submit(session)
+        wait_for(job, lambda job: job.progress)
+        self.manager.cancel(job)
+        wait_for(job, lambda job: job.status in FINISHED, timeout=5)
+        self.assertEqual(job.status, CANCELLED)
+        self.assertIsNotNone(job.result["best_move"])  # Best move of the deepest completed depth
+        self.assertIsNone(session.solver.should_stop)
+
+    def test_cancel_queued_job(self):
+        session = midgame_session(63, time_limit=60)
+        running = self.manager.submit(session)
+        queued = self.manager.submit(session)
+        wait_for(running, lambda job: job.status == RUNNING)
+        self.assertEqual(queued.status, QUEUED)
+        self.manager.cancel(queued)
+        self.assertEqual(queued.status, CANCELLED)
+        self.manager.cancel(running)
+        wait_for(running, lambda job: job.status in FINISHED, timeout=5)
+        time.sleep(0.2)  # Give the pool the chance to (wrongly) start the cancelled job
+        self.assertIsNone(queued.started)
+        self.assertIsNone(queued.result)
+
+    def test_cancel_session_frees_the_lock(self):
+        session = midgame_session(64, time_limit=60)
+        other = midgame_session(65, time_limit=60)
+        job = self.manager.submit(session)
+        queued = self.manager.submit(session)
+        other_job = self.manager.submit(other)
+        wait_for(job, lambda job: job.status == RUNNING)
+        self.manager.cancel_session(session)
+        self.assertTrue(session.lock.acquire(timeout=5))  # The search stopped instead of using its 60 s
+        session.lock.release()
+        wait_for(job, lambda job: job.status in FINISHED)
+        self.assertEqual((job.status, queued.status), (CANCELLED, CANCELLED))
+        self.assertFalse(other_job.cancel_event.is_set())  # Another session's job (it may already have finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Perft counts of every board implementation against the known counts from the
+start position, and against each other near the end of the game, where passes
+and finished games are common.
+"""
+
+import random
+import unittest
+
+import bitboard
+from game_logic import Othello
+from perft import PERFT_COUNTS, perft_array, perft_bitboard, perft_game, load_variant
+
+from .positions import random_game
+
+
+class PerftTest(unittest.TestCase):
+
+    def test_bitboard(self):
+        for depth in range(1, 8):
+            with self.subTest(depth=depth):
+                self.assertEqual(perft_bitboard(bitboard.START_BLACK, bitboard.START_WHITE, depth),
+                                 PERFT_COUNTS[depth])
+
+    def test_othello(self):
+        game = Othello()
+        for depth in range(1, 7):
+            with self.subTest(depth=depth):
+                self.assertEqual(perft_game(game, depth), PERFT_COUNTS[depth])
+        self.assertEqual(game.position(), Othello().position())  # make/undo left the game as it was
+
+    def test_numpy_variant(self):
+        variant = load_variant("numpy")
+        if variant is None:
+            self.skipTest("Z3_Othello_solver_8*8 is not next to this directory")
+        for depth in range(1, 5):
+            with self.subTest(depth=depth):
+                self.assertEqual(perft_array(variant(), depth), PERFT_COUNTS[depth])
+
+
+    def test_implementations_agree_in_the_endgame(self):
+        rng = random.Random(40)
+        for _ in range(20):
+            game = random_game(rng, empties=rng.randint(4, 10))
+            own, opp = game._player_bits(game.current_player), game._player_bits(-game.current_player)
+            with self.subTest(position=game.position()):
+                self.assertEqual(perft_game(game, 5), perft_bitboard(own, opp, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Session manager: lookup, least recently used and idle eviction, sessions in use,
+and the shared limit on pondering.
+"""
+
+import random
+import threading
+import unittest
+
+from sessions import SessionManager
+from z3_solver import OthelloZ3Solver
+
+from .positions import random_game
+
+
+def make_solver(game):
+    return OthelloZ3Solver(game)
+
+
+def start_midgame_pondering(session, seed):
+    """ Put the session in a position outside the book and let its solver ponder it """
+    game = random_game(random.Random(seed), empties=40)
+    session.game.black_bits, session.game.white_bits = game.black_bits, game.white_bits
+    session.game.current_player = game.current_player
+    session.game._refresh_hashes()
+    session.solver.start_pondering()
+
+
+class SessionManagerTest(unittest.TestCase):
+
+    def test_lookup(self):
+        manager = SessionManager(make_solver)
+        session = manager.get(None)
+        self.assertIs(manager.get(session.id), session)
+        other = manager.get("unknown")
+        self.assertIsNot(other, session)
+        self.assertNotEqual(other.id, "unknown")  # Ids are only handed out by the server
+        manager.remove(session.id)
+        self.assertIsNot(manager.get(session.id), session)
+
+    def test_least_recently_used_go_first(self):
+        manager = SessionManager(make_solver, max_sessions=2)
+        first, second = manager.get(None), manager.get(None)
+        manager.get(first.id)  # Now the second is the least recently used
+        third = manager.get(None)
+        self.assertEqual(list(manager.sessions), [first.id, third.id])
+        self.assertEqual(manager.stats()["evicted"], 1)
+        self.assertIsNot(manager.get(second.id), second)
+
+    def test_idle_sessions_expire(self):
+        manager = SessionManager(make_solver, ttl=60)
+        idle, active = manager.get(None), manager.get(None)
+        idle.last_used -= 61
+        manager.get(active.id)
+        self.assertEqual(list(manager.sessions), [active.id])
+
+    def test_memory_limit(self):
+        manager = SessionManager(make_solver)
+        first = manager.get(None)
+        manager.max_memory_bytes = first.memory_bytes() * 3 // 2  # Room for one session, not two
+        second = manager.get(None)
+        self.assertEqual(list(manager.sessions), [second.id])
+
+    def test_session_in_use_is_kept(self):
+        manager = SessionManager(make_solver, max_sessions=1)
+        busy = manager.get(None)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold():
+            with busy.lock:
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        locked.wait()
+        try:
+            newer = manager.get(None)
+            self.assertEqual(list(manager.sessions), [busy.id, newer.id])
+        finally:
+            release.set()
+            thread.join()
+        manager.get(newer.id)  # Free again, so evicted on the next request
+        self.assertEqual(list(manager.sessions), [newer.id])
+
+    def test_eviction_stops_pondering(self):
+        manager = SessionManager(make_solver, max_sessions=1)
+        session = manager.get(None)
+        start_midgame_pondering(session, seed=50)
+        self.assertIsNotNone(session.solver.ponder_thread)
+        manager.get(None)
+        self.assertIsNone(session.solver.ponder_thread)
+
+    def test_pondering_slots_are_shared(self):
+        manager = SessionManager(make_solver, max_pondering=1)
+        first, second = manager.get(None), manager.get(None)
+        try:
+            start_midgame_pondering(first, seed=51)
+            start_midgame_pondering(second, seed=52)
+            self.assertIsNotNone(first.solver.ponder_thread)
+            self.assertIsNone(second.solver.ponder_thread)  # No slot left
+            self.assertEqual(manager.stats()["pondering_sessions"], 1)
+            first.close()
+            second.solver.start_pondering()
+            self.assertIsNotNone(second.solver.ponder_thread)
+        finally:
+            first.close()
+            second.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Transposition tables: replacement policy and bound types, on their own and in
+the solver's negamax, whose results with a shared, reused table must equal a
+plain negamax without one.
+"""
+
+import random
+import unittest
+
+import symmetry
+from game_logic import Othello, Position
+from transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from z3_solver import OthelloZ3Solver
+
+from .positions import random_game
+
+INF = float("inf")
+
+
+class TableTests:
+    """ Tests shared by both table implementations; make_table is set by the subclasses """
+
+    def setUp(self):
+        self.table = self.make_table()
+
+    def test_probe_returns_what_was_stored(self):
+        key = 0x123456789ABCDEF0
+        self.assertIsNone(self.table.probe(key))
+        for value, flag, move in ((-1000, EXACT, (2, 3)), (37, LOWER_BOUND, None), (-5, UPPER_BOUND, (7, 7))):
+            self.table.new_search()  # So the shallower entries replace the deeper ones
+            self.table.store(key, 4, value, flag, move)
+            entry = self.table.probe(key)
+            self.assertEqual((entry.key, entry.depth, entry.value, entry.flag, entry.move), (key, 4, value, flag, move))
+
+    def test_other_key_in_the_same_slot_misses(self):
+        key = 0x1234
+        self.table.store(key, 3, 10, EXACT)
+        self.assertIsNone(self.table.probe(key + self.table.size))
+
+    def test_depth_preferred_replacement(self):
+        key = 0x42
+        self.table.store(key, 5, 1, EXACT)
+        self.table.store(key, 3, 2, EXACT)  # Shallower, same search: kept out
+        self.assertEqual(self.table.probe(key).value, 1)
+        self.table.store(key, 5, 3, LOWER_BOUND)  # As deep: replaces
+        self.assertEqual(self.table.probe(key).value, 3)
+        self.table.new_search()
+        self.table.store(key, 1, 4, UPPER_BOUND)  # Left over from an earlier search: replaced
+        self.assertEqual((self.table.probe(key).value, self.table.probe(key).depth), (4, 1))
+
+    def test_clear(self):
+        self.table.store(7, 2, 1, EXACT)
+        self.assertEqual(len(self.table), 1)
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+        self.assertIsNone(self.table.probe(7))
+
+
+class TranspositionTableTest(TableTests, unittest.TestCase):
+
+    def make_table(self):
+        return TranspositionTable(size_bits=10)
+
+
+class SharedTranspositionTableTest(TableTests, unittest.TestCase):
+
+    def make_table(self):
+        table = SharedTranspositionTable(size_bits=10)
+        self.addCleanup(table.close)
+        return table
+
+
+class NegamaxBoundsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.solver = OthelloZ3Solver(Othello())
+        self.solver._start_search(3600)
+        rng = random.Random(8)
+        self.games = [random_game(rng, empties) for empties in (44, 36, 28, 20)]
+
+    def reference(self, game, depth):
+        """ Plain negamax without table, ordering or pruning, scored like the solver """
+        if depth == 0:
+            return self.solver._evaluate_position(game)
+        moves = game.get_valid_moves()
+        if not moves:
+            game.current_player = -game.current_player
+            try:
+                if not game.get_valid_moves():
+                    black, white = game.get_piece_count()
+                    diff = (black - white) * -game.current_player  # The side that had to pass
+                    return 1000 if diff > 0 else -1000 if diff < 0 else 0
+                return -self.reference(game, depth - 1)
+            finally:
+                game.current_player = -game.current_player
+        best = -INF
+        for move in moves:
+            record = game.make_move(*move)
+            best = max(best, -self.reference(game, depth - 1))
+            game.undo_move(record)
+        return best
+
+    def negamax(self, game, depth, alpha=-INF, beta=INF):
+        return self.solver._negamax(self.solver._search_copy(game), depth, alpha, beta, True)
+
+    def test_deepening_with_a_shared_table(self):
+        # The table keeps the bounds of every shallower and null-window search
+        for game in self.games:
+            for depth in range(1, 4):
+                exact = self.reference(game, depth)
+                with self.subTest(position=game.position(), depth=depth):
+                    self.assertEqual(self.negamax(game, depth), exact)
+                    windows = [(exact + offset, exact + offset + 1) for offset in range(-30, 31, 3)]
+                    for alpha, beta in windows + [(exact - 1, exact), (exact, exact + 1), (exact - 50, exact + 50)]:
+                        score = self.negamax(game, depth, alpha, beta)
+                        if score <= alpha:
+                            self.assertLessEqual(exact, score)
+                        elif score >= beta:
+                            self.assertGreaterEqual(exact, score)
+                        else:
+                            self.assertEqual(score, exact)
+                    self.assertEqual(self.negamax(game, depth), exact)
+
+    def test_symmetric_positions_share_entries(self):
+        for game in self.games:
+            exact = self.reference(game, 3)
+            self.assertEqual(self.negamax(game, 3), exact)
+            for t in symmetry.TRANSFORMS:
+                image = Othello.from_position(Position(symmetry.transform(game.black_bits, t),
+                                                       symmetry.transform(game.white_bits, t), game.current_player))
+                with self.subTest(position=game.position(), transform=t):
+                    self.assertEqual(self.negamax(image, 3), exact)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Fixed-size transposition tables keyed by the Zobrist key of a position
+(board plus side to move).
+"""
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+import numpy as np
+
+# Bound types for stored values
+EXACT = 0
+LOWER_BOUND = 1  # Search failed high: true value >= value
+UPPER_BOUND = 2  # Search failed low: true value <= value
+
+TTEntry = namedtuple("TTEntry", ["key", "depth", "value", "flag", "move", "generation"])
+ENTRY_BYTES = 160  # Approximate memory of one stored TTEntry (the tuple and its values)
+
+
+class TranspositionTable:
+    """
+    Transposition table with a fixed number of slots, so memory stays flat no
+    matter how long the solver lives. Each slot holds one entry; a new entry
+    replaces the old one if it was searched at least as deep, or if the old
+    entry is left over from an earlier search.
+    """
+
+    def __init__(self, size_bits=18):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        self.entries = [None] * self.size
+        self.used = 0  # Slots holding an entry
+        self.generation = 0
+
+    def new_search(self):
+        """ Mark existing entries as old so they can be replaced by the next search """
+        self.generation += 1
+
+    def clear(self):
+        """ Drop every entry """
+        self.entries = [None] * self.size
+        self.used = 0
+
+    def probe(self, key):
+        """ Return the TTEntry stored for a key, or None """
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move=None):
+        """ Store a search result using depth-preferred replacement """
+        index = key & self.mask
+        old = self.entries[index]
+        if old is None or depth >= old.depth or old.generation != self.generation:
+            self.entries[index] = TTEntry(key, depth, value, flag, move, self.generation)
+            if old is None:
+                self.used += 1
+
+    def memory_bytes(self):
+        """ Approximate memory used by the table """
+        return self.size * 8 + self.used * ENTRY_BYTES
+
+    def __len__(self):
+        return self.used
+
+
+# Layout of one packed entry in the shared table: the data word holds the value,
+# depth, bound type, best move and generation; the check word is key ^ data.
+_ENTRY_DTYPE = np.dtype([("check", "<u8"), ("data", "<u8")])
+_HEADER_WORDS = 2  # [generation, stop flag]
+_NO_MOVE = 64
+_VALUE_OFFSET = 1 << 31
+
+
+def _pack(value, depth, flag, move, generation):
+    """ Pack an entry into a single 64-bit word """
+    square = _NO_MOVE if move is None else move[0] * 8 + move[1]
+    return ((int(value) + _VALUE_OFFSET) & 0xFFFFFFFF) | (min(depth, 255) << 32) | (flag << 40) | \
+        (square << 42) | ((generation & 0xFF) << 49)
+
+
+def _unpack(key, data):
+    """ Unpack a 64-bit data word into a TTEntry """
+    square = (data >> 42) & 0x7F
+    return TTEntry(key, (data >> 32) & 0xFF, (data & 0xFFFFFFFF) - _VALUE_OFFSET, (data >> 40) & 0x3,
+                   None if square == _NO_MOVE else (square >> 3, square & 7), (data >> 49) & 0xFF)
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table in shared memory, shared by the processes of a Lazy SMP
+    search. Writes take no lock: each entry stores key ^ data next to data, so a
+    probe that reads a half-written entry sees a checksum mismatch and treats it
+    as a miss. Uses the same probe/store interface and replacement policy as
+    TranspositionTable.
+    """
+
+    def __init__(self, size_bits=18, name=None):
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        nbytes = _HEADER_WORDS * 8 + self.size * _ENTRY_DTYPE.itemsize
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            # Pool workers share the creating process's resource tracker, so attaching
+            # does not hand ownership (or unlinking) of the segment to the worker
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.size_bits = size_bits
+        self.header = np.ndarray((_HEADER_WORDS,), dtype="<u8", buffer=self.memory.buf)
+        self.entries = np.ndarray((self.size,), dtype=_ENTRY_DTYPE, buffer=self.memory.buf,
+                                  offset=_HEADER_WORDS * 8)
+        if self.owner:
+            self.header[:] = 0
+            self.entries[:] = 0
+
+    @property
+    def generation(self):
+        return int(self.header[0])
+
+    def new_search(self):
+        """ Mark existing entries as old so they can be replaced by the next search """
+        self.header[0] = (int(self.header[0]) + 1) & 0xFF
+
+    def clear(self):
+        """ Drop every entry """
+        self.entries[:] = 0
+
+    def request_stop(self, stop=True):
+        """ Ask every process searching with this table to stop (or clear the request) """
+        self.header[1] = 1 if stop else 0
+
+    def stop_requested(self):
+        return bool(self.header[1])
+
+    def probe(self, key):
+        """ Return the TTEntry stored for a key, or None """
+        entry = self.entries[key & self.mask]
+        data = int(entry["data"])
+        if data and int(entry["check"]) ^ data == key:
+            return _unpack(key, data)
+        return None
+
+    def store(self, key, depth, value, flag, move=None):
+        """ Store a search result using depth-preferred replacement """
+        index = key & self.mask
+        entry = self.entries[index]
+        old_data = int(entry["data"])
+        generation = self.generation
+        if not old_data or depth >= (old_data >> 32) & 0xFF or (old_data >> 49) & 0xFF != generation:
+            data = _pack(value, depth, flag, move, generation)
+            self.entries[index] = (key ^ data, data)
+
+    def memory_bytes(self):
+        """ Memory used by the table (the shared memory segment) """
+        return self.memory.size
+
+    def close(self):
+        """ Detach from the shared memory, and free it if this process created it """
+        self.header = None
+        self.entries = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.entries["data"]))
+
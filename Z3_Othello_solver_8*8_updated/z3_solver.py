@@ -1,7 +1,34 @@
 import z3
 import numpy as np
-from game_logic import Othello, BLACK, WHITE, EMPTY
+from game_logic import BLACK, EMPTY
+from transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from endgame import EndgameSolver
+from evaluation import Evaluator, IncrementalOthello, stable_discs
+from bitboard import popcount
+from search_stats import SearchStats, profile_call
+from opening_book import default_book
+import parallel
+import symmetry
+import queue
+import threading
 import time
+import weakref
+from collections import namedtuple
+from concurrent.futures import wait
+
+# Move ordering bonuses: transposition table move first, then the two killer slots
+TT_MOVE_BONUS = 1000000
+KILLER_BONUSES = (50000, 40000)
+MAX_PLY = 128
+STOP_POLL_INTERVAL = 0.05  # Seconds between checks of should_stop while waiting for worker processes
+
+# Result of one completed search iteration: the best move, its score and principal
+# variation, and the nodes searched and seconds spent since the search started
+Iteration = namedtuple("Iteration", ["depth", "best_move", "score", "pv", "nodes", "elapsed"])
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget for a request is used up"""
 
 class OthelloZ3Solver:
     """
@@ -9,9 +36,36 @@ class OthelloZ3Solver:
     without time constraints, incorporating strategic principles for optimal play.
     """
     
-    def __init__(self, game_instance, max_depth=None):
+    def __init__(self, game_instance, max_depth=None, time_limit=5.0, workers=1, parallel_mode="root_split"):
         self.game = game_instance
         self.max_depth = max_depth  # If None, will try to solve to the end of the game
+        self.time_limit = time_limit  # Seconds of search per request
+        self.workers = workers  # Processes used by the search; 1 searches in this process only
+        self.parallel_mode = parallel_mode  # "root_split" or "lazy_smp"
+        self.stop_flag = None  # Shared flag that stops root-split workers, created on first use
+        self.search_count = 0
+        self.should_stop = None  # Optional callable; the search aborts when it returns True
+        self.on_iteration = None  # Optional callable(Iteration), called after each completed iteration
+        self.deadline = None
+        self.last_search_depth = 0  # Deepest fully completed iteration of the last search
+        self.last_search_score = None  # Root score of that iteration
+        self.last_root_moves = None  # Sorted root moves iterative deepening searched
+        self.last_exact_score = None  # Final disc difference when the last search solved the endgame
+        self.endgame_empties = 12  # Solve exactly at or below this many empty squares (well within half a 5 s budget)
+        self.aspiration_window = 150  # Half-width of the root window around the previous score
+        self.search_completed = True  # False if the last search stopped before reaching its depth limit
+        self.stats = SearchStats()  # Counters of the last search
+        self.opening_book = default_book()  # None when there is no book file
+        self.last_book_move = False  # True if the last move came from the opening book
+        self.last_ponder_stats = None  # Statistics of the background search whose move the last search returned
+        
+        # Pondering: background search of the position while waiting for the next request
+        self.ponder_time_limit = 30.0
+        self.ponder_thread = None
+        self.ponder_stop_event = None
+        self.ponder_result = None  # Outcome of the last background search
+        self.ponder_slots = None  # Optional semaphore shared by solvers; pondering is skipped when none is free
+        self.resume_from = None  # Pondered progress the next iterative deepening continues from
         self.solver = z3.Solver()
         
         # Strategic position values - these are based on the specified strategies
@@ -39,23 +93,191 @@ class OthelloZ3Solver:
         self.early_game_threshold = 20  # Less than 20 pieces on board
         self.late_game_threshold = 50   # More than 50 pieces on board
         
-        # Transposition table for position caching
-        self.transposition_table = {}
+        # Bitboard evaluation built from the tables above
+        self.evaluator = Evaluator(self.position_weights, self.corner_positions, self.x_squares, self.c_squares,
+                                   self.edge_positions, self.early_game_threshold, self.late_game_threshold)
+        
+        # Transposition table for position caching (bounded, keyed by Zobrist key)
+        self.transposition_table = TranspositionTable()
         
         # Move ordering heuristics for alpha-beta pruning
-        self.history_table = {}  # Store history heuristic scores
+        self.history_table = {}  # (move, player) -> bonus earned by causing beta cutoffs
+        self.killer_moves = [[None, None] for _ in range(MAX_PLY)]  # Two cutoff moves per ply
+        self.move_ordering = "static"  # "static", "mobility" or "shallow"
+        self.shallow_search_depth = 2  # Depth of the ordering search for "shallow"
+        self.shallow_search_min_depth = 4  # Only nodes at least this deep pay for it
         
     def find_best_move(self):
         """Find the best move using full Z3 model search"""
-        game_copy = self.game.copy()
+        game_copy = self._search_copy(self.game)
         valid_moves = game_copy.get_valid_moves()
         
         if not valid_moves:
             return None
-            
+        
+        # Take over from a background search of this position, if there was one
+        self.stop_pondering()
+        
+        book_move = self._book_move(game_copy, valid_moves)
+        if book_move is not None:
+            print(f"Using opening book move {book_move}")
+            self.stats.reset()
+            self.last_search_depth = 0
+            self.last_exact_score = None
+            self.last_book_move = True
+            self._report_iteration(game_copy, 0, book_move, None)
+            return book_move
+        self.last_book_move = False
+        self.last_ponder_stats = None
+        pondered = self.ponder_result
+        self.ponder_result = None
+        if pondered is not None and pondered["key"] != game_copy.zobrist_key():
+            pondered = None
+        
+        if pondered is not None and pondered["complete"]:
+            print(f"Using pondered result (depth {pondered['depth']})")
+            # This request searched nothing; the background search's numbers are reported separately
+            self.stats.reset()
+            self.last_ponder_stats = pondered["stats"]
+            self.last_search_depth = pondered["depth"]
+            self.last_exact_score = pondered["exact_score"]
+            self._report_iteration(game_copy, pondered["depth"], pondered["move"], pondered["score"])
+            return pondered["move"]
+        
+        # Every request gets the same time budget, shared by all search iterations
+        self._start_search(self.time_limit)
+        self.resume_from = pondered
+        try:
+            return self._search_position(game_copy, valid_moves)
+        finally:
+            self.resume_from = None  # E.g. the exact endgame path returned without using it
+    
+    def solve_exact(self, time_limit=None):
+        """
+        Solve the current position to the end of the game whatever its number of empty
+        squares, with the whole time budget (time_limit, or the solver's). Returns the best
+        move, or None if there is none or the budget runs out; the exact final disc
+        difference is left in last_exact_score.
+        """
+        game_copy = self._search_copy(self.game)
+        valid_moves = game_copy.get_valid_moves()
+        if not valid_moves:
+            return None
+        self.stop_pondering()
+        self._start_search(self.time_limit if time_limit is None else time_limit)
+        return self._solve_endgame(game_copy, valid_moves, budget_share=1.0)
+    
+    def _book_move(self, game, valid_moves):
+        """Opening book move for the position, or None if it is not in the book"""
+        if self.opening_book is None:
+            return None
+        move = self.opening_book.probe(game)
+        return move if move in valid_moves else None
+    
+    def iterate_best_move(self):
+        """
+        Generator form of find_best_move: runs the search in a background thread and
+        yields an Iteration after each completed iteration, or a single one for a move
+        chosen without iterating (book move, corner, pondered result, solved endgame).
+        Closing the generator (or leaving contextlib.closing around it) stops the search.
+        Returns find_best_move's move.
+        """
+        self.stop_pondering()  # A background search must not report to the hook set below
+        iterations = queue.Queue()
+        stop_event = threading.Event()
+        outer_should_stop, outer_on_iteration = self.should_stop, self.on_iteration
+        self.should_stop = lambda: stop_event.is_set() or (outer_should_stop is not None and outer_should_stop())
+        self.on_iteration = iterations.put
+        outcome = {}
+        
+        def search():
+            try:
+                outcome["move"] = self.find_best_move()
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                iterations.put(None)  # Marks the end of the search
+        
+        thread = threading.Thread(target=search, daemon=True)
+        thread.start()
+        try:
+            while True:
+                iteration = iterations.get()
+                if iteration is None:
+                    break
+                yield iteration
+        finally:
+            stop_event.set()
+            thread.join()
+            self.should_stop, self.on_iteration = outer_should_stop, outer_on_iteration
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["move"]
+    
+    def _report_iteration(self, game, depth, move, score, pv_length=None):
+        """Pass a completed iteration to on_iteration, if set"""
+        if self.on_iteration is None:
+            return
+        pv = self._principal_variation(game, move, depth if pv_length is None else pv_length)
+        self.on_iteration(Iteration(depth, move, score, pv, self.stats.nodes + self.stats.endgame_nodes,
+                                    round(time.time() - self.stats.start_time, 3)))
+    
+    def _principal_variation(self, game, move, length):
+        """
+        The move followed by the best replies the transposition table holds, up to `length`
+        moves (at least the move itself); stops at a pass or a position the table lacks
+        """
+        pv = [move]
+        records = [game.make_move(*move)]
+        try:
+            while len(pv) < length:
+                key, transform = game.symmetric_key()
+                entry = self.transposition_table.probe(key)
+                if entry is None or entry.move is None:
+                    break
+                reply = symmetry.transform_move(entry.move, symmetry.INVERSE[transform])
+                if not game.is_valid_move(*reply):
+                    break
+                pv.append(reply)
+                records.append(game.make_move(*reply))
+        finally:
+            for record in reversed(records):
+                game.undo_move(record)
+        return pv
+    
+    def _search_copy(self, game):
+        """Copy of a game to search on, keeping the evaluation's static terms up to date as moves are made"""
+        return IncrementalOthello(self.evaluator, game)
+    
+    def _start_search(self, time_limit):
+        """Reset per-search state before searching a new position"""
+        if self._uses_lazy_smp() and not isinstance(self.transposition_table, SharedTranspositionTable):
+            # Lazy SMP helpers share one table that lives in shared memory
+            self.transposition_table = SharedTranspositionTable()
+            weakref.finalize(self, self.transposition_table.close)
+        self.transposition_table.new_search()
+        self._reset_move_ordering()
+        self.search_count += 1
+        self.deadline = time.time() + time_limit
+        self.last_search_depth = 0
+        self.last_search_score = None
+        self.last_root_moves = None
+        self.last_exact_score = None
+        self.search_completed = True
+        self.resume_from = None  # Only the search that sets it afterwards may use it
+        self.stats.reset()
+    
+    def _search_position(self, game_copy, valid_moves):
+        """Solve the endgame exactly if few enough squares are empty, else use the strategy for the game phase"""
         # Determine game phase
         total_pieces = np.sum(game_copy.board != EMPTY)
         
+        # With few enough empty squares, solve to the end of the game exactly, whatever the phase
+        if 64 - total_pieces <= self.endgame_empties:
+            best_move = self._solve_endgame(game_copy, valid_moves)
+            if best_move is not None:
+                return best_move
+        
         # Select different strategies based on game phase
         if total_pieces < self.early_game_threshold:
             return self._early_game_strategy(game_copy, valid_moves)
@@ -64,6 +286,59 @@ class OthelloZ3Solver:
         else:
             return self._mid_game_strategy(game_copy, valid_moves)
     
+    def start_pondering(self):
+        """
+        Search the current position in a background thread (e.g. while the player thinks),
+        filling the transposition table. The next find_best_move for the same position
+        returns the pondered move at once if that search finished, or continues from the
+        deepest iteration it completed. Pondering always searches in this process only, and
+        does not start if ponder_slots is set and all its slots are taken by other solvers.
+        """
+        self.stop_pondering()
+        game_copy = self._search_copy(self.game)
+        valid_moves = game_copy.get_valid_moves()
+        if not valid_moves or self._book_move(game_copy, valid_moves) is not None:
+            return  # Nothing to search
+        if self.ponder_slots is not None and not self.ponder_slots.acquire(blocking=False):
+            return  # Enough searches are running already
+        
+        self.ponder_result = None
+        self.ponder_stop_event = threading.Event()
+        self.ponder_thread = threading.Thread(target=self._ponder, args=(game_copy, valid_moves, self.ponder_stop_event),
+                                              daemon=True)
+        self.ponder_thread.start()
+    
+    def stop_pondering(self):
+        """Stop the background search (if any) and wait for it to record its result"""
+        if self.ponder_thread is not None:
+            self.ponder_stop_event.set()
+            self.ponder_thread.join()
+            self.ponder_thread = None
+            self.ponder_stop_event = None
+    
+    def _ponder(self, game_copy, valid_moves, stop_event):
+        """Background search body; runs until the search completes or is stopped"""
+        workers = self.workers
+        self.workers = 1
+        self.should_stop = stop_event.is_set
+        try:
+            self._start_search(self.ponder_time_limit)
+            move = self._search_position(game_copy, valid_moves)
+            self.ponder_result = {
+                "key": game_copy.zobrist_key(),
+                "move": move,
+                "depth": self.last_search_depth,
+                "score": self.last_search_score,
+                "exact_score": self.last_exact_score,
+                "complete": self.search_completed,
+                "stats": self.stats.as_dict(self.last_search_depth),
+            }
+        finally:
+            self.should_stop = None
+            self.workers = workers
+            if self.ponder_slots is not None:
+                self.ponder_slots.release()
+    
     def _early_game_strategy(self, game, valid_moves):
         """
         Early game strategy focuses on:
@@ -80,31 +355,7 @@ class OthelloZ3Solver:
         moves_to_consider = safe_moves if safe_moves else valid_moves
         
         # For early game, use minimax with positional evaluation and mobility
-        depth = 6  # Moderate depth for early game
-        best_score = float('-inf')
-        best_move = moves_to_consider[0]  # Default to first move
-        
-        # Add time limit
-        start_time = time.time()
-        max_time = 3.0  # Early game can use shorter search time
-        
-        for move in moves_to_consider:
-            # Check if time limit is reached
-            if time.time() - start_time > max_time:
-                print(f"Search time limit reached after analyzing {moves_to_consider.index(move)}/{len(moves_to_consider)} moves")
-                break
-                
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
-            
-            # Get score from minimax with time limit
-            score = -self._negamax(game_copy, depth-1, float('-inf'), float('inf'), False, start_time, max_time)
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-                
-        return best_move
+        return self._iterative_deepening(game, moves_to_consider)
     
     def _mid_game_strategy(self, game, valid_moves):
         """
@@ -118,37 +369,10 @@ class OthelloZ3Solver:
         # In mid game, prioritize checking corner positions
         for move in valid_moves:
             if move in self.corner_positions:
+                self._report_iteration(game, 0, move, None)
                 return move
         
-        # Reduce mid game search depth to improve performance
-        depth = 5  # Reduce from 8 to 5, reduce search space
-        best_score = float('-inf')
-        best_move = valid_moves[0]  # Default to first move
-        
-        # Add time limit
-        start_time = time.time()
-        max_time = 5.0  # Set 5 seconds maximum search time
-        
-        # Sort moves by importance
-        sorted_moves = self._sort_moves(valid_moves, game)
-        
-        for move in sorted_moves:
-            # Check if time limit is reached
-            if time.time() - start_time > max_time:
-                print(f"Search time limit reached after analyzing {sorted_moves.index(move)}/{len(sorted_moves)} moves")
-                break
-                
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
-            
-            # Get score
-            score = -self._negamax(game_copy, depth-1, float('-inf'), float('inf'), False, start_time, max_time)
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-                
-        return best_move
+        return self._iterative_deepening(game, valid_moves)
     
     def _late_game_strategy(self, game, valid_moves):
         """
@@ -159,165 +383,317 @@ class OthelloZ3Solver:
         """
         print("Using late game strategy")
         
-        # Calculate empty spaces to determine if we can solve to the end of the game
-        empty_count = np.sum(game.board == EMPTY)
-        
-        # If there are less than 8 empty spaces, try to solve to the end of the game
-        if empty_count <= 8:  # Reduce from 10 to 8, reduce search space
-            return self._solve_endgame(game, valid_moves)
-        
-        # Otherwise, use depth search
-        depth = 6  # Reduce from 10 to 6, reduce search space
-        best_score = float('-inf')
-        best_move = valid_moves[0]  # Default to first move
-        
-        # Add time limit
-        start_time = time.time()
-        max_time = 5.0  # Set 5 seconds maximum search time
-        
-        # Sort moves to improve pruning
-        sorted_moves = self._sort_moves(valid_moves, game)
+        # Positions shallow enough to solve exactly never get here (see _search_position),
+        # unless the solve ran out of time; use depth search
+        return self._iterative_deepening(game, valid_moves)
+    
+    def _iterative_deepening(self, game, moves):
+        """
+        Search the root moves at depth 1, 2, 3, ... until max_depth is reached or the
+        time budget runs out. Only fully completed iterations count: the move returned
+        is always the best move of the deepest depth that was searched to the end.
+        """
+        empty_count = 64 - sum(game.get_piece_count())
+        depth_limit = self.max_depth if self.max_depth else empty_count
+        depth_limit = min(depth_limit, empty_count)  # Searching past the last move adds nothing
+        
+        # Sort moves by importance; after each iteration the best move is searched first
+        key, transform = game.symmetric_key()
+        entry = self.transposition_table.probe(key)
+        tt_move = symmetry.transform_move(entry.move, symmetry.INVERSE[transform]) if entry else None
+        ordered_moves = self._sort_moves(moves, game, ply=0, tt_move=tt_move)
+        best_move = ordered_moves[0]
+        best_score = None
+        start_depth = 1
+        self.last_root_moves = sorted(moves)
+        
+        # Continue from a pondered search of the same position (the same root moves follow from it)
+        resume, self.resume_from = self.resume_from, None
+        if resume is not None and resume["key"] == game.zobrist_key() and resume["depth"] > 0:
+            print(f"Continuing from pondered depth {resume['depth']}")
+            best_move, best_score = resume["move"], resume["score"]
+            start_depth = resume["depth"] + 1
+            self.last_search_depth = resume["depth"]
+            ordered_moves.remove(best_move)
+            ordered_moves.insert(0, best_move)
+        
+        helpers = self._start_lazy_smp_helpers(game, ordered_moves, depth_limit) if self._uses_lazy_smp() else []
         
-        for move in sorted_moves:
-            # Check if time limit is reached
-            if time.time() - start_time > max_time:
-                print(f"Search time limit reached after analyzing {sorted_moves.index(move)}/{len(sorted_moves)} moves")
-                break
+        try:
+            for depth in range(start_depth, depth_limit + 1):
+                self.stats.start_iteration()
+                try:
+                    move, score = self._aspiration_search(game, ordered_moves, depth, best_score)
+                except SearchTimeout:
+                    print(f"Search time limit reached during depth {depth}, using depth {self.last_search_depth} result")
+                    self.stats.end_iteration(depth, completed=False)
+                    self.search_completed = False
+                    break
                 
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
-            
-            # Get score
-            score = -self._negamax(game_copy, depth-1, float('-inf'), float('inf'), False, start_time, max_time)
-            
-            if score > best_score:
-                best_score = score
+                self.stats.end_iteration(depth)
+                best_move, best_score = move, score
+                self.last_search_depth = depth
+                self.last_search_score = score
+                ordered_moves.remove(move)
+                ordered_moves.insert(0, move)
+                self._report_iteration(game, depth, move, score)
+        finally:
+            # Also on errors, so the helpers never run on until the deadline
+            if helpers:
+                best_move = self._finish_lazy_smp_helpers(helpers, best_move)
+        
+        return best_move
+    
+    def _uses_lazy_smp(self):
+        return self.workers > 1 and self.parallel_mode == "lazy_smp"
+    
+    def _start_lazy_smp_helpers(self, game, moves, depth_limit):
+        """
+        Start workers - 1 helper processes searching the same root through the shared table
+        """
+        table = self.transposition_table
+        table.request_stop(False)
+        pool = parallel.get_pool(self.workers - 1)
+        search_id = (id(self), self.search_count)
+        return [pool.submit(parallel.lazy_smp_helper, game.position(), moves, depth_limit, self.deadline,
+                            table.name, table.size_bits, helper_index, search_id, self._worker_settings())
+                for helper_index in range(1, self.workers)]
+    
+    def _finish_lazy_smp_helpers(self, helpers, best_move):
+        """
+        Stop the helpers and use a helper's move and score if it completed a deeper iteration than this process
+        """
+        self.transposition_table.request_stop(True)
+        for future in helpers:
+            depth, move, score, counters = future.result()
+            self.stats.add(counters)
+            if move is not None and depth > self.last_search_depth:
                 best_move = move
-                
+                self.last_search_depth = depth
+                self.last_search_score = score
         return best_move
     
-    def _solve_endgame(self, game, valid_moves):
+    def _aspiration_search(self, game, moves, depth, previous_score):
+        """
+        Search the root inside a narrow window around the previous iteration's score,
+        re-searching with the window opened on the failing side if the score falls outside it
+        """
+        if previous_score is None:
+            return self._search_root(game, moves, depth, float('-inf'), float('inf'))
+        
+        alpha = previous_score - self.aspiration_window
+        beta = previous_score + self.aspiration_window
+        while True:
+            move, score = self._search_root(game, moves, depth, alpha, beta)
+            if score <= alpha:
+                alpha = float('-inf')  # Fail low
+            elif score >= beta:
+                beta = float('inf')  # Fail high
+            else:
+                return move, score
+    
+    def _search_root(self, game, moves, depth, alpha, beta):
         """
-        Solve the endgame using full search to the end of the game
+        Principal variation search over the root moves. The first move gets the full
+        window; later moves are probed with a null window around the best score so far
+        and only re-searched if they beat it. Returns (best_move, best_score).
         """
-        print("Solving endgame using full search")
+        if self.workers > 1 and self.parallel_mode == "root_split" and len(moves) > 1:
+            return self._search_root_parallel(game, moves, depth, alpha, beta)
         
         best_score = float('-inf')
-        best_move = valid_moves[0]  # Default to first move
-        
-        # Add time limit
-        start_time = time.time()
-        max_time = 8.0  # Endgame can give more time, 8 seconds
-        
-        # Sort moves for better pruning
-        sorted_moves = self._sort_moves(valid_moves, game)
-        
-        for move in sorted_moves:
-            # Check if time limit is reached
-            if time.time() - start_time > max_time:
-                print(f"Search time limit reached after analyzing {sorted_moves.index(move)}/{len(sorted_moves)} moves")
-                break
-                
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
-            
-            # Search to the end of the game
-            score = -self._full_search(game_copy, start_time, max_time)
+        best_move = moves[0]
+        
+        for index, move in enumerate(moves):
+            record = game.make_move(move[0], move[1])
+            try:
+                score = self._pvs_child(game, depth-1, alpha, beta, index == 0, 1)
+            finally:
+                game.undo_move(record)
             
             if score > best_score:
                 best_score = score
                 best_move = move
-                
-        return best_move
+            alpha = max(alpha, score)
+            
+            if alpha >= beta:
+                break
+        
+        return best_move, best_score
     
-    def _full_search(self, game, start_time=None, max_time=None, depth=0, max_depth=10):
+    def _search_root_parallel(self, game, moves, depth, alpha, beta):
         """
-        Full search to the end of the game using minimax with alpha-beta pruning
+        Young-brothers-wait root split: the first move is searched here with the full
+        window, then its siblings are probed in parallel with a null window around its
+        score, and those that fail high are re-searched in parallel with the full window
         """
-        # Add depth limit to prevent infinite recursion
-        if depth > max_depth:
-            return self._evaluate_position(game)
-            
-        # Check time limit
-        if start_time and max_time and time.time() - start_time > max_time:
-            return self._evaluate_position(game)
-            
-        # Check if we've already seen this position
-        board_hash = str(game.board.tobytes())
-        if board_hash in self.transposition_table:
-            return self.transposition_table[board_hash]
-        
-        # Get valid moves for the current player
-        valid_moves = game.get_valid_moves()
-        
-        # If there are no valid moves, try passing or end game
-        if not valid_moves:
-            # Try passing
-            game_copy = game.copy()
-            game_copy.current_player = -game_copy.current_player
-            opponent_moves = game_copy.get_valid_moves()
-            
-            # If opponent also has no moves, game is over
-            if not opponent_moves:
-                # Game is over, count pieces
-                black_count, white_count = game.get_piece_count()
-                score = 1000 * (black_count - white_count) // (black_count + white_count)
-                score = score if game.current_player == BLACK else -score
-                # Store in transposition table
-                self.transposition_table[board_hash] = score
-                return score
-                
-            # Pass turn
-            return -self._full_search(game_copy, start_time, max_time, depth+1, max_depth)
-        
-        # Try each move
-        best_score = float('-inf')
+        first_move = moves[0]
+        record = game.make_move(first_move[0], first_move[1])
+        try:
+            best_score = self._pvs_child(game, depth-1, alpha, beta, True, 1)
+        finally:
+            game.undo_move(record)
+        best_move = first_move
+        alpha = max(alpha, best_score)
+        if alpha >= beta:
+            return best_move, best_score
+        
+        # Null-window probes of the younger brothers
+        siblings = moves[1:]
+        scores = self._run_parallel(game, siblings, depth, alpha, alpha + 1)
+        fail_high = [move for move, score in zip(siblings, scores) if score > alpha]
+        
+        # Exact values for the moves that beat the first one
+        if fail_high:
+            scores = self._run_parallel(game, fail_high, depth, alpha, beta)
+            for move, score in zip(fail_high, scores):
+                if score > best_score:
+                    best_score = score
+                    best_move = move
         
-        # Sort moves for better pruning
-        sorted_moves = self._sort_moves(valid_moves, game)
+        return best_move, best_score
+    
+    def _run_parallel(self, game, moves, depth, alpha, beta):
+        """
+        Score root moves in the worker pool; results are returned in the order of `moves`
+        """
+        pool = parallel.get_pool(self.workers)
+        position = game.position()
+        search_id = (id(self), self.search_count)
+        if self.stop_flag is None:
+            self.stop_flag = parallel.StopFlag()
+            weakref.finalize(self, self.stop_flag.close)
+        self.stop_flag.set(False)
+        futures = [pool.submit(parallel.search_root_move, position, move, depth, alpha, beta,
+                               self.deadline, search_id, self._worker_settings(), self.stop_flag.name)
+                   for move in moves]
+        
+        # The workers only see the deadline, so pass a stop request (e.g. a cancelled hint) on to them
+        pending = futures
+        while pending:
+            pending = wait(pending, timeout=STOP_POLL_INTERVAL).not_done
+            if pending and self.should_stop is not None and self.should_stop():
+                self.stop_flag.set()
+        
+        scores = []
+        for future in futures:
+            score, counters = future.result()
+            self.stats.add(counters)
+            scores.append(score)
+        if any(score is None for score in scores):
+            raise SearchTimeout()
+        return scores
+    
+    def _worker_settings(self):
+        """
+        Solver settings that worker processes copy onto their own solver
+        """
+        return {
+            "move_ordering": self.move_ordering,
+            "shallow_search_depth": self.shallow_search_depth,
+            "shallow_search_min_depth": self.shallow_search_min_depth,
+        }
+    
+    def _pvs_child(self, game, depth, alpha, beta, is_first, ply):
+        """
+        Score a child position (after the move is made) from the parent's point of view
+        """
+        if is_first:
+            return -self._negamax(game, depth, -beta, -alpha, False, ply)
+        
+        # Null-window probe: can this move beat the best move found so far?
+        score = -self._negamax(game, depth, -alpha-1, -alpha, False, ply)
+        if alpha < score < beta:
+            # Fail high: re-search with the real window to get the exact value
+            score = -self._negamax(game, depth, -beta, -score, False, ply)
+        return score
+    
+    def _check_time(self):
+        """Abort the current search iteration once the request's time budget is used up"""
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+        if self.should_stop is not None and self.should_stop():
+            raise SearchTimeout()
+    
+    def _solve_endgame(self, game, valid_moves, budget_share=0.5):
+        """
+        Solve the endgame exactly with the bitboard endgame solver, using budget_share of the
+        remaining time (by default half, leaving the rest for a depth-limited fallback).
+        Returns None if that runs out before the solve finishes.
+        """
+        print("Solving endgame using exact search")
         
-        for move in sorted_moves:
-            # Check time limit
-            if start_time and max_time and time.time() - start_time > max_time:
-                break
-                
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
-            
-            # Recursive search
-            score = -self._full_search(game_copy, start_time, max_time, depth+1, max_depth)
-            
-            best_score = max(best_score, score)
+        if game.current_player == BLACK:
+            own, opp = game.black_bits, game.white_bits
+        else:
+            own, opp = game.white_bits, game.black_bits
+        endgame_solver = EndgameSolver(check_time=self._check_time)
         
-        # Store in transposition table
-        self.transposition_table[board_hash] = best_score
+        request_deadline = self.deadline
+        if request_deadline is not None:
+            self.deadline = time.time() + (request_deadline - time.time()) * budget_share
         
-        return best_score
+        try:
+            index, score = endgame_solver.best_move(own, opp)
+        except SearchTimeout:
+            print(f"Search time limit reached after {endgame_solver.nodes} endgame nodes")
+            return None
+        finally:
+            self.deadline = request_deadline
+            self.stats.endgame_nodes += endgame_solver.nodes
+        
+        print(f"Endgame solved: final disc difference {score:+d} ({endgame_solver.nodes} nodes)")
+        self.last_exact_score = score
+        self.last_search_depth = 64 - sum(game.get_piece_count())
+        self._report_iteration(game, self.last_search_depth, (index >> 3, index & 7), score, pv_length=1)
+        return (index >> 3, index & 7)
     
-    def _negamax(self, game, depth, alpha, beta, is_maximizing, start_time=None, max_time=None):
+    def _negamax(self, game, depth, alpha, beta, is_maximizing, ply=0):
         """
-        Negamax search with alpha-beta pruning
+        Negamax search with alpha-beta pruning (principal variation search)
         """
         # Check time limit
-        if start_time and max_time and time.time() - start_time > max_time:
-            return self._evaluate_position(game)
+        self._check_time()
+        stats = self.stats
+        stats.nodes += 1
             
         # Terminal conditions
         if depth == 0:
+            stats.leaf_evaluations += 1
             return self._evaluate_position(game)
         
+        # Probe the transposition table. Symmetric positions share entries: moves are
+        # stored in the orientation of the position's key and mapped back here
+        alpha_orig = alpha
+        key, transform = game.symmetric_key()
+        entry = self.transposition_table.probe(key)
+        stats.tt_probes += 1
+        if entry is not None:
+            stats.tt_hits += 1
+        if entry is not None and entry.depth >= depth:
+            if entry.flag == EXACT:
+                stats.tt_cutoffs += 1
+                return entry.value
+            elif entry.flag == LOWER_BOUND:
+                alpha = max(alpha, entry.value)
+            else:
+                beta = min(beta, entry.value)
+            if alpha >= beta:
+                stats.tt_cutoffs += 1
+                return entry.value
+        
         # Get valid moves for current player
         valid_moves = game.get_valid_moves()
         
         # If no valid moves, either pass or end of game
         if not valid_moves:
             # Try passing
-            game_copy = game.copy()
-            game_copy.current_player = -game_copy.current_player
-            opponent_moves = game_copy.get_valid_moves()
+            game.current_player = -game.current_player
+            opponent_moves = game.get_valid_moves()
             
             # If opponent also has no moves, game is over
             if not opponent_moves:
+                game.current_player = -game.current_player
                 # Game is over, count pieces
                 black_count, white_count = game.get_piece_count()
                 if black_count > white_count:
@@ -328,304 +704,90 @@ class OthelloZ3Solver:
                     return 0  # Draw
                 
             # Pass turn
-            return -self._negamax(game_copy, depth-1, -beta, -alpha, not is_maximizing, start_time, max_time)
+            try:
+                score = -self._negamax(game, depth-1, -beta, -alpha, not is_maximizing, ply+1)
+            finally:
+                game.current_player = -game.current_player
+            return score
         
         # Sort moves for better pruning
-        sorted_moves = self._sort_moves(valid_moves, game)
+        tt_move = symmetry.transform_move(entry.move, symmetry.INVERSE[transform]) if entry else None
+        sorted_moves = self._sort_moves(valid_moves, game, ply, tt_move, depth)
         
         best_score = float('-inf')
+        best_move = None
         
-        for move in sorted_moves:
-            # Check time limit
-            if start_time and max_time and time.time() - start_time > max_time:
-                break
-                
-            game_copy = game.copy()
-            game_copy.make_move(move[0], move[1])
+        for index, move in enumerate(sorted_moves):
+            record = game.make_move(move[0], move[1])
             
-            # Recursive search
-            score = -self._negamax(game_copy, depth-1, -beta, -alpha, not is_maximizing, start_time, max_time)
+            # Recursive principal variation search
+            try:
+                score = self._pvs_child(game, depth-1, alpha, beta, index == 0, ply+1)
+            finally:
+                game.undo_move(record)
             
-            best_score = max(best_score, score)
+            if score > best_score:
+                best_score = score
+                best_move = move
             alpha = max(alpha, score)
             
             # Alpha-beta pruning
             if alpha >= beta:
+                self._record_cutoff(move, game.current_player, depth, ply)
+                stats.record_cutoff(index)
                 break
         
+        # Store the result with its bound type (a timeout unwinds past this point)
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, depth, best_score, flag, symmetry.transform_move(best_move, transform))
+        
         return best_score
     
     def _evaluate_position(self, game):
         """
-        Evaluate a board position based on strategic principles
+        Evaluate a board position based on strategic principles, from the point of view
+        of the side to move (see evaluation.Evaluator for the terms and weights)
         """
-        if game.current_player == BLACK:
-            my_color, opp_color = BLACK, WHITE
-        else:
-            my_color, opp_color = WHITE, BLACK
-        
-        # Count pieces
-        black_count, white_count = game.get_piece_count()
-        piece_diff = black_count - white_count
-        piece_diff = piece_diff if my_color == BLACK else -piece_diff
-        
-        # Count pieces in different regions
-        corners = sum(1 for pos in self.corner_positions if game.board[pos] == my_color) - \
-                  sum(1 for pos in self.corner_positions if game.board[pos] == opp_color)
-                  
-        x_squares = sum(1 for pos in self.x_squares if game.board[pos] == my_color) - \
-                    sum(1 for pos in self.x_squares if game.board[pos] == opp_color)
-                    
-        c_squares = sum(1 for pos in self.c_squares if game.board[pos] == my_color) - \
-                    sum(1 for pos in self.c_squares if game.board[pos] == opp_color)
-                    
-        edges = sum(1 for pos in self.edge_positions if game.board[pos] == my_color) - \
-                sum(1 for pos in self.edge_positions if game.board[pos] == opp_color)
-        
-        # Calculate mobility (number of valid moves)
-        original_player = game.current_player
-        my_mobility = len(game.get_valid_moves())
-        
-        game.current_player = -game.current_player
-        opp_mobility = len(game.get_valid_moves())
-        game.current_player = original_player
-        
-        mobility_diff = my_mobility - opp_mobility
-        
-        # Simplified stable disc calculation - only consider corners and completely occupied edges
-        my_stable, opp_stable = self._simplified_count_stable_discs(game, my_color, opp_color)
-        stability_diff = my_stable - opp_stable
-        
-        # Simplified frontier disc calculation
-        my_frontier, opp_frontier = self._simplified_count_frontier_discs(game, my_color, opp_color)
-        frontier_diff = opp_frontier - my_frontier  # Fewer frontier discs is better
-        
-        # Calculate positional value
-        positional_value = self._calculate_positional_value(game, my_color, opp_color)
-        
-        # Determine game phase for weighting factors
-        total_pieces = black_count + white_count
-        
-        if total_pieces < self.early_game_threshold:
-            # Early game weights
-            piece_weight = 10
-            corner_weight = 500
-            x_square_weight = -300
-            c_square_weight = -150
-            edge_weight = 50
-            mobility_weight = 100
-            stability_weight = 300
-            frontier_weight = 20
-            positional_weight = 30
-        elif total_pieces > self.late_game_threshold:
-            # Late game weights
-            piece_weight = 500
-            corner_weight = 300
-            x_square_weight = -50
-            c_square_weight = -30
-            edge_weight = 100
-            mobility_weight = 20
-            stability_weight = 500
-            frontier_weight = 10
-            positional_weight = 50
-        else:
-            # Mid game weights
-            piece_weight = 50
-            corner_weight = 400
-            x_square_weight = -150
-            c_square_weight = -100
-            edge_weight = 100
-            mobility_weight = 80
-            stability_weight = 300
-            frontier_weight = 30
-            positional_weight = 50
-        
-        # Calculate total score
-        score = (piece_weight * piece_diff + 
-                corner_weight * corners +
-                x_square_weight * x_squares +
-                c_square_weight * c_squares +
-                edge_weight * edges +
-                mobility_weight * mobility_diff +
-                stability_weight * stability_diff +
-                frontier_weight * frontier_diff +
-                positional_weight * positional_value)
-        
-        return score
+        if isinstance(game, IncrementalOthello):
+            return game.evaluate()
+        player = game.current_player
+        return self.evaluator.evaluate(game._player_bits(player), game._player_bits(-player))
     
-    def _simplified_count_stable_discs(self, game, my_color, opp_color):
-        """
-        Simplified stable disc calculation, only consider corners and edges connected to corners
-        """
-        board = game.board
-        my_stable = 0
-        opp_stable = 0
-        
-        # Corner always stable
-        for r, c in self.corner_positions:
-            if board[r, c] == my_color:
-                my_stable += 1
-            elif board[r, c] == opp_color:
-                opp_stable += 1
-        
-        # Check horizontal edges
-        for row in [0, 7]:
-            # Left to right
-            if board[row, 0] != EMPTY:  # If corner is occupied
-                color = board[row, 0]
-                for col in range(1, 8):
-                    if board[row, col] != color:
-                        break
-                    if color == my_color:
-                        my_stable += 1
-                    else:
-                        opp_stable += 1
-            
-            # Right to left
-            if board[row, 7] != EMPTY:  # If corner is occupied
-                color = board[row, 7]
-                for col in range(6, -1, -1):
-                    if board[row, col] != color:
-                        break
-                    if color == my_color:
-                        my_stable += 1
-                    else:
-                        opp_stable += 1
-        
-        # Check vertical edges
-        for col in [0, 7]:
-            # Top to bottom
-            if board[0, col] != EMPTY:  # If corner is occupied
-                color = board[0, col]
-                for row in range(1, 8):
-                    if board[row, col] != color:
-                        break
-                    if color == my_color:
-                        my_stable += 1
-                    else:
-                        opp_stable += 1
-            
-            # Bottom to top
-            if board[7, col] != EMPTY:  # If corner is occupied
-                color = board[7, col]
-                for row in range(6, -1, -1):
-                    if board[row, col] != color:
-                        break
-                    if color == my_color:
-                        my_stable += 1
-                    else:
-                        opp_stable += 1
-        
-        return my_stable, opp_stable
-    
-    def _simplified_count_frontier_discs(self, game, my_color, opp_color):
-        """
-        Simplified frontier disc calculation, reduce calculation by sampling
-        """
-        board = game.board
-        my_frontier = 0
-        opp_frontier = 0
-        
-        # Sample positions in the board instead of checking each position
-        sample_positions = []
-        for r in range(1, 7, 2):  # Skip some rows
-            for c in range(1, 7, 2):  # Skip some columns
-                sample_positions.append((r, c))
-        
-        # Edge positions are more important, include all
-        for pos in self.edge_positions:
-            sample_positions.append(pos)
-        
-        for r, c in sample_positions:
-            if board[r, c] != EMPTY:
-                # Check if adjacent to any empty space
-                is_frontier = False
-                for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-                    adj_r, adj_c = r + dr, c + dc
-                    if 0 <= adj_r < 8 and 0 <= adj_c < 8 and board[adj_r, adj_c] == EMPTY:
-                        is_frontier = True
-                        break
-                
-                if is_frontier:
-                    if board[r, c] == my_color:
-                        my_frontier += 1
-                    else:
-                        opp_frontier += 1
-        
-        # Multiply by a factor to estimate total
-        factor = 1.5  # Adjust this factor to match actual counts
-        my_frontier = int(my_frontier * factor)
-        opp_frontier = int(opp_frontier * factor)
-        
-        return my_frontier, opp_frontier
-    
-    def _calculate_positional_value(self, game, my_color, opp_color):
+    def _count_stable_discs(self, game, my_color, opp_color):
         """
-        Calculate the positional value based on the weight matrix
+        Count the discs of each colour that can never be flipped again
         """
-        board = game.board
-        my_value = 0
-        opp_value = 0
-        
-        for r in range(8):
-            for c in range(8):
-                if board[r, c] == my_color:
-                    my_value += self.position_weights[r][c]
-                elif board[r, c] == opp_color:
-                    opp_value += self.position_weights[r][c]
-        
-        return my_value - opp_value
+        my_stable, opp_stable = stable_discs(game._player_bits(my_color), game._player_bits(opp_color))
+        return popcount(my_stable), popcount(opp_stable)
     
-    def _sort_moves(self, moves, game):
+    def _sort_moves(self, moves, game, ply=None, tt_move=None, depth=0):
         """
-        Sort moves based on heuristics to improve alpha-beta pruning
+        Sort moves to improve alpha-beta pruning: the transposition table move first,
+        then this ply's killer moves, then the ordering score plus the history bonus
         """
+        killers = self.killer_moves[ply] if ply is not None and ply < MAX_PLY else (None, None)
+        use_shallow_search = self.move_ordering == "shallow" and depth >= self.shallow_search_min_depth
         move_scores = []
         
         for move in moves:
-            score = 0
-            r, c = move
-            
-            # Prioritize corners extremely high
-            if move in self.corner_positions:
-                score += 10000
-            
-            # Avoid X-squares and C-squares if corners not taken
-            elif move in self.x_squares:
-                score -= 5000
-                # Check if any adjacent corner is empty
-                for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                    corner_r, corner_c = r + dr, c + dc
-                    if corner_r in [0, 7] and corner_c in [0, 7]:
-                        if game.board[corner_r, corner_c] == EMPTY:
-                            score -= 5000  # Extra penalty for X-square with empty corner
-            
-            elif move in self.c_squares:
-                score -= 3000
-                # Check if adjacent corner is empty
-                if r == 0 or r == 7:
-                    corner_c = 0 if c == 1 else 7
-                    if game.board[r, corner_c] == EMPTY:
-                        score -= 3000  # Extra penalty for C-square with empty corner
-                else:  # c == 0 or c == 7
-                    corner_r = 0 if r == 1 else 7
-                    if game.board[corner_r, c] == EMPTY:
-                        score -= 3000  # Extra penalty for C-square with empty corner
-            
-            # Prioritize edges, but not if adjacent to empty corners
-            elif move in self.edge_positions:
-                score += 500
-                # Check if this edge move is safe
-                if r == 0 or r == 7:
-                    if game.board[r, 0] == EMPTY or game.board[r, 7] == EMPTY:
-                        score -= 300  # Penalty for unsafe edge move
-                else:  # c == 0 or c == 7
-                    if game.board[0, c] == EMPTY or game.board[7, c] == EMPTY:
-                        score -= 300  # Penalty for unsafe edge move
-            
-            # Use position weights for other positions
+            if self.move_ordering == "mobility":
+                score = self._mobility_order_score(move, game)
+            elif use_shallow_search:
+                score = self._shallow_search_order_score(move, game, ply or 0)
             else:
-                score += self.position_weights[r][c]
+                score = self._static_order_score(move, game)
+            
+            if move == tt_move:
+                score += TT_MOVE_BONUS
+            elif move == killers[0]:
+                score += KILLER_BONUSES[0]
+            elif move == killers[1]:
+                score += KILLER_BONUSES[1]
             
             # Consider move history for similar positions
             if (move, game.current_player) in self.history_table:
@@ -638,33 +800,126 @@ class OthelloZ3Solver:
         
         return [move for move, _ in move_scores]
     
-    def analyze_best_move(self):
+    def _static_order_score(self, move, game):
+        """
+        Static ordering score from corners, X/C-squares, edges and position weights
+        """
+        score = 0
+        r, c = move
+        
+        # Prioritize corners extremely high
+        if move in self.corner_positions:
+            score += 10000
+        
+        # Avoid X-squares and C-squares if corners not taken
+        elif move in self.x_squares:
+            score -= 5000
+            # Check if any adjacent corner is empty
+            for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                corner_r, corner_c = r + dr, c + dc
+                if corner_r in [0, 7] and corner_c in [0, 7]:
+                    if game.board[corner_r, corner_c] == EMPTY:
+                        score -= 5000  # Extra penalty for X-square with empty corner
+        
+        elif move in self.c_squares:
+            score -= 3000
+            # Check if adjacent corner is empty
+            if r == 0 or r == 7:
+                corner_c = 0 if c == 1 else 7
+                if game.board[r, corner_c] == EMPTY:
+                    score -= 3000  # Extra penalty for C-square with empty corner
+            else:  # c == 0 or c == 7
+                corner_r = 0 if r == 1 else 7
+                if game.board[corner_r, c] == EMPTY:
+                    score -= 3000  # Extra penalty for C-square with empty corner
+        
+        # Prioritize edges, but not if adjacent to empty corners
+        elif move in self.edge_positions:
+            score += 500
+            # Check if this edge move is safe
+            if r == 0 or r == 7:
+                if game.board[r, 0] == EMPTY or game.board[r, 7] == EMPTY:
+                    score -= 300  # Penalty for unsafe edge move
+            else:  # c == 0 or c == 7
+                if game.board[0, c] == EMPTY or game.board[7, c] == EMPTY:
+                    score -= 300  # Penalty for unsafe edge move
+        
+        # Use position weights for other positions
+        else:
+            score += self.position_weights[r][c]
+        
+        return score
+    
+    def _mobility_order_score(self, move, game):
+        """
+        Ordering score that prefers moves leaving the opponent with few replies
+        """
+        record = game.make_move(move[0], move[1])
+        opp_mobility = len(game.get_valid_moves())
+        game.undo_move(record)
+        return -100 * opp_mobility
+    
+    def _shallow_search_order_score(self, move, game, ply):
+        """
+        Ordering score from a shallow search of the move (its results also seed the table)
+        """
+        record = game.make_move(move[0], move[1])
+        try:
+            return -self._negamax(game, self.shallow_search_depth - 1, float('-inf'), float('inf'), False, ply+1)
+        finally:
+            game.undo_move(record)
+    
+    def _record_cutoff(self, move, player, depth, ply):
+        """
+        Reward a move that caused a beta cutoff in the history table and killer slots
+        """
+        key = (move, player)
+        self.history_table[key] = self.history_table.get(key, 0) + depth * depth
+        
+        if ply < MAX_PLY:
+            killers = self.killer_moves[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+    
+    def _reset_move_ordering(self):
         """
-        Analyze the current board state and find the best move using Z3 modeling
+        Clear killer moves and age the history table before a new search
+        """
+        self.killer_moves = [[None, None] for _ in range(MAX_PLY)]
+        for key in list(self.history_table):
+            self.history_table[key] //= 2
+    
+    def analyze_best_move(self, profile=False):
+        """
+        Analyze the current board state and find the best move using Z3 modeling.
+        With profile=True the search runs under cProfile and the report is added to the result.
         """
         start_time = time.time()
-        max_time = 10.0  # Give 10 seconds for analysis
+        profile_report = None
         
         # Try to find the best move
         try:
-            best_move = self.find_best_move()
+            if profile:
+                best_move, profile_report = profile_call(self.find_best_move)
+            else:
+                best_move = self.find_best_move()
             
-            # If timeout or no best move found, use greedy strategy
-            if not best_move or (time.time() - start_time) > max_time:
-                print("No best move found or analysis timeout, using greedy strategy")
+            # If no best move found, use greedy strategy
+            if not best_move:
+                print("No best move found, using greedy strategy")
                 best_move = self._greedy_move_selection()
             
             end_time = time.time()
             
             if best_move:
-                # Create a game copy and make the move to see its effects
-                game_copy = self.game.copy()
-                game_copy.make_move(best_move[0], best_move[1])
-                
-                # Get statistics
-                black_count, white_count = game_copy.get_piece_count()
                 current_player = "Black" if self.game.current_player == BLACK else "White"
                 
+                # Make the move to see its effects, then take it back
+                record = self.game.make_move(best_move[0], best_move[1])
+                black_count, white_count = self.game.get_piece_count()
+                self.game.undo_move(record)
+                
                 analysis = {
                     "has_move": True,  # Add this field to match frontend expectations
                     "best_move": best_move,
@@ -672,10 +927,26 @@ class OthelloZ3Solver:
                     "col": best_move[1],
                     "player": current_player,
                     "analysis_time_seconds": end_time - start_time,
+                    "search_depth": self.last_search_depth,
+                    "exact_score": self.last_exact_score,
                     "expected_black_count": black_count,
                     "expected_white_count": white_count,
-                    "strategic_evaluation": self._get_move_strategic_evaluation(best_move)
+                    "strategic_evaluation": self._get_move_strategic_evaluation(best_move),
+                    "positions_evaluated": self.stats.nodes + self.stats.endgame_nodes,
+                    "solving_time_ms": round((end_time - start_time) * 1000),
+                    "constraints_count": len(self.solver.assertions()),
+                    "search_stats": self.stats.as_dict(self.last_search_depth)
                 }
+                if profile_report is not None:
+                    analysis["profile"] = profile_report
+                
+                if self.last_ponder_stats is not None:
+                    analysis["ponder_stats"] = self.last_ponder_stats
+                if self.last_book_move:
+                    analysis["solving_method"] = "Opening book"
+                elif self.last_exact_score is not None:
+                    analysis["solving_method"] = "Exact endgame solver"
+                    analysis["strategic_evaluation"] += f" (perfect play: final disc difference {self.last_exact_score:+d})"
                 
                 return analysis
             
@@ -724,9 +995,9 @@ class OthelloZ3Solver:
                     score += 20
                     
                 # Check how many discs will be flipped by this move
-                game_copy = self.game.copy()
-                game_copy.make_move(r, c)
-                flipped_count = len(game_copy.last_flipped_discs)
+                record = self.game.make_move(r, c)
+                flipped_count = len(self.game.last_flipped_discs)
+                self.game.undo_move(record)
                 
                 # Middle game earlier flips better, later flips better
                 total_pieces = np.sum(self.game.board != EMPTY)
@@ -748,18 +1019,18 @@ class OthelloZ3Solver:
         if total_pieces < 30:  # Early game
             min_flips = float('inf')
             for move in valid_moves:
-                game_copy = self.game.copy()
-                game_copy.make_move(move[0], move[1])
-                flips = len(game_copy.last_flipped_discs)
+                record = self.game.make_move(move[0], move[1])
+                flips = len(self.game.last_flipped_discs)
+                self.game.undo_move(record)
                 if flips < min_flips:
                     min_flips = flips
                     best_move = move
         else:  # Late game
             max_flips = -1
             for move in valid_moves:
-                game_copy = self.game.copy()
-                game_copy.make_move(move[0], move[1])
-                flips = len(game_copy.last_flipped_discs)
+                record = self.game.make_move(move[0], move[1])
+                flips = len(self.game.last_flipped_discs)
+                self.game.undo_move(record)
                 if flips > max_flips:
                     max_flips = flips
                     best_move = move
@@ -782,28 +1053,29 @@ class OthelloZ3Solver:
             return "Edge move - generally strong position if stable"
         
         # Check if the move increases mobility
-        game_copy = self.game.copy()
-        original_player = game_copy.current_player
+        game = self.game
+        original_player = game.current_player
         
         # Count opponent moves before our move
-        game_copy.current_player = -original_player
-        opp_moves_before = len(game_copy.get_valid_moves())
-        game_copy.current_player = original_player
+        game.current_player = -original_player
+        opp_moves_before = len(game.get_valid_moves())
+        game.current_player = original_player
+        
+        # Check if the move creates stable discs
+        my_color = original_player
+        my_stable_before = self._count_stable_discs(game, my_color, -my_color)[0]
         
         # Make our move
-        game_copy.make_move(r, c)
+        record = game.make_move(r, c)
         
         # Count opponent moves after our move
-        opp_moves_after = len(game_copy.get_valid_moves())
+        opp_moves_after = len(game.get_valid_moves())
+        my_stable_after = self._count_stable_discs(game, my_color, -my_color)[0]
+        game.undo_move(record)
         
         if opp_moves_after < opp_moves_before:
             return "Mobility control move - reduces opponent's options"
         
-        # Check if the move creates stable discs
-        my_color = original_player
-        my_stable_before = self._simplified_count_stable_discs(self.game, my_color, -my_color)[0]
-        my_stable_after = self._simplified_count_stable_discs(game_copy, my_color, -my_color)[0]
-        
         if my_stable_after > my_stable_before:
             return "Stability building move - creates stable disc formation"
         